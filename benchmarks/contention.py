@@ -0,0 +1,385 @@
+"""
+Load test perebutan slot ruangan terhadap server lokal.
+
+Skenario meniru minggu registrasi: banyak user meminta ruangan dan jam yang
+sama, lalu staff menyetujui permintaan yang saling bentrok secara bersamaan.
+
+1. ``create``: untuk setiap ruangan dan slot, ``--contenders`` user membuat
+   reservasi PENDING yang saling tumpang tindih (jam mulai digeser acak),
+   dikirim bersamaan dari ``--concurrency`` thread.
+2. ``approve``: per slot, semua reservasi yang bentrok di-approve serentak
+   (dilepas bersamaan lewat barrier) oleh ``--contenders`` thread staff.
+   Hasil yang benar: tepat satu approve berhasil per slot, sisanya 400.
+
+Laporan (JSON) berisi throughput dan persentil latensi per fase, status
+response, conflict rate (approve yang ditolak karena bentrok), jumlah lock
+wait yang teramati di database (PostgreSQL: sampling ``pg_stat_activity``),
+dan daftar pasangan reservasi APPROVED yang tumpang tindih setelah run.
+Proses keluar dengan kode 1 jika ada pasangan yang lolos atau server error.
+
+Skrip memakai settings dan database yang sama dengan server (``.env``), karena
+user, token JWT, dan verifikasi akhir dibuat/dibaca langsung lewat ORM.
+Reservasi dan user buatan run dihapus di akhir kecuali ``--keep``.
+
+Contoh:
+    gunicorn -c gunicorn.conf.py &
+    python benchmarks/contention.py --base-url http://127.0.0.1:8000 \\
+        --rooms 5 --slots 8 --contenders 16 --concurrency 32
+"""
+import argparse
+import http.client
+import json
+import os
+import queue
+import random
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from urllib.parse import urlsplit
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+USER_PREFIX = 'contention_'
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def setup_django():
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'siruinsk.settings')
+    import django
+    django.setup()
+
+
+class Client:
+    """ Satu koneksi keep-alive per thread """
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.connection = None
+
+    def request(self, method, path, body, token):
+        headers = {'Content-Type': 'application/json', 'Authorization': f'Bearer {token}'}
+        for attempt in range(2):
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(self.host, self.port, timeout=120)
+            try:
+                self.connection.request(method, path, body=json.dumps(body), headers=headers)
+                response = self.connection.getresponse()
+                content = response.read()
+                return response.status, json.loads(content) if content else None
+            except (OSError, http.client.HTTPException, ValueError):
+                # Koneksi ditutup server (mis. max_requests worker), coba sekali lagi
+                self.connection.close()
+                self.connection = None
+                if attempt:
+                    return 'error', None
+
+
+class Phase:
+    def __init__(self, name):
+        self.name = name
+        self.latencies = []
+        self.statuses = Counter()
+        self.lock = threading.Lock()
+        self.started = self.finished = None
+
+    def add(self, status, latency):
+        with self.lock:
+            self.latencies.append(latency)
+            self.statuses[status] += 1
+
+    def report(self):
+        latencies = sorted(self.latencies)
+        elapsed = self.finished - self.started
+        ms = lambda value: None if value is None else round(value * 1000, 2)
+        return {
+            'requests': len(latencies),
+            'duration_s': round(elapsed, 2),
+            'throughput_rps': round(len(latencies) / elapsed, 1) if elapsed else None,
+            'latency_ms': {
+                'mean': ms(statistics.fmean(latencies)) if latencies else None,
+                'p50': ms(percentile(latencies, 50)),
+                'p90': ms(percentile(latencies, 90)),
+                'p99': ms(percentile(latencies, 99)),
+                'max': ms(latencies[-1] if latencies else None),
+            },
+            'statuses': {str(k): v for k, v in sorted(self.statuses.items(), key=lambda kv: str(kv[0]))},
+        }
+
+
+class LockWaitSampler(threading.Thread):
+    """
+    Sampling backend yang sedang menunggu lock (PostgreSQL). Untuk database
+    lain hanya server error (mis. "database is locked" SQLite) yang terlihat.
+    """
+    def __init__(self, interval=0.05):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.samples = []
+        self.stopped = threading.Event()
+
+    @staticmethod
+    def supported():
+        from django.db import connection
+        return connection.vendor == 'postgresql'
+
+    def run(self):
+        from django.db import connection
+        try:
+            with connection.cursor() as cursor:
+                while not self.stopped.is_set():
+                    cursor.execute(
+                        "SELECT count(*) FROM pg_stat_activity "
+                        "WHERE datname = current_database() AND wait_event_type = 'Lock'"
+                    )
+                    self.samples.append(cursor.fetchone()[0])
+                    self.stopped.wait(self.interval)
+        finally:
+            connection.close()
+
+    def report(self):
+        waiting = [sample for sample in self.samples if sample]
+        return {
+            'samples': len(self.samples),
+            'samples_with_waits': len(waiting),
+            'max_waiting_backends': max(self.samples, default=0),
+            'mean_waiting_backends': round(statistics.fmean(self.samples), 2) if self.samples else 0,
+        }
+
+
+def prepare(args, run_id):
+    """ Ruangan, user peminta, dan staff untuk run ini """
+    from django.contrib.auth.models import User
+    from ruang.models import Location, Room
+
+    rooms = list(Room.objects.order_by('pk')[:args.rooms])
+    created_rooms = []
+    if len(rooms) < args.rooms:
+        location = Location.objects.create(name=f'{USER_PREFIX}{run_id}', address='-')
+        created_rooms = [
+            Room.objects.create(name=f'{USER_PREFIX}{run_id}_{index}', location=location, capacity=100)
+            for index in range(args.rooms - len(rooms))
+        ]
+        rooms += created_rooms
+
+    users = [
+        User(username=f'{USER_PREFIX}{run_id}_{index}', password='!')
+        for index in range(args.contenders)
+    ]
+    users = User.objects.bulk_create(users)
+    staff = User.objects.create(username=f'{USER_PREFIX}{run_id}_staff', password='!', is_staff=True)
+    return rooms, created_rooms, users, staff
+
+
+def slot_requests(args, rooms, users, rng):
+    """ Grup permintaan per (ruangan, slot); anggota grup saling tumpang tindih """
+    day = datetime.combine(args.date, datetime.min.time(), tzinfo=timezone.utc)
+    groups = []
+    for room in rooms:
+        for slot in range(args.slots):
+            start = day + timedelta(hours=7 + 2 * slot)
+            group = []
+            for user in users:
+                # Geser maksimal 30 menit: setiap pasangan dalam grup tetap bentrok
+                offset = timedelta(minutes=rng.choice((0, 15, 30)))
+                group.append({
+                    'user': user,
+                    'body': {
+                        'room': room.pk,
+                        'start': (start + offset).isoformat(),
+                        'end': (start + offset + timedelta(hours=1)).isoformat(),
+                        'purpose': args.purpose,
+                        'requested_capacity': 10,
+                    },
+                })
+            groups.append(group)
+    return groups
+
+
+def run_creates(args, groups, tokens, rng):
+    phase = Phase('create')
+    work = queue.Queue()
+    requests = [(group_index, item) for group_index, group in enumerate(groups) for item in group]
+    rng.shuffle(requests)
+    for request in requests:
+        work.put(request)
+    created = [[] for _ in groups]
+
+    def worker():
+        client = Client(args.base_url)
+        while True:
+            try:
+                group_index, item = work.get_nowait()
+            except queue.Empty:
+                return
+            start = time.perf_counter()
+            status, data = client.request('POST', '/api/reservations/', item['body'], tokens[item['user'].pk])
+            phase.add(status, time.perf_counter() - start)
+            if status == 201:
+                created[group_index].append(data['id'])
+
+    threads = [threading.Thread(target=worker) for _ in range(args.concurrency)]
+    phase.started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    phase.finished = time.perf_counter()
+    return phase, created
+
+
+def run_approvals(args, created, token):
+    """
+    Setiap grup di-approve serentak: ``--contenders`` thread menunggu di
+    barrier lalu mengirim PATCH approve untuk reservasi yang berbeda.
+    """
+    phase = Phase('approve')
+    width = max((len(ids) for ids in created), default=0)
+    if not width:
+        phase.started = phase.finished = time.perf_counter()
+        return phase, []
+    barrier = threading.Barrier(width)
+    approved = [[] for _ in created]
+
+    def worker(position):
+        client = Client(args.base_url)
+        for group_index, ids in enumerate(created):
+            barrier.wait()
+            if position >= len(ids):
+                continue
+            reservation_id = ids[position]
+            start = time.perf_counter()
+            status, _ = client.request(
+                'PATCH', f'/api/reservations/{reservation_id}/approve/', {'status': 'APPROVED'}, token
+            )
+            phase.add(status, time.perf_counter() - start)
+            if status == 200:
+                approved[group_index].append(reservation_id)
+
+    threads = [threading.Thread(target=worker, args=(position,)) for position in range(width)]
+    phase.started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    phase.finished = time.perf_counter()
+    return phase, approved
+
+
+def overlapping_approved(rooms, day):
+    """ Pasangan reservasi APPROVED yang tumpang tindih di ruangan dan tanggal yang diuji """
+    from ruang.models import Reservation
+
+    pairs = []
+    start = datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc)
+    reservations = Reservation.objects.filter(
+        room__in=rooms, status='APPROVED', start__lt=start + timedelta(days=1), end__gt=start
+    ).order_by('room_id', 'start')
+    latest = {}
+    for reservation in reservations.only('id', 'room_id', 'start', 'end').iterator():
+        previous = latest.get(reservation.room_id)
+        if previous and reservation.start < previous.end:
+            pairs.append({'room': reservation.room_id, 'ids': [previous.id, reservation.id]})
+        if previous is None or reservation.end > previous.end:
+            latest[reservation.room_id] = reservation
+    return pairs
+
+
+def cleanup(run_id, created_rooms):
+    from django.contrib.auth.models import User
+    from ruang.models import Reservation
+
+    users = User.objects.filter(username__startswith=f'{USER_PREFIX}{run_id}_')
+    Reservation.objects.filter(requester__in=users).delete()
+    users.delete()
+    for room in created_rooms:
+        location = room.location
+        room.delete()
+        if not location.room_set.exists():
+            location.delete()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--rooms', type=int, default=5, help='Jumlah ruangan yang diperebutkan')
+    parser.add_argument('--slots', type=int, default=8, help='Jumlah slot per ruangan')
+    parser.add_argument('--contenders', type=int, default=16, help='Permintaan bentrok per slot')
+    parser.add_argument('-c', '--concurrency', type=int, default=32, help='Thread untuk fase create')
+    parser.add_argument('--date', type=datetime.fromisoformat, default=datetime(2030, 1, 7),
+                        help='Tanggal slot (YYYY-MM-DD), sebaiknya tanpa reservasi lain')
+    parser.add_argument('--purpose', default='Contention test')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--keep', action='store_true', help='Jangan hapus data hasil run')
+    parser.add_argument('-o', '--output', help='Simpan hasil JSON ke file')
+    args = parser.parse_args()
+    args.date = args.date.date()
+
+    setup_django()
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    rng = random.Random(args.seed)
+    run_id = f'{int(time.time())}{rng.randrange(1000):03d}'
+    rooms, created_rooms, users, staff = prepare(args, run_id)
+    try:
+        groups = slot_requests(args, rooms, users, rng)
+        sampler = LockWaitSampler() if LockWaitSampler.supported() else None
+        if sampler:
+            sampler.start()
+
+        # Token dibuat tepat sebelum setiap fase: masa berlaku bawaan hanya 1 menit
+        tokens = {user.pk: str(AccessToken.for_user(user)) for user in users}
+        create_phase, created = run_creates(args, groups, tokens, rng)
+        approve_phase, approved = run_approvals(args, created, str(AccessToken.for_user(staff)))
+
+        if sampler:
+            sampler.stopped.set()
+            sampler.join()
+
+        rejected = approve_phase.statuses[400]
+        attempted = sum(approve_phase.statuses.values())
+        overlaps = overlapping_approved(rooms, args.date)
+        result = {
+            'config': {
+                'rooms': len(rooms), 'slots': args.slots, 'contenders': args.contenders,
+                'concurrency': args.concurrency, 'date': args.date.isoformat(),
+            },
+            'create': create_phase.report(),
+            'approve': approve_phase.report(),
+            'conflict_rate': round(rejected / attempted, 3) if attempted else None,
+            # Slot dengan lebih dari satu approve berhasil (seharusnya 0)
+            'slots_double_approved': sum(1 for ids in approved if len(ids) > 1),
+            'slots_without_approval': sum(1 for ids in approved if not ids),
+            'lock_waits': sampler.report() if sampler else None,
+            'overlapping_approved_pairs': len(overlaps),
+            'overlaps': overlaps[:50],
+        }
+    finally:
+        if not args.keep:
+            cleanup(run_id, created_rooms)
+
+    text = json.dumps(result, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text + '\n')
+
+    server_errors = sum(
+        count for status, count in (create_phase.statuses + approve_phase.statuses).items()
+        if status == 'error' or str(status).startswith('5')
+    )
+    if overlaps or server_errors:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
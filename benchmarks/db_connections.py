@@ -0,0 +1,98 @@
+"""
+Benchmark overhead koneksi database per request.
+
+Mensimulasikan siklus request Django (signal ``request_started`` /
+``request_finished`` yang menutup atau mempertahankan koneksi sesuai
+``CONN_MAX_AGE``) dengan satu query ``SELECT 1`` di tengahnya, untuk beberapa
+varian konfigurasi. Setiap varian dijalankan di proses terpisah karena
+setting database dibaca sekali saat startup.
+
+Jalankan terhadap PostgreSQL lokal, mis.:
+    DB_ENGINE=django.db.backends.postgresql DB_NAME=siruinsk DB_USER=... \\
+        python benchmarks/db_connections.py -n 2000
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+VARIANTS = {
+    'no_persistence': {'DB_CONN_MAX_AGE': '0', 'DB_POOL': 'False'},
+    'persistent': {'DB_CONN_MAX_AGE': '600', 'DB_CONN_HEALTH_CHECKS': 'True', 'DB_POOL': 'False'},
+    'pool': {'DB_POOL': 'True'},
+}
+
+
+def measure(requests):
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'siruinsk.settings')
+    import django
+    django.setup()
+    from django.core import signals
+    from django.db import connection
+    from django.db.backends.signals import connection_created
+
+    opened = []
+    connection_created.connect(lambda **kwargs: opened.append(1), weak=False)
+
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        signals.request_started.send(sender=None)
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+        signals.request_finished.send(sender=None)
+        latencies.append(time.perf_counter() - start)
+
+    latencies.sort()
+    return {
+        'vendor': connection.vendor,
+        'requests': requests,
+        'connections_opened': len(opened),
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 3),
+        'p50_ms': round(latencies[len(latencies) // 2] * 1000, 3),
+        'p99_ms': round(latencies[int(len(latencies) * 0.99)] * 1000, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', '--requests', type=int, default=1000)
+    parser.add_argument('--variant', choices=VARIANTS, help=argparse.SUPPRESS)
+    parser.add_argument('-o', '--output', help='Simpan hasil JSON ke file')
+    args = parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(measure(args.requests)))
+        return
+
+    results = {}
+    for name, env in VARIANTS.items():
+        if name == 'pool' and 'postgresql' not in os.environ.get('DB_ENGINE', ''):
+            results[name] = {'skipped': 'pool hanya tersedia untuk PostgreSQL (psycopg 3)'}
+            continue
+        proc = subprocess.run(
+            [sys.executable, __file__, '--variant', name, '-n', str(args.requests)],
+            env={**os.environ, **env}, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            results[name] = {'error': proc.stderr.strip().splitlines()[-1] if proc.stderr else 'failed'}
+        else:
+            results[name] = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,303 @@
+"""
+Benchmark per endpoint API terhadap dataset hasil ``manage.py seed``.
+
+Setiap skenario dipanggil berurutan ``--iterations`` kali (setelah warmup) dan
+dicatat persentil latensi. Mode ``inprocess`` memanggil Django langsung lewat
+test client dan juga mencatat jumlah query serta alokasi memori (tracemalloc)
+per panggilan; mode ``http`` memanggil server lokal (gunicorn) lewat satu
+koneksi keep-alive.
+
+Setiap skenario punya status HTTP yang diharapkan; run yang mendapat status
+lain (redirect HTTPS, 401, 429, 5xx) dianggap gagal, karena respons error
+biasanya jauh lebih cepat dan akan terlihat seperti perbaikan.
+
+Hasil ditulis sebagai JSON (``--output``). Dengan ``--baseline`` hasil
+dibandingkan dengan run sebelumnya. Proses keluar dengan kode 1 jika ada
+status yang tidak sesuai, regresi melebihi ``--threshold`` (latensi p50,
+alokasi), atau jumlah query bertambah.
+
+Contoh:
+    python manage.py seed --reservations 1000000
+    python benchmarks/endpoints.py -o benchmarks/baseline.json
+    # ... ubah kode ...
+    python benchmarks/endpoints.py --baseline benchmarks/baseline.json
+
+    # Mode HTTP: naikkan rate throttle login agar skenario login tidak kena
+    # 429, dan matikan SECURE_SSL_REDIRECT (atau pakai --base-url https://...)
+    # agar request http:// tidak dijawab redirect 301
+    SECURE_SSL_REDIRECT=False \\
+    THROTTLE_LOGIN_IP_RATE=100000/min THROTTLE_LOGIN_IDENTIFIER_RATE=100000/min \\
+        gunicorn -c gunicorn.conf.py &
+    python benchmarks/endpoints.py --mode http --base-url http://127.0.0.1:8000
+
+Skenario ``approve`` mengubah status reservasi PENDING menjadi APPROVED (satu
+reservasi per panggilan), jadi dataset sebaiknya di-seed ulang sebelum run
+yang dijadikan baseline.
+"""
+import argparse
+import http.client
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from urllib.parse import urlsplit
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# Metrik yang dibandingkan relatif terhadap baseline dengan --threshold
+# (p99 terlalu bising untuk run pendek, hanya dilaporkan)
+COMPARED_METRICS = ('p50_ms', 'alloc_kb')
+
+
+def percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def setup_django():
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'siruinsk.settings')
+    # Benchmark memanggil login berulang kali
+    for name in ('THROTTLE_LOGIN_IP_RATE', 'THROTTLE_LOGIN_IDENTIFIER_RATE'):
+        os.environ.setdefault(name, '1000000/min')
+    # Access token bawaan hanya berlaku 1 menit (mode inprocess)
+    os.environ.setdefault('ACCESS_TOKEN_LIFETIME', '60')
+    import django
+    django.setup()
+
+
+def discover(password):
+    """ User, staff, ruangan, dan reservasi dari dataset seed yang dipakai skenario """
+    from django.contrib.auth.models import User
+    from ruang.models import Reservation, Room
+
+    user = User.objects.filter(username__startswith='seed_', is_staff=False).order_by('pk').first()
+    staff = User.objects.filter(username__startswith='seed_', is_staff=True).order_by('pk').first()
+    room = Room.objects.order_by('pk').first()
+    pending = list(Reservation.objects.filter(status='PENDING').order_by('pk').values_list('pk', flat=True)[:10000])
+    if not (user and staff and room and pending):
+        sys.exit('Dataset belum ada, jalankan dulu: python manage.py seed')
+    return {
+        'user': user, 'staff': staff, 'password': password,
+        'room_id': room.pk, 'pending': iter(pending),
+    }
+
+
+def scenarios(ctx):
+    """
+    (nama, metode, path, body, user, status yang diharapkan); body/path boleh
+    callable(state)
+    """
+    return [
+        ('rooms_list', 'GET', '/api/rooms/', None, 'user', 200),
+        ('rooms_available', 'GET',
+         '/api/rooms/?available_from=2025-10-06T08:00:00Z&available_to=2025-10-06T10:00:00Z&min_capacity=30',
+         None, 'user', 200),
+        ('room_availability', 'GET',
+         f'/api/rooms/{ctx["room_id"]}/availability/?start=2025-10-06T08:00:00Z&end=2025-10-06T10:00:00Z',
+         None, 'user', 200),
+        ('locations_list', 'GET', '/api/locations/', None, 'user', 200),
+        ('reservations_search', 'GET', '/api/reservations/?search=Seminar', None, 'staff', 200),
+        ('my_reservations', 'GET', '/api/reservations/my_reservations/', None, 'user', 200),
+        ('feedback_list', 'GET', '/api/feedback/', None, 'user', 200),
+        ('profile_me', 'GET', '/api/profile/me', None, 'user', 200),
+        # Setiap panggilan menyetujui reservasi PENDING yang berbeda
+        ('approve', 'PATCH', lambda state: f'/api/reservations/{next(ctx["pending"])}/approve/',
+         {'status': 'APPROVED'}, 'staff', 200),
+        ('login', 'POST', '/api/login',
+         {'username': ctx['user'].username, 'password': ctx['password']}, None, 200),
+        # Refresh token dirotasi dan di-blacklist: setiap panggilan memakai token hasil panggilan sebelumnya
+        ('token_refresh', 'POST', '/api/token/refresh', lambda state: {'refresh': state['refresh']}, None, 200),
+    ]
+
+
+def _json_body(content_type, content):
+    # Redirect/error dari proxy atau Django bisa berupa HTML
+    if content and content_type.split(';')[0].strip().endswith('json'):
+        return json.loads(content)
+    return None
+
+
+class InProcessTransport:
+    measures_queries = True
+
+    def __init__(self):
+        from rest_framework.test import APIClient
+        self.client = APIClient()
+
+    def request(self, method, path, body, token):
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if token else {}
+        response = getattr(self.client, method.lower())(path, body, format='json', **headers)
+        return response.status_code, _json_body(response.get('Content-Type', ''), response.content)
+
+
+class HTTPTransport:
+    measures_queries = False
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        if parts.scheme == 'https':
+            self.connection = http.client.HTTPSConnection(parts.hostname, parts.port or 443, timeout=60)
+        else:
+            self.connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=60)
+
+    def request(self, method, path, body, token):
+        headers = {'Content-Type': 'application/json'}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        payload = json.dumps(body) if body is not None else None
+        self.connection.request(method, path, body=payload, headers=headers)
+        response = self.connection.getresponse()
+        content = response.read()
+        return response.status, _json_body(response.getheader('Content-Type', ''), content)
+
+
+def run_scenario(transport, scenario, ctx, state, iterations, warmup, trace):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    name, method, path, body, user, expected_status = scenario
+    # Token baru per skenario: masa berlaku access token bawaan hanya 1 menit
+    token = str(AccessToken.for_user(ctx[user])) if user else None
+    latencies, queries, allocations, statuses = [], [], [], Counter()
+
+    def call():
+        payload = body(state) if callable(body) else body
+        url = path(state) if callable(path) else path
+        status, data = transport.request(method, url, payload, token)
+        if name == 'token_refresh' and status == 200:
+            state['refresh'] = data['refresh']
+        return status
+
+    for _ in range(warmup):
+        call()
+
+    for _ in range(iterations):
+        start = time.perf_counter()
+        if transport.measures_queries:
+            with CaptureQueriesContext(connection) as captured:
+                status = call()
+            queries.append(len(captured.captured_queries))
+        else:
+            status = call()
+        latencies.append((time.perf_counter() - start) * 1000)
+        statuses[status] += 1
+
+    # tracemalloc memperlambat eksekusi, diukur di putaran terpisah
+    if trace:
+        for _ in range(min(iterations, 20)):
+            tracemalloc.start()
+            call()
+            allocations.append(tracemalloc.get_traced_memory()[1] / 1024)
+            tracemalloc.stop()
+
+    latencies.sort()
+    result = {
+        'calls': iterations,
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p90_ms': round(percentile(latencies, 90), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'mean_ms': round(statistics.fmean(latencies), 3),
+        'status': dict(statuses),
+        'expected_status': expected_status,
+    }
+    if queries:
+        result['queries'] = max(queries)
+    if allocations:
+        result['alloc_kb'] = round(statistics.median(allocations), 1)
+    return result
+
+
+def status_errors(results):
+    """ Skenario yang mendapat status selain yang diharapkan """
+    errors = []
+    for name, current in results['scenarios'].items():
+        unexpected = {status: count for status, count in current['status'].items()
+                      if int(status) != current['expected_status']}
+        if unexpected:
+            errors.append(f'{name}: status {unexpected}, diharapkan {current["expected_status"]}')
+    return errors
+
+
+def compare(results, baseline, threshold):
+    """ Daftar regresi dibanding baseline (termasuk status yang tidak sesuai) """
+    regressions = status_errors(results)
+    for name, current in results['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if not previous:
+            continue
+        for metric in COMPARED_METRICS:
+            if metric in current and metric in previous and previous[metric] > 0:
+                change = current[metric] / previous[metric] - 1
+                if change > threshold:
+                    regressions.append(
+                        f'{name}.{metric}: {previous[metric]} -> {current[metric]} (+{change:.0%})'
+                    )
+        if 'queries' in current and 'queries' in previous and current['queries'] > previous['queries']:
+            regressions.append(f'{name}.queries: {previous["queries"]} -> {current["queries"]}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mode', choices=('inprocess', 'http'), default='inprocess')
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+    parser.add_argument('-n', '--iterations', type=int, default=100)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--password', default='password123', help='Password user seed')
+    parser.add_argument('--only', help='Jalankan skenario tertentu saja (dipisah koma)')
+    parser.add_argument('--no-trace', action='store_true', help='Lewati pengukuran alokasi memori')
+    parser.add_argument('-o', '--output', help='Tulis hasil JSON ke file')
+    parser.add_argument('--baseline', help='File JSON hasil run sebelumnya untuk dibandingkan')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Batas regresi relatif (0.2 = 20%%)')
+    args = parser.parse_args()
+
+    if args.mode == 'inprocess':
+        os.environ.setdefault('SECURE_SSL_REDIRECT', 'False')
+        os.environ['ALLOWED_HOSTS'] = os.environ.get('ALLOWED_HOSTS', '') + ',testserver'
+    setup_django()
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    ctx = discover(args.password)
+    state = {'refresh': str(RefreshToken.for_user(ctx['user']))}
+    transport = InProcessTransport() if args.mode == 'inprocess' else HTTPTransport(args.base_url)
+    trace = args.mode == 'inprocess' and not args.no_trace
+
+    selected = set(args.only.split(',')) if args.only else None
+    results = {'mode': args.mode, 'iterations': args.iterations, 'scenarios': {}}
+    for scenario in scenarios(ctx):
+        if selected and scenario[0] not in selected:
+            continue
+        result = run_scenario(transport, scenario, ctx, state, args.iterations, args.warmup, trace)
+        results['scenarios'][scenario[0]] = result
+        print(f'{scenario[0]:<22} p50 {result["p50_ms"]:>9.2f} ms  p99 {result["p99_ms"]:>9.2f} ms'
+              f'  queries {result.get("queries", "-"):>3}  alloc {result.get("alloc_kb", "-")} KB'
+              f'  {result["status"]}', file=sys.stderr)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + '\n')
+    else:
+        print(text)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print('REGRESI:', *regressions, sep='\n  ', file=sys.stderr)
+            sys.exit(1)
+        print('Tidak ada regresi dibanding baseline.', file=sys.stderr)
+    else:
+        errors = status_errors(results)
+        if errors:
+            print('STATUS TIDAK SESUAI:', *errors, sep='\n  ', file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""
+Laporan waktu import saat worker start, dari ``python -X importtime``.
+
+Menjalankan proses baru yang memuat aplikasi seperti worker gunicorn
+(``get_wsgi_application``/``get_asgi_application`` lalu urlconf), beberapa
+kali, dan melaporkan median total waktu import, waktu per paket top-level
+(self time dijumlahkan), serta modul proyek/pihak ketiga yang paling mahal
+(waktu kumulatif). Juga dicatat waktu ``warmup.run()`` (lihat
+``siruinsk/utils/warmup.py``).
+
+Hasil ditulis sebagai JSON (``--output``). Dengan ``--baseline`` proses
+keluar dengan kode 1 jika total import naik melebihi ``--threshold`` atau
+modul berat baru muncul di jalur start.
+
+Contoh:
+    python benchmarks/importtime.py -o benchmarks/importtime.json
+    # ... ubah kode ...
+    python benchmarks/importtime.py --baseline benchmarks/importtime.json
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import Counter
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+LOADER = '''
+import os, sys, time
+sys.path.insert(0, {base_dir!r})
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'siruinsk.settings')
+start = time.perf_counter()
+from django.core.{mode} import get_{mode}_application
+application = get_{mode}_application()
+from django.urls import get_resolver
+get_resolver().url_patterns
+loaded = time.perf_counter()
+from siruinsk.utils import warmup
+warmup.run()
+sys.stdout.write('%f %f' % (loaded - start, time.perf_counter() - loaded))
+'''
+
+
+def run_once(mode):
+    code = LOADER.format(base_dir=str(BASE_DIR), mode=mode)
+    env = dict(os.environ, LOG_LEVEL='WARNING')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True, text=True, env=env, cwd=BASE_DIR,
+    )
+    if result.returncode != 0:
+        sys.exit(result.stderr[-2000:])
+    load_s, warmup_s = map(float, result.stdout.split())
+
+    self_us = Counter()
+    cumulative_us = {}
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if not match:
+            continue
+        name = match[4]
+        self_us[name] = int(match[1])
+        cumulative_us[name] = int(match[2])
+    return {'load_s': load_s, 'warmup_s': warmup_s, 'self_us': self_us, 'cumulative_us': cumulative_us}
+
+
+def report(runs, top):
+    def median_of(key, name=None):
+        values = [run[key][name] if name else run[key] for run in runs if name is None or name in run[key]]
+        return statistics.median(values) if values else 0
+
+    modules = set().union(*(run['self_us'] for run in runs))
+    by_package = Counter()
+    for name in modules:
+        by_package[name.split('.')[0]] += median_of('self_us', name)
+
+    return {
+        'runs': len(runs),
+        'load_ms': round(median_of('load_s') * 1000, 1),
+        'warmup_ms': round(median_of('warmup_s') * 1000, 1),
+        'import_total_ms': round(sum(by_package.values()) / 1000, 1),
+        'modules': len(modules),
+        'packages_ms': {name: round(us / 1000, 1) for name, us in by_package.most_common(top)},
+        'slowest_modules_ms': {
+            name: round(median_of('cumulative_us', name) / 1000, 1)
+            for name in sorted(modules, key=lambda name: median_of('cumulative_us', name), reverse=True)[:top]
+        },
+        'module_list': sorted(modules),
+    }
+
+
+def compare(result, baseline, threshold):
+    regressions = []
+    previous = baseline.get('import_total_ms')
+    if previous and result['import_total_ms'] / previous - 1 > threshold:
+        regressions.append(f'import_total_ms: {previous} -> {result["import_total_ms"]}')
+    for name, ms in result['packages_ms'].items():
+        if name not in baseline.get('packages_ms', {}) and name not in baseline.get('module_list', ()):
+            regressions.append(f'paket baru di jalur start: {name} ({ms} ms)')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mode', choices=('wsgi', 'asgi'), default='wsgi')
+    parser.add_argument('-n', '--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('-o', '--output', help='Tulis hasil JSON ke file')
+    parser.add_argument('--baseline', help='File JSON hasil run sebelumnya untuk dibandingkan')
+    parser.add_argument('--threshold', type=float, default=0.15, help='Batas kenaikan total import (0.15 = 15%%)')
+    args = parser.parse_args()
+
+    result = report([run_once(args.mode) for _ in range(args.runs)], args.top)
+    result['mode'] = args.mode
+    print(f'load {result["load_ms"]} ms, import {result["import_total_ms"]} ms '
+          f'({result["modules"]} modul), warmup {result["warmup_ms"]} ms', file=sys.stderr)
+    for name, ms in result['slowest_modules_ms'].items():
+        print(f'  {ms:>8} ms  {name}', file=sys.stderr)
+
+    text = json.dumps(result, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + '\n')
+    else:
+        print(text)
+
+    if args.baseline:
+        regressions = compare(result, json.loads(Path(args.baseline).read_text()), args.threshold)
+        if regressions:
+            print('REGRESI:', *regressions, sep='\n  ', file=sys.stderr)
+            sys.exit(1)
+        print('Tidak ada regresi dibanding baseline.', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
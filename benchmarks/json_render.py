@@ -0,0 +1,163 @@
+"""
+Benchmark serialisasi dan rendering JSON untuk satu halaman reservasi.
+
+Mengukur terpisah, per halaman ``--rows`` reservasi (median dari
+``--repeat`` kali): serialisasi ``ReservationSerializer`` (field DRF),
+render ``JSONRenderer`` bawaan DRF vs ``FastJSONRenderer`` (orjson, lihat
+``siruinsk/utils/fastjson.py``), serta parse balik dengan kedua parser.
+Keluaran kedua renderer harus sama byte demi byte; jika tidak, proses keluar
+dengan kode 1.
+
+Secara default baris reservasi dibangun di memori (tanpa database) dengan
+nilai yang mirip data asli; ``--db`` memakai baris pertama dataset
+``manage.py seed`` dan juga membandingkan jalur list lengkap (query +
+serialisasi): instance model + ``ReservationSerializer`` vs ``values_list`` +
+``RowMapper`` (``siruinsk/utils/row_mapper.py``), yang hasilnya juga harus
+identik.
+
+Contoh:
+    python benchmarks/json_render.py
+    python benchmarks/json_render.py --rows 1000 --db -o benchmarks/json_render.json
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django():
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'siruinsk.settings')
+    import django
+    django.setup()
+
+
+def synthetic_rows(count):
+    from django.contrib.auth.models import User
+    from ruang.models import Location, Reservation, Room
+
+    locations = [Location(pk=index, name=f'Gedung {chr(65 + index)}') for index in range(5)]
+    rooms = [
+        Room(pk=index, name=f'Ruang {index:03d}', location=locations[index % 5], capacity=20 + index)
+        for index in range(50)
+    ]
+    users = [
+        User(pk=index, username=f'mahasiswa{index}', email=f'mahasiswa{index}@students.uin-suka.ac.id')
+        for index in range(200)
+    ]
+    start = datetime(2025, 1, 6, 1, 0, tzinfo=timezone.utc)
+    rows = []
+    for index in range(count):
+        begin = start + timedelta(hours=index)
+        rows.append(Reservation(
+            pk=index + 1, requester=users[index % 200], room=rooms[index % 50],
+            start=begin, end=begin + timedelta(hours=2),
+            purpose=f'Rapat koordinasi himpunan mahasiswa #{index} — persiapan acara',
+            requested_capacity=10 + index % 30, status=('PENDING', 'APPROVED', 'DECLINED')[index % 3],
+            created_at=begin - timedelta(days=3, microseconds=index), updated_at=begin - timedelta(days=1),
+        ))
+    return rows
+
+
+def db_rows(count):
+    from ruang.models import Reservation
+
+    rows = list(Reservation.objects.select_related('requester', 'room', 'room__location').order_by('pk')[:count])
+    if len(rows) < count:
+        sys.exit(f'Dataset hanya berisi {len(rows)} reservasi, jalankan dulu: python manage.py seed')
+    return rows
+
+
+def timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return result, round(statistics.median(times) * 1000, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--db', action='store_true', help='Pakai reservasi dari database (dataset seed)')
+    parser.add_argument('-o', '--output', help='Tulis hasil JSON ke file')
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from ruang.serializers import ReservationSerializer
+    from siruinsk.utils import fastjson
+
+    if fastjson.orjson is None:
+        sys.exit('orjson tidak terpasang: FastJSONRenderer memakai json stdlib')
+
+    rows = db_rows(args.rows) if args.db else synthetic_rows(args.rows)
+    # Bentuk respons paginasi DRF
+    page = lambda data: {'count': len(rows), 'next': None, 'previous': None, 'results': data}
+
+    data, serialize_ms = timed(lambda: page(ReservationSerializer(rows, many=True).data), args.repeat)
+    stdlib, render_stdlib_ms = timed(lambda: JSONRenderer().render(data), args.repeat)
+    fast, render_orjson_ms = timed(lambda: fastjson.FastJSONRenderer().render(data), args.repeat)
+    _, parse_stdlib_ms = timed(lambda: JSONParser().parse(io.BytesIO(stdlib)), args.repeat)
+    _, parse_orjson_ms = timed(lambda: fastjson.FastJSONParser().parse(io.BytesIO(stdlib)), args.repeat)
+
+    if args.db:
+        from ruang.models import Reservation
+        from siruinsk.utils.row_mapper import get_mapper
+
+        queryset = Reservation.objects.select_related('requester', 'room', 'room__location').order_by('pk')
+        mapper = get_mapper(ReservationSerializer)
+        orm, orm_ms = timed(lambda: ReservationSerializer(queryset[:args.rows], many=True).data, args.repeat)
+        values, values_ms = timed(
+            lambda: mapper.map_rows(queryset.values_list(*mapper.columns)[:args.rows]), args.repeat
+        )
+        identical = JSONRenderer().render(orm) == JSONRenderer().render(values)
+        stages = {'list_orm_ms': orm_ms, 'list_values_ms': values_ms, 'list_speedup': round(orm_ms / values_ms, 1)}
+        print(f'list {orm_ms} -> {values_ms} ms (query + serialisasi)', file=sys.stderr)
+    else:
+        identical, stages = True, {}
+
+    result = {
+        'rows': args.rows,
+        'source': 'db' if args.db else 'synthetic',
+        'bytes': len(stdlib),
+        'identical': stdlib == fast and identical,
+        'serialize_ms': serialize_ms,
+        'render_stdlib_ms': render_stdlib_ms,
+        'render_orjson_ms': render_orjson_ms,
+        'render_speedup': round(render_stdlib_ms / render_orjson_ms, 1),
+        'parse_stdlib_ms': parse_stdlib_ms,
+        'parse_orjson_ms': parse_orjson_ms,
+        'parse_speedup': round(parse_stdlib_ms / parse_orjson_ms, 1),
+        **stages,
+    }
+    print(
+        f'{args.rows} baris ({len(stdlib) / 1024:.0f} KiB): serialisasi {serialize_ms} ms, '
+        f'render {render_stdlib_ms} -> {render_orjson_ms} ms, parse {parse_stdlib_ms} -> {parse_orjson_ms} ms',
+        file=sys.stderr,
+    )
+
+    text = json.dumps(result, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + '\n')
+    else:
+        print(text)
+
+    if not result['identical']:
+        print('GAGAL: keluaran jalur cepat berbeda dengan serializer/JSONRenderer bawaan', file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""
+Load test HTTP sederhana tanpa dependensi tambahan: N klien bersamaan, masing-
+masing dengan koneksi keep-alive sendiri, memanggil satu URL berulang kali
+selama durasi tertentu. Dipakai untuk membandingkan mode SERVER_MODE=wsgi dan
+SERVER_MODE=asgi (lihat gunicorn.conf.py).
+
+Contoh:
+    SERVER_MODE=asgi gunicorn -c gunicorn.conf.py &
+    python benchmarks/load.py http://127.0.0.1:8000/api/rooms/ \\
+        -c 500 -d 30 -H "Authorization: Bearer <token>"
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def read_response(reader):
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('connection closed')
+    status = int(status_line.split()[1])
+    length, chunked, close = 0, False, False
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        name, value = name.strip().lower(), value.strip()
+        if name == 'content-length':
+            length = int(value)
+        elif name == 'transfer-encoding' and 'chunked' in value.lower():
+            chunked = True
+        elif name == 'connection' and value.lower() == 'close':
+            close = True
+    if chunked:
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    elif length:
+        await reader.readexactly(length)
+    return status, close
+
+
+async def client(url, headers, deadline, latencies, statuses, state):
+    parts = urlsplit(url)
+    path = parts.path + (f'?{parts.query}' if parts.query else '')
+    request = (
+        f'GET {path} HTTP/1.1\r\nHost: {parts.netloc}\r\n'
+        + ''.join(f'{h}\r\n' for h in headers)
+        + '\r\n'
+    ).encode()
+    reader = writer = None
+    while time.perf_counter() < deadline:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(parts.hostname, parts.port or 80)
+            start = time.perf_counter()
+            state['in_flight'] += 1
+            state['max_in_flight'] = max(state['max_in_flight'], state['in_flight'])
+            try:
+                writer.write(request)
+                await writer.drain()
+                status, close = await read_response(reader)
+            finally:
+                state['in_flight'] -= 1
+            latencies.append(time.perf_counter() - start)
+            statuses[status] += 1
+            if close:
+                writer.close()
+                writer = None
+        except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError, IndexError):
+            statuses['error'] += 1
+            if writer is not None:
+                writer.close()
+            writer = None
+            await asyncio.sleep(0.05)
+    if writer is not None:
+        writer.close()
+
+
+async def run(url, concurrency, duration, headers):
+    latencies, statuses = [], Counter()
+    state = {'in_flight': 0, 'max_in_flight': 0}
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*[
+        client(url, headers, deadline, latencies, statuses, state) for _ in range(concurrency)
+    ])
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    ms = lambda value: None if value is None else round(value * 1000, 2)
+    return {
+        'url': url,
+        'concurrency': concurrency,
+        'duration_s': round(elapsed, 2),
+        'requests': len(latencies),
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+        'max_in_flight': state['max_in_flight'],
+        'latency_ms': {
+            'mean': ms(statistics.fmean(latencies)) if latencies else None,
+            'p50': ms(percentile(latencies, 50)),
+            'p90': ms(percentile(latencies, 90)),
+            'p99': ms(percentile(latencies, 99)),
+            'max': ms(latencies[-1] if latencies else None),
+        },
+        'statuses': {str(k): v for k, v in sorted(statuses.items(), key=lambda kv: str(kv[0]))},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('url')
+    parser.add_argument('-c', '--concurrency', type=int, default=500)
+    parser.add_argument('-d', '--duration', type=float, default=30)
+    parser.add_argument('-H', '--header', action='append', default=[], help='Header tambahan, "Nama: nilai"')
+    parser.add_argument('-o', '--output', help='Simpan hasil JSON ke file')
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.url, args.concurrency, args.duration, args.header))
+    text = json.dumps(result, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+
+
+if __name__ == '__main__':
+    main()
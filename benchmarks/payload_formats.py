@@ -0,0 +1,81 @@
+"""
+Benchmark ukuran payload dan waktu parse di klien untuk satu halaman
+reservasi dalam tiga format respons: JSON, JSON kolumnar, dan MessagePack
+(lihat ``siruinsk/utils/compact_formats.py``).
+
+Per format dilaporkan ukuran mentah dan setelah gzip, waktu render di server,
+dan waktu parse sampai menjadi list dict (median dari ``--repeat`` kali).
+Hasil decode setiap format harus sama dengan JSON; jika tidak, proses keluar
+dengan kode 1. Baris reservasi dibangun seperti ``benchmarks/json_render.py``
+(sintetis, atau ``--db`` untuk dataset ``manage.py seed``).
+
+Contoh:
+    python benchmarks/payload_formats.py --rows 500
+    python benchmarks/payload_formats.py --rows 1000 --db -o benchmarks/payload_formats.json
+"""
+import argparse
+import gzip
+import json
+import sys
+from pathlib import Path
+
+from json_render import db_rows, setup_django, synthetic_rows, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--db', action='store_true', help='Pakai reservasi dari database (dataset seed)')
+    parser.add_argument('-o', '--output', help='Tulis hasil JSON ke file')
+    args = parser.parse_args()
+
+    setup_django()
+    from ruang.serializers import ReservationSerializer
+    from siruinsk.utils import compact_formats
+    from siruinsk.utils.fastjson import FastJSONRenderer
+
+    if compact_formats.msgpack is None:
+        sys.exit('msgpack tidak terpasang: pip install msgpack')
+    msgpack = compact_formats.msgpack
+
+    rows = db_rows(args.rows) if args.db else synthetic_rows(args.rows)
+    data = {'count': len(rows), 'next': None, 'previous': None, 'results': ReservationSerializer(rows, many=True).data}
+    expected = json.loads(FastJSONRenderer().render(data))
+
+    def decode_columnar(body):
+        page = json.loads(body)
+        return {**page, 'results': compact_formats.decode_columnar(page['results'])}
+
+    formats = {
+        'json': (FastJSONRenderer, json.loads),
+        'columnar': (compact_formats.ColumnarJSONRenderer, decode_columnar),
+        'msgpack': (compact_formats.MessagePackRenderer, msgpack.unpackb),
+    }
+    result = {'rows': args.rows, 'source': 'db' if args.db else 'synthetic', 'identical': True, 'formats': {}}
+    for name, (renderer_class, decode) in formats.items():
+        body, render_ms = timed(lambda: renderer_class().render(data), args.repeat)
+        decoded, parse_ms = timed(lambda: decode(body), args.repeat)
+        result['identical'] &= decoded == expected
+        result['formats'][name] = {
+            'bytes': len(body), 'gzip_bytes': len(gzip.compress(body)), 'render_ms': render_ms, 'parse_ms': parse_ms,
+        }
+        print(
+            f'{name:9} {len(body) / 1024:7.1f} KiB (gzip {len(gzip.compress(body)) / 1024:6.1f} KiB), '
+            f'render {render_ms} ms, parse {parse_ms} ms',
+            file=sys.stderr,
+        )
+
+    text = json.dumps(result, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + '\n')
+    else:
+        print(text)
+
+    if not result['identical']:
+        print('GAGAL: hasil decode berbeda dengan respons JSON', file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Konfigurasi gunicorn. Dibaca otomatis oleh ``gunicorn`` dari direktori kerja,
+atau eksplisit dengan ``gunicorn -c gunicorn.conf.py``.
+
+SERVER_MODE=wsgi  -> worker sync, ``siruinsk.wsgi:application``
+SERVER_MODE=asgi  -> worker uvicorn, ``siruinsk.asgi:application``; satu worker
+                     melayani banyak koneksi sekaligus lewat event loop.
+
+Nama di level modul dibaca gunicorn sebagai setting, jadi helper decouple
+diakses lewat modulnya (``config`` sendiri adalah nama setting gunicorn).
+"""
+import os
+import tempfile
+
+import decouple
+
+from siruinsk.utils import metrics
+
+SERVER_MODE = decouple.config('SERVER_MODE', default='wsgi')
+
+bind = decouple.config('GUNICORN_BIND', default='0.0.0.0:8000')
+workers = decouple.config('GUNICORN_WORKERS', default=3, cast=int)
+timeout = decouple.config('GUNICORN_TIMEOUT', default=30, cast=int)
+
+# Aplikasi diimpor sekali di master lalu di-fork (copy-on-write): restart dan
+# worker baru tidak mengulang import Django/DRF/Pillow. Kode baru perlu restart
+# master (HUP tidak memuat ulang kode aplikasi)
+preload_app = decouple.config('GUNICORN_PRELOAD_APP', default=True, cast=bool)
+# Worker didaur ulang setelah sekian request (membatasi pertumbuhan memori);
+# jitter mencegah semua worker restart bersamaan
+max_requests = decouple.config('GUNICORN_MAX_REQUESTS', default=1000, cast=int)
+max_requests_jitter = decouple.config('GUNICORN_MAX_REQUESTS_JITTER', default=100, cast=int)
+
+if SERVER_MODE == 'asgi':
+    wsgi_app = 'siruinsk.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+else:
+    wsgi_app = 'siruinsk.wsgi:application'
+    worker_class = 'sync'
+
+# Direktori metrik bersama (siruinsk/utils/metrics.py): dikosongkan sekali saat
+# master start, dan diteruskan ke worker agar semua menulis ke tempat yang sama
+METRICS_DIR = decouple.config('METRICS_DIR', default=os.path.join(tempfile.gettempdir(), 'siruinsk_metrics'))
+os.environ['METRICS_DIR'] = METRICS_DIR
+
+
+def on_starting(server):
+    metrics.clear_directory(METRICS_DIR)
+
+
+def child_exit(server, worker):
+    # Counter worker yang keluar dilipat ke satu file agregat (max_requests
+    # mendaur ulang worker terus-menerus; file per pid tidak boleh menumpuk)
+    metrics.mark_process_dead(worker.pid, METRICS_DIR)
+
+
+def when_ready(server):
+    # Dengan preload_app aplikasi sudah dimuat di master: panaskan sekali di
+    # sini agar semua worker mewarisinya (siruinsk/utils/warmup.py)
+    if server.cfg.preload_app:
+        from siruinsk.utils import warmup
+        warmup.run()
+
+
+def post_fork(server, worker):
+    # Koneksi database yang mungkin terbuka di master tidak boleh dipakai
+    # bersama oleh beberapa proses
+    if server.cfg.preload_app:
+        from django.db import connections
+        connections.close_all()
+
+
+def post_worker_init(worker):
+    # Tanpa preload_app aplikasi baru dimuat di worker; dengan preload_app
+    # warmup sudah dilakukan di master dan panggilan ini langsung kembali
+    from siruinsk.utils import warmup
+    warmup.run()
@@ -0,0 +1,28 @@
+"""
+Versi async ``ProfileAPIView.get`` untuk mode ASGI (lihat ``profil/urls.py``).
+"""
+from django.db import DEFAULT_DB_ALIAS
+from django.shortcuts import get_object_or_404
+from rest_framework.permissions import IsAuthenticated
+
+from siruinsk.utils.async_views import AsyncAPIView, run_db
+from . import cache as profile_cache
+from .models import UserProfile
+from .serializers import ProfileSerializers
+from .views import profile_response
+
+
+class ProfileAsyncView(AsyncAPIView):
+    permission_classes = [IsAuthenticated]
+
+    async def get(self, request):
+        cached = await profile_cache.aget_profile(request.user.pk)
+        if cached is None:
+            profil = await run_db(
+                get_object_or_404,
+                UserProfile.objects.using(DEFAULT_DB_ALIAS).select_related('user'),
+                user=request.user,
+            )
+            serializer = ProfileSerializers(profil)
+            cached = await profile_cache.aset_profile(request.user.pk, serializer.data)
+        return profile_response(request, *cached)
@@ -0,0 +1,94 @@
+"""
+Cache representasi profil per user untuk ``GET /api/profile/me``.
+
+Entri dihapus oleh signal setiap kali ``UserProfile`` atau ``User`` milik user
+tersebut disimpan/dihapus (lihat ``profil/models.py``), dan disimpan bersama
+versi (hash data) yang menjadi dasar ETag per media type agar klien bisa
+revalidasi dengan ``If-None-Match``.
+
+Signal hanya menghapus entri di cache yang dilihat proses penulisnya. Dengan
+cache per proses (LocMem, default) worker lain akan terus melayani data dan
+ETag lama, jadi pada ``PROFILE_CACHE=auto`` cache hanya dipakai jika
+``CACHES['default']`` dibagi antar worker (mis. Redis/Memcached); selain itu
+profil selalu dibaca dari database dan ETag dihitung ulang.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from django.core.exceptions import ImproperlyConfigured
+
+from siruinsk.utils import metrics
+from siruinsk.utils.throttling import cache_is_process_local
+
+
+def _key(user_id):
+    return f'profile:me:{user_id}'
+
+
+def enabled():
+    mode = settings.PROFILE_CACHE
+    if mode == 'auto':
+        return not cache_is_process_local()
+    if mode not in ('on', 'off'):
+        raise ImproperlyConfigured(f"PROFILE_CACHE tidak dikenal: '{mode}'")
+    return mode == 'on'
+
+
+def _counted(entry):
+    result = 'miss' if entry is None else 'hit'
+    metrics.inc('siruinsk_cache_requests_total', (('cache', 'profile'), ('result', result)))
+    return entry
+
+
+def get_profile(user_id):
+    """ Kembalikan tuple ``(data, versi)`` dari cache, atau None """
+    if not enabled():
+        return None
+    return _counted(cache.get(_key(user_id)))
+
+
+async def aget_profile(user_id):
+    if not enabled():
+        return None
+    return _counted(await cache.aget(_key(user_id)))
+
+
+def _entry(data):
+    data = dict(data)
+    return data, hashlib.md5(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def etag(version, media_type):
+    """
+    ETag kuat untuk representasi ``media_type`` dari data ``version``: JSON
+    dan msgpack dari data yang sama berbeda byte, jadi ETag-nya juga berbeda
+    """
+    return '"%s"' % hashlib.md5(f'{version}:{media_type}'.encode()).hexdigest()
+
+
+def set_profile(user_id, data):
+    entry = _entry(data)
+    if enabled():
+        cache.set(_key(user_id), entry, settings.PROFILE_CACHE_TIMEOUT)
+    return entry
+
+
+async def aset_profile(user_id, data):
+    entry = _entry(data)
+    if enabled():
+        await cache.aset(_key(user_id), entry, settings.PROFILE_CACHE_TIMEOUT)
+    return entry
+
+
+def invalidate_profile(user_id):
+    if not enabled():
+        return
+    # Hapus sekarang dan sekali lagi setelah commit, supaya request lain yang
+    # membaca data lama selama transaksi berjalan tidak meninggalkan entri basi
+    key = _key(user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
@@ -0,0 +1,97 @@
+"""
+Pipeline gambar profil: validasi dan normalisasi upload di request, lalu
+pembuatan rendition (thumbnail) di worker lokal di luar jalur request.
+"""
+import hashlib
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+from rest_framework import serializers
+
+ALLOWED_FORMATS = {'JPEG': 'jpg', 'PNG': 'png', 'WEBP': 'webp'}
+RENDITION_FORMAT = 'WEBP' if features.check('webp') else 'JPEG'
+RENDITION_DIR = 'profiles/renditions'
+
+
+def _encode(image, image_format):
+    """ Encode ulang tanpa metadata (EXIF tidak ikut karena tidak diberikan ke save()) """
+    if image_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    buffer = BytesIO()
+    options = {'quality': 85, 'optimize': True} if image_format in ('JPEG', 'WEBP') else {'optimize': True}
+    image.save(buffer, format=image_format, **options)
+    return buffer.getvalue()
+
+
+def sanitize_upload(upload):
+    """
+    Validasi file upload sebagai gambar dan kembalikan ``ContentFile`` baru:
+    orientasi EXIF diterapkan lalu metadata dibuang, dimensi dibatasi
+    ``PROFILE_IMAGE_MAX_DIMENSION``, dan nama file berupa hash isi file.
+    """
+    if upload.size > settings.PROFILE_IMAGE_MAX_UPLOAD_SIZE:
+        limit_mb = settings.PROFILE_IMAGE_MAX_UPLOAD_SIZE // (1024 * 1024)
+        raise serializers.ValidationError(f"Ukuran gambar maksimal {limit_mb} MB.")
+
+    try:
+        image = Image.open(upload)
+        # Image.open hanya membaca header, cek jumlah piksel sebelum decode
+        width, height = image.size
+        if width * height > settings.PROFILE_IMAGE_MAX_PIXELS:
+            raise serializers.ValidationError("Resolusi gambar terlalu besar.")
+        if image.format not in ALLOWED_FORMATS:
+            raise serializers.ValidationError("Format gambar tidak didukung. Gunakan JPEG, PNG, atau WEBP.")
+        image_format = image.format
+        image.load()
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError):
+        raise serializers.ValidationError("File yang diunggah bukan gambar yang valid.")
+
+    image = ImageOps.exif_transpose(image)
+    max_dimension = settings.PROFILE_IMAGE_MAX_DIMENSION
+    image.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+
+    data = _encode(image, image_format)
+    digest = hashlib.sha256(data).hexdigest()
+    return ContentFile(data, name=f'{digest[:20]}.{ALLOWED_FORMATS[image_format]}')
+
+
+def rendition_name(image_name, size):
+    stem = image_name.rsplit('/', 1)[-1].rsplit('.', 1)[0]
+    return f'{RENDITION_DIR}/{stem}_{size}.{RENDITION_FORMAT.lower()}'
+
+
+def generate_renditions(user_id, image_name):
+    """
+    Buat rendition untuk setiap ukuran di ``PROFILE_IMAGE_RENDITION_SIZES``.
+    Dijalankan di worker lokal; hasil hanya disimpan jika gambar profil
+    belum diganti lagi selama pekerjaan berjalan.
+    """
+    from .cache import invalidate_profile
+    from .models import UserProfile
+
+    with default_storage.open(image_name) as source:
+        image = Image.open(source)
+        image.load()
+
+    renditions = {}
+    for size in settings.PROFILE_IMAGE_RENDITION_SIZES:
+        name = rendition_name(image_name, size)
+        # Nama berbasis hash isi: gambar yang sama tidak perlu dibuat ulang
+        if not default_storage.exists(name):
+            thumbnail = image.copy()
+            thumbnail.thumbnail((size, size), Image.Resampling.LANCZOS)
+            default_storage.save(name, ContentFile(_encode(thumbnail, RENDITION_FORMAT)))
+        renditions[str(size)] = name
+
+    updated = UserProfile.objects.filter(user_id=user_id, image=image_name).update(image_renditions=renditions)
+    if updated:
+        # update() tidak memicu signal post_save
+        invalidate_profile(user_id)
+
+
+def delete_renditions(renditions):
+    for name in renditions.values():
+        default_storage.delete(name)
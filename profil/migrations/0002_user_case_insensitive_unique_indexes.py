@@ -0,0 +1,63 @@
+from django.db import migrations
+from django.db.models import Count, Func
+from django.db.models.functions import Lower
+
+
+class LowerNonEmpty(Func):
+    template = "LOWER(NULLIF(%(expressions)s, ''))"
+
+
+def check_duplicates(apps, schema_editor):
+    """
+    Hentikan migrasi jika sudah ada user yang hanya berbeda huruf besar/kecil
+    pada username atau email: CREATE UNIQUE INDEX akan gagal dengan pesan yang
+    tidak menyebut barisnya. Data harus dibereskan manual (mis. lewat admin)
+    karena tidak ada aturan aman untuk memilih akun mana yang dipertahankan.
+    """
+    User = apps.get_model('auth', 'User')
+    users = User.objects.using(schema_editor.connection.alias)
+    problems = []
+    for field, expression in (('username', Lower('username')), ('email', LowerNonEmpty('email'))):
+        duplicates = (
+            users.annotate(value=expression).exclude(value=None)
+            .values('value').annotate(count=Count('pk')).filter(count__gt=1).values_list('value', flat=True)
+        )
+        for value in duplicates:
+            ids = list(users.annotate(value=expression).filter(value=value).order_by('pk').values_list('pk', flat=True))
+            problems.append(f'  {field} {value!r}: user id {ids}')
+    if problems:
+        raise RuntimeError(
+            'Tidak bisa membuat index unik case-insensitive di auth_user, ada data duplikat '
+            '(username/email yang hanya berbeda huruf besar/kecil):\n' + '\n'.join(problems)
+            + '\nUbah atau hapus salah satu akun pada setiap baris di atas, lalu jalankan migrate lagi.'
+        )
+
+
+
+class Migration(migrations.Migration):
+    """
+    Index unik case-insensitive untuk username dan email pada tabel auth_user.
+    Dipakai RegistrationSerializer untuk cek keunikan dalam satu query, dan
+    menjadi pengaman terakhir jika dua registrasi berjalan bersamaan.
+    Email kosong (user yang dibuat lewat admin/createsuperuser) dipetakan ke NULL
+    lewat NULLIF sehingga tidak saling bentrok. Email yang sebelumnya tidak unik
+    di database kini unik tanpa membedakan huruf (A@x.com dan a@x.com bentrok);
+    duplikat yang sudah ada dilaporkan oleh ``check_duplicates`` sebelum index dibuat.
+    """
+
+    dependencies = [
+        ('profil', '0001_initial'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicates, migrations.RunPython.noop),
+        migrations.RunSQL(
+            sql='CREATE UNIQUE INDEX auth_user_username_lower_uniq ON auth_user (LOWER(username))',
+            reverse_sql='DROP INDEX auth_user_username_lower_uniq',
+        ),
+        migrations.RunSQL(
+            sql="CREATE UNIQUE INDEX auth_user_email_lower_uniq ON auth_user (LOWER(NULLIF(email, '')))",
+            reverse_sql='DROP INDEX auth_user_email_lower_uniq',
+        ),
+    ]
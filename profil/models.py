@@ -1,17 +1,23 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
+from siruinsk.utils.models import TrackedFieldsMixin
+from .cache import invalidate_profile
+from .images import delete_renditions
+
 # Create your models here.
 
-class UserProfile(models.Model):
+class UserProfile(TrackedFieldsMixin, models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='user_profile')
     prodi = models.CharField(max_length=255, null=True, blank=True)
     fakultas = models.CharField(max_length=255, null=True, blank=True)
     jenis_kelamin = models.BooleanField(default=True)
     kontak = models.CharField(max_length=15, blank=True, null=True)
     image = models.FileField(upload_to='profiles/', null=True, blank=True)
+    # {"<ukuran px>": "<nama file di storage>"}, diisi worker setelah upload
+    image_renditions = models.JSONField(default=dict, blank=True)
 
     def __str__(self):
         return f"{self.user.username}"
@@ -21,19 +27,40 @@ def create_user_profile(sender, instance, created, **kwargs):
     Membuat objek UserProfile setiap kali User baru disimpan
     """
     if created:
-        UserProfile.objects.get_or_create(user=instance)
+        UserProfile.objects.create(user=instance)
 
 @receiver(pre_save, sender=UserProfile)
 def delete_old_profile_image_on_update(sender, instance, **kwargs):
     """
-    Hapus gambar setiap user update foto profile baru
+    Hapus gambar (dan rendition-nya) setiap user update foto profile baru.
+    Nilai lama diambil dari snapshot saat load, file baru dihapus setelah commit.
     """
-    if not instance.pk:
+    if instance._state.adding or not hasattr(instance, '_original_values'):
         return
-    try:
-        old_instance = UserProfile.objects.get(pk=instance.pk)
-    except UserProfile.DoesNotExist:
+    if not instance.has_changed('image'):
         return
-    old_image = old_instance.image
-    if old_image and old_image != instance.image and old_image.storage.exists(old_image.name):
-        old_image.delete(save=False)
\ No newline at end of file
+    old_name = instance.get_original_value('image')
+    old_renditions = instance.get_original_value('image_renditions') or {}
+    storage = instance.image.storage
+
+    def cleanup():
+        if old_name:
+            storage.delete(old_name)
+        delete_renditions(old_renditions)
+
+    transaction.on_commit(cleanup)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_cached_profile(sender, instance, **kwargs):
+    """ Hapus cache GET /api/profile/me setiap profil berubah """
+    invalidate_profile(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_profile_for_user(sender, instance, created=False, **kwargs):
+    """ Username, email, dan nama di profil berasal dari User """
+    if not created:
+        invalidate_profile(instance.pk)
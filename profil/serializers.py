@@ -1,28 +1,61 @@
+from django.db import transaction
 from rest_framework import serializers
+
+from siruinsk.utils import tasks
+from siruinsk.utils.instrumentation import TimedSerializerMixin
+from .images import generate_renditions, sanitize_upload
 from .models import UserProfile
 
 
-class ProfileSerializers(serializers.ModelSerializer):
+class ProfileSerializers(TimedSerializerMixin, serializers.ModelSerializer):
     username = serializers.CharField(source='user.username', read_only=True)
     email = serializers.CharField(source='user.email', read_only=True)
     first_name = serializers.CharField(source='user.first_name', required=False)
     last_name = serializers.CharField(source='user.last_name', required=False)
+    image_renditions = serializers.SerializerMethodField()
 
     class Meta:
         model = UserProfile
         fields = [
-            'username', 'email', 'first_name', 'last_name','jenis_kelamin', 'prodi', 'fakultas','kontak', 'image'
+            'username', 'email', 'first_name', 'last_name','jenis_kelamin', 'prodi', 'fakultas','kontak', 'image',
+            'image_renditions'
         ]
-    
+
+    def get_image_renditions(self, obj):
+        # URL thumbnail per ukuran, kosong selama worker belum selesai membuatnya
+        request = self.context.get('request')
+        renditions = {}
+        for size, name in obj.image_renditions.items():
+            url = obj.image.storage.url(name)
+            renditions[size] = request.build_absolute_uri(url) if request else url
+        return renditions
+
+    def validate_image(self, value):
+        if value is None:
+            return value
+        return sanitize_upload(value)
+
     def update(self, instance, validated_data):
         # ambil data untuk model User jika ada
         user_data = validated_data.pop('user', {})
         user = instance.user
 
-        # update field first_name dan last_name pada objek user
-        user.first_name = user_data.get('first_name', user.first_name)
-        user.last_name = user_data.get('last_name', user.last_name)
-        user.save()
+        # update field first_name dan last_name pada objek user, hanya kolom yang berubah
+        changed = [
+            field for field in ('first_name', 'last_name')
+            if field in user_data and user_data[field] != getattr(user, field)
+        ]
+        for field in changed:
+            setattr(user, field, user_data[field])
+        if changed:
+            user.save(update_fields=changed)
+
+        image_changed = 'image' in validated_data
+        if image_changed:
+            instance.image_renditions = {}
         instance = super().update(instance, validated_data)
-        
+
+        if image_changed and instance.image:
+            user_id, image_name = instance.user_id, instance.image.name
+            transaction.on_commit(lambda: tasks.submit(generate_renditions, user_id, image_name))
         return instance
@@ -1,3 +1,211 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from io import BytesIO
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from siruinsk.utils import query_budget
+from siruinsk.utils.query_budget import EndpointBudget
+from . import urls as profil_urls
+from .models import UserProfile
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def make_image(size=(3000, 2000), image_format='JPEG', exif=None):
+    buffer = BytesIO()
+    image = Image.new('RGB', size, color=(200, 30, 30))
+    options = {'exif': exif} if exif else {}
+    image.save(buffer, format=image_format, **options)
+    return SimpleUploadedFile(f'photo.{image_format.lower()}', buffer.getvalue())
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, BACKGROUND_TASKS_EAGER=True)
+class ProfileImageTest(APITestCase):
+    """Test pipeline upload gambar profil"""
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='user', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+        self.url = '/api/profile/me'
+
+    def upload(self, image):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.patch(self.url, {'image': image}, format='multipart')
+
+    def test_upload_is_downscaled_and_stripped(self):
+        """Gambar besar diperkecil dan metadata EXIF dibuang"""
+        exif = Image.Exif()
+        exif[0x010F] = 'PhoneMaker'
+        response = self.upload(make_image(exif=exif))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        profile = UserProfile.objects.get(user=self.user)
+        with default_storage.open(profile.image.name) as stored:
+            image = Image.open(stored)
+            self.assertLessEqual(max(image.size), 2048)
+            self.assertEqual(len(image.getexif()), 0)
+
+    def test_renditions_generated(self):
+        """Rendition dibuat untuk setiap ukuran dan URL-nya tersedia di response"""
+        self.upload(make_image())
+        profile = UserProfile.objects.get(user=self.user)
+        self.assertEqual(set(profile.image_renditions), {'64', '256', '1024'})
+        with default_storage.open(profile.image_renditions['64']) as stored:
+            self.assertEqual(max(Image.open(stored).size), 64)
+
+        response = self.client.get(self.url)
+        self.assertEqual(set(response.data['image_renditions']), {'64', '256', '1024'})
+
+    def test_replacing_image_removes_old_files(self):
+        """Gambar dan rendition lama dihapus saat gambar diganti"""
+        self.upload(make_image())
+        old = UserProfile.objects.get(user=self.user)
+        self.upload(make_image(size=(500, 500), image_format='PNG'))
+
+        self.assertFalse(default_storage.exists(old.image.name))
+        for name in old.image_renditions.values():
+            self.assertFalse(default_storage.exists(name))
+
+    def test_rejects_non_image(self):
+        """File yang bukan gambar ditolak"""
+        upload = SimpleUploadedFile('photo.jpg', b'not an image')
+        response = self.upload(upload)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('image', response.data)
+
+    @override_settings(PROFILE_IMAGE_MAX_PIXELS=1000)
+    def test_rejects_too_many_pixels(self):
+        """Gambar dengan piksel melebihi batas ditolak sebelum di-decode"""
+        response = self.upload(make_image(size=(100, 100)))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ProfileUpdateTest(APITestCase):
+    """Test update profil hanya menulis kolom yang berubah"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='user', password='testpass123', first_name='Budi', last_name='Santoso'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = '/api/profile/me'
+
+    def test_only_dirty_columns_are_written(self):
+        """PATCH kontak tidak menyentuh tabel auth_user maupun kolom lain"""
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.patch(self.url, {'kontak': '08123', 'first_name': 'Budi'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        writes = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(writes), 1)
+        self.assertIn('"kontak"', writes[0])
+        self.assertNotIn('"prodi"', writes[0])
+        self.assertEqual(UserProfile.objects.get(user=self.user).kontak, '08123')
+
+    def test_changed_user_name_is_saved(self):
+        """Perubahan nama depan hanya menulis kolom first_name"""
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.patch(self.url, {'first_name': 'Andi'})
+        writes = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE "auth_user"')]
+        self.assertEqual(len(writes), 1)
+        self.assertNotIn('"password"', writes[0])
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, 'Andi')
+
+    def test_save_without_changes_runs_no_query(self):
+        """save() tanpa perubahan tidak menjalankan query"""
+        profile = UserProfile.objects.get(user=self.user)
+        with self.assertNumQueries(0):
+            profile.save()
+        self.assertEqual(profile.get_dirty_fields(), [])
+        profile.prodi = 'Informatika'
+        self.assertEqual(profile.get_dirty_fields(), ['prodi'])
+
+
+@override_settings(PROFILE_CACHE='on')
+class ProfileCacheTest(APITestCase):
+    """Test cache GET /api/profile/me"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='user', email='user@example.com', password='testpass123', first_name='Budi'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = '/api/profile/me'
+
+    def test_cache_hit_runs_no_query(self):
+        """Miss memakai satu query (select_related user), hit tanpa query"""
+        with self.assertNumQueries(1):
+            first = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(second.data['username'], 'user')
+
+    def test_etag_revalidation(self):
+        """If-None-Match dengan ETag yang sama menghasilkan 304"""
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_invalidated_on_profile_and_user_save(self):
+        """Perubahan UserProfile atau User langsung terlihat"""
+        etag = self.client.get(self.url)['ETag']
+
+        profile = UserProfile.objects.get(user=self.user)
+        profile.prodi = 'Informatika'
+        profile.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['prodi'], 'Informatika')
+
+        self.user.first_name = 'Andi'
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).data['first_name'], 'Andi')
+
+    @override_settings(PROFILE_CACHE='auto')
+    def test_process_local_cache_bypassed(self):
+        """Dengan cache per proses (LocMem) profil selalu dibaca dari database, ETag tetap berlaku"""
+        with self.assertNumQueries(1):
+            etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_requires_authentication(self):
+        """Profil tidak bisa dibaca tanpa login"""
+        self.client.force_authenticate(user=None)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class ProfilQueryBudgetTest(query_budget.QueryBudgetTestCase):
+    """Jumlah query endpoint profil"""
+    urls = profil_urls
+    namespace = 'profil'
+    budgets = [
+        EndpointBudget('profile-me', 'GET', 2),
+        EndpointBudget('profile-me', 'PATCH', 4, data={'first_name': 'Budi', 'prodi': 'Informatika'}),
+    ]
+
+    def make_rows(self, count):
+        users = User.objects.bulk_create(User(username=f'profil{i}') for i in range(count))
+        UserProfile.objects.bulk_create(UserProfile(user=user) for user in users)
+        return users
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path
 from .views import *
 
@@ -5,4 +6,18 @@ app_name = "profil"
 
 urlpatterns = [
     path('me', ProfileAPIView.as_view(), name='profile-me'),
-]
\ No newline at end of file
+]
+
+
+def get_async_urlpatterns():
+    from siruinsk.utils.async_views import split_by_method
+    from .async_views import ProfileAsyncView
+
+    return [
+        path('me', split_by_method(ProfileAsyncView.as_view(), ProfileAPIView.as_view()), name='profile-me'),
+    ]
+
+
+# Mode ASGI: GET dilayani view async, PATCH tetap lewat view sync
+if settings.SERVER_MODE == 'asgi':
+    urlpatterns = get_async_urlpatterns()
@@ -1,21 +1,43 @@
+from django.db import DEFAULT_DB_ALIAS
 from django.shortcuts import render, get_object_or_404
+from django.utils.http import parse_etags
 from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.status import *
 
+from . import cache as profile_cache
 from .serializers import *
 
+def profile_response(request, data, version):
+    etag = profile_cache.etag(version, request.accepted_media_type)
+    headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        return Response(status=HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(data, status=HTTP_200_OK, headers=headers)
+
+
 class ProfileAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
     def get(self, request):
-        profil = get_object_or_404(UserProfile, user = request.user)
-        serializer = ProfileSerializers(profil)
-        return Response(serializer.data, status=HTTP_200_OK)
+        # Hot path: dipanggil setiap page load, dilayani dari cache per user
+        cached = profile_cache.get_profile(request.user.pk)
+        if cached is None:
+            # Isi cache dari primary: data replica yang tertinggal akan ikut
+            # tersimpan selama PROFILE_CACHE_TIMEOUT
+            profil = get_object_or_404(
+                UserProfile.objects.using(DEFAULT_DB_ALIAS).select_related('user'), user=request.user
+            )
+            serializer = ProfileSerializers(profil)
+            cached = profile_cache.set_profile(request.user.pk, serializer.data)
+        return profile_response(request, *cached)
     
     def patch(self, request):
-        profil = get_object_or_404(UserProfile, user = request.user)
+        profil = get_object_or_404(UserProfile.objects.select_related('user'), user = request.user)
         serializer = ProfileSerializers(profil, data= request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
             return Response(serializer.data, status=status.HTTP_200_OK)
-        return Response(status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
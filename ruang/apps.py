@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class RuangConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'ruang'
+
+    def ready(self):
+        # Signal pencatat ChangeLog untuk /api/sync
+        from . import sync  # noqa: F401
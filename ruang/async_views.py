@@ -0,0 +1,50 @@
+"""
+Versi async jalur baca yang paling sering diakses, dipakai pada mode ASGI
+(lihat ``ruang/urls.py``). Konfigurasi queryset, serializer, filter, dan
+permission diambil dari viewset sync agar perilakunya tetap sama.
+"""
+from rest_framework.response import Response
+
+from siruinsk.utils.async_views import AsyncAPIView, run_db
+from siruinsk.utils.sparse_fields import SparseFieldsMixin
+from .views import (
+    LocationViewSet, RoomViewSet, availability_response, conflicting_reservations,
+    parse_availability_period,
+)
+
+
+class LocationListAsyncView(SparseFieldsMixin, AsyncAPIView):
+    queryset = LocationViewSet.queryset
+    serializer_class = LocationViewSet.serializer_class
+    permission_classes = LocationViewSet.permission_classes
+    filter_backends = LocationViewSet.filter_backends
+    search_fields = LocationViewSet.search_fields
+
+    async def get(self, request, *args, **kwargs):
+        return await self.alist(request, *args, **kwargs)
+
+
+class RoomListAsyncView(SparseFieldsMixin, AsyncAPIView):
+    queryset = RoomViewSet.queryset
+    sparse_annotations = RoomViewSet.sparse_annotations
+    serializer_class = RoomViewSet.serializer_class
+    permission_classes = RoomViewSet.permission_classes
+    filter_backends = RoomViewSet.filter_backends
+    filterset_class = RoomViewSet.filterset_class
+    search_fields = RoomViewSet.search_fields
+
+    async def get(self, request, *args, **kwargs):
+        return await self.alist(request, *args, **kwargs)
+
+
+class RoomAvailabilityAsyncView(RoomListAsyncView):
+    """ Sama dengan ``RoomViewSet.availability`` """
+
+    async def get(self, request, pk=None):
+        room = await self.aget_object()
+        period = parse_availability_period(request)
+        if isinstance(period, Response):
+            return period
+
+        conflicting = await run_db(conflicting_reservations(room, *period).exists)
+        return availability_response(request, room, conflicting)
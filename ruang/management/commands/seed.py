@@ -0,0 +1,298 @@
+"""
+Isi database dengan data besar yang realistis untuk uji performa.
+
+Contoh:
+    python manage.py seed --reservations 10000000 --users 50000 --rooms 2000
+
+Data deterministik dari ``--seed``: argumen yang sama menghasilkan data yang
+sama. Reservasi mengikuti pola jadwal mingguan (hari kerja, slot kuliah),
+reservasi APPROVED tidak pernah bentrok di ruangan yang sama, dan feedback
+hanya diberikan untuk reservasi APPROVED yang sudah lewat.
+"""
+import random
+import time
+from datetime import date, datetime, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils import timezone
+
+from profil.models import UserProfile
+from ruang.models import ChangeLog, Feedback, Location, Reservation, Room
+from ruang.sync import rebuild_log
+
+USERNAME_PREFIX = 'seed_'
+
+FIRST_NAMES = [
+    'Ahmad', 'Siti', 'Muhammad', 'Nur', 'Dewi', 'Rizky', 'Putri', 'Fajar', 'Aisyah', 'Budi',
+    'Indah', 'Hendra', 'Rina', 'Agus', 'Fitri', 'Yusuf', 'Lestari', 'Ilham', 'Zahra', 'Dimas',
+]
+LAST_NAMES = [
+    'Pratama', 'Saputra', 'Hidayat', 'Nurhaliza', 'Wijaya', 'Rahman', 'Kurniawan', 'Lubis',
+    'Siregar', 'Harahap', 'Nasution', 'Hasibuan', 'Ramadhan', 'Syahputra', 'Maharani',
+]
+BUILDINGS = [
+    'Gedung Rektorat', 'Fakultas Sains dan Teknologi', 'Fakultas Syariah', 'Fakultas Tarbiyah',
+    'Fakultas Ushuluddin', 'Fakultas Ekonomi dan Bisnis Islam', 'Fakultas Dakwah',
+    'Fakultas Psikologi', 'Gedung Perpustakaan', 'Pusat Bahasa', 'Auditorium', 'Gedung Serbaguna',
+]
+PURPOSES = [
+    'Perkuliahan', 'Praktikum', 'Rapat Himpunan', 'Seminar', 'Ujian Tengah Semester',
+    'Sidang Skripsi', 'Kegiatan UKM', 'Workshop', 'Kuliah Umum', 'Pelatihan',
+]
+FEEDBACK_TEXTS = {
+    5: ['Ruangan sangat nyaman dan bersih.', 'Fasilitas lengkap, proyektor berfungsi baik.'],
+    4: ['Ruangan nyaman, AC agak kurang dingin.', 'Baik, hanya kursi sedikit kurang.'],
+    3: ['Cukup, tapi sound system bermasalah.', 'Standar, perlu dibersihkan sebelum dipakai.'],
+    2: ['Proyektor tidak menyala.', 'Ruangan panas dan kotor.'],
+    1: ['Ruangan sudah dipakai pihak lain saat kami datang.', 'Fasilitas tidak berfungsi sama sekali.'],
+}
+
+# Slot kuliah 2 SKS (100 menit), slot malam lebih jarang dipakai
+SLOT_STARTS = [(7, 0), (8, 40), (10, 20), (13, 0), (14, 40), (16, 20), (18, 30)]
+SLOT_WEIGHTS = [14, 20, 20, 16, 14, 10, 6]
+SLOT_MINUTES = 100
+# Senin - Minggu
+DAY_WEIGHTS = [20, 20, 20, 19, 14, 5, 2]
+CAPACITIES = [20, 30, 40, 50, 60, 100, 200, 500]
+CAPACITY_WEIGHTS = [10, 25, 30, 15, 10, 6, 3, 1]
+RATINGS = [5, 4, 3, 2, 1]
+RATING_WEIGHTS = [40, 33, 15, 7, 5]
+
+
+class Command(BaseCommand):
+    help = 'Isi database dengan data lokasi, ruangan, user, reservasi, dan feedback dalam jumlah besar'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--locations', type=int, default=12)
+        parser.add_argument('--rooms', type=int, default=300)
+        parser.add_argument('--users', type=int, default=5000)
+        parser.add_argument('--reservations', type=int, default=100_000)
+        parser.add_argument('--feedback-ratio', type=float, default=0.3,
+                            help='Porsi reservasi APPROVED yang sudah lewat yang diberi feedback')
+        parser.add_argument('--staff-ratio', type=float, default=0.01)
+        parser.add_argument('--weeks', type=int, default=52, help='Rentang jadwal reservasi dalam minggu')
+        parser.add_argument('--start', type=date.fromisoformat, default=date(2025, 8, 4),
+                            help='Tanggal awal jadwal (YYYY-MM-DD)')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=20_000)
+        parser.add_argument('--password', default='password123', help='Password semua user hasil seed')
+        parser.add_argument('--clear', action='store_true',
+                            help='Hapus data ruang dan user hasil seed sebelumnya terlebih dahulu')
+
+    def handle(self, *args, **options):
+        if options['rooms'] < 1 or options['locations'] < 1 or options['users'] < 1:
+            raise CommandError('--locations, --rooms, dan --users minimal 1.')
+
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        started = time.perf_counter()
+
+        if options['clear']:
+            self.clear()
+
+        locations = self.seed_locations(options['locations'])
+        rooms = self.seed_rooms(locations, options['rooms'])
+        users = self.seed_users(options['users'], options['staff_ratio'], options['password'])
+        reservations, feedback = self.seed_reservations(rooms, users, options)
+        # Data ditulis tanpa signal, log /api/sync disusun dari isi tabel
+        rebuild_log()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Selesai dalam {time.perf_counter() - started:.1f} detik: {len(locations)} lokasi, '
+            f'{len(rooms)} ruangan, {len(users)} user, {reservations} reservasi, {feedback} feedback.'
+        ))
+
+    def clear(self):
+        # TRUNCATE / DELETE langsung: delete() ORM memuat setiap baris ke memori
+        tables = [model._meta.db_table for model in (Feedback, Reservation, Room, Location)]
+        # Sequence ChangeLog tidak di-reset: id log baru harus tetap di atas
+        # token ``since`` yang dipegang klien, agar mereka menerima isi baru
+        statements = connection.ops.sql_flush(no_style(), tables, reset_sequences=True)
+        statements += connection.ops.sql_flush(no_style(), [ChangeLog._meta.db_table])
+        with transaction.atomic():
+            for sql in statements:
+                with connection.cursor() as cursor:
+                    cursor.execute(sql)
+            User.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+        self.stdout.write('Data lama dihapus.')
+
+    def seed_locations(self, count):
+        locations = []
+        for i in range(count):
+            building = BUILDINGS[i % len(BUILDINGS)]
+            suffix = f' {i // len(BUILDINGS) + 1}' if i >= len(BUILDINGS) else ''
+            locations.append(Location(name=f'{building}{suffix}', address=f'Jl. H.R. Soebrantas No. {155 + i}'))
+        return Location.objects.bulk_create(locations, batch_size=self.batch_size)
+
+    def seed_rooms(self, locations, count):
+        rooms = []
+        for i in range(count):
+            location = locations[i % len(locations)]
+            capacity = self.rng.choices(CAPACITIES, CAPACITY_WEIGHTS)[0]
+            rooms.append(Room(name=f'R.{i // len(locations) + 101}', location=location, capacity=capacity))
+        return Room.objects.bulk_create(rooms, batch_size=self.batch_size)
+
+    def seed_users(self, count, staff_ratio, password):
+        # Hash password sekali: PBKDF2 per user akan memakan waktu berjam-jam
+        password_hash = make_password(password, salt=f'{USERNAME_PREFIX}salt')
+        joined = timezone.make_aware(datetime(2024, 1, 1))
+        users = []
+        for i in range(count):
+            first, last = self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+            username = f'{USERNAME_PREFIX}{first.lower()}{i:07d}'
+            users.append(User(
+                username=username,
+                email=f'{username}@students.uin-suska.ac.id',
+                first_name=first,
+                last_name=last,
+                password=password_hash,
+                is_staff=self.rng.random() < staff_ratio,
+                date_joined=joined,
+            ))
+
+        created = []
+        for offset in range(0, len(users), self.batch_size):
+            with transaction.atomic():
+                batch = User.objects.bulk_create(users[offset:offset + self.batch_size])
+                # bulk_create tidak memicu signal post_save yang membuat profil
+                UserProfile.objects.bulk_create(
+                    UserProfile(user=user, jenis_kelamin=self.rng.random() < 0.5) for user in batch
+                )
+            created.extend(batch)
+        return created
+
+    def seed_reservations(self, rooms, users, options):
+        """
+        Reservasi dan feedback ditulis dengan INSERT multi-baris dari tuple yang
+        nilainya sudah diadaptasi, bukan ``bulk_create``: untuk jutaan baris
+        hampir seluruh waktu ``bulk_create`` habis di persiapan nilai per field.
+        ID diberikan langsung agar feedback bisa menunjuk reservasinya.
+        """
+        rng = self.rng
+        days = options['weeks'] * 7
+        slots = len(SLOT_STARTS)
+        tz = timezone.get_current_timezone()
+        adapt = connection.ops.adapt_datetimefield_value
+        reference_day = days // 2
+
+        # Waktu mulai/selesai/dibuat setiap (hari, slot[, panjang]) diadaptasi sekali
+        starts, ends, created = [], [], []
+        for day in range(days):
+            for hour, minute in SLOT_STARTS:
+                start = timezone.make_aware(
+                    datetime.combine(options['start'] + timedelta(days=day), datetime.min.time())
+                    .replace(hour=hour, minute=minute), tz
+                )
+                starts.append(adapt(start))
+                ends.append([adapt(start + timedelta(minutes=SLOT_MINUTES * length)) for length in range(4)])
+                created.append(adapt(start - timedelta(days=7)))
+
+        # Hari dikelompokkan per hari dalam minggu agar pola mingguan bisa dipilih berbobot
+        weekday_of = [(options['start'].weekday() + day) % 7 for day in range(days)]
+        days_by_weekday = [[day for day in range(days) if weekday_of[day] == weekday] for weekday in range(7)]
+        day_weights = [DAY_WEIGHTS[weekday] if days_by_weekday[weekday] else 0 for weekday in range(7)]
+
+        # Bitmap slot yang sudah dipakai reservasi APPROVED per (ruangan, hari, slot)
+        occupied = bytearray(len(rooms) * days * slots)
+        room_ids = [room.pk for room in rooms]
+        room_capacities = [room.capacity for room in rooms]
+        user_ids = [user.pk for user in users]
+        room_count, user_count = len(rooms), len(users)
+
+        reservation_id = (Reservation.objects.order_by('-pk').values_list('pk', flat=True).first() or 0) + 1
+        feedback_id = (Feedback.objects.order_by('-pk').values_list('pk', flat=True).first() or 0) + 1
+        reservation_columns = [
+            'id', 'requester_id', 'room_id', 'start', 'end', 'purpose', 'requested_capacity',
+            'status', 'created_at', 'updated_at',
+        ]
+        feedback_columns = ['id', 'user_id', 'reservation_id', 'rating', 'text', 'created_at']
+
+        total = options['reservations']
+        feedback_ratio = options['feedback_ratio']
+        created_reservations = created_feedback = 0
+        batch_started = time.perf_counter()
+
+        while created_reservations < total:
+            size = min(self.batch_size, total - created_reservations)
+            reservations, feedback = [], []
+            for _ in range(size):
+                # Popularitas ruangan dan aktivitas user miring: sebagian kecil sangat sering dipakai
+                room_index = int(room_count * rng.random() ** 2)
+                user_id = user_ids[int(user_count * rng.random() ** 3)]
+                weekday = rng.choices(range(7), day_weights)[0]
+                day = rng.choice(days_by_weekday[weekday])
+                slot = rng.choices(range(slots), SLOT_WEIGHTS)[0]
+                length = min(rng.choice((1, 1, 1, 2, 2, 3)), slots - slot)
+
+                cell = (room_index * days + day) * slots + slot
+                past = day < reference_day
+                roll = rng.random()
+                if past:
+                    status = 'APPROVED' if roll < 0.8 else 'DECLINED'
+                else:
+                    status = 'APPROVED' if roll < 0.5 else 'PENDING' if roll < 0.9 else 'DECLINED'
+                if status == 'APPROVED':
+                    if any(occupied[cell:cell + length]):
+                        status = 'DECLINED' if past else 'PENDING'
+                    else:
+                        occupied[cell:cell + length] = b'\x01' * length
+
+                index = day * slots + slot
+                capacity = max(1, int(room_capacities[room_index] * rng.uniform(0.3, 1.0)))
+                reservations.append((
+                    reservation_id, user_id, room_ids[room_index], starts[index], ends[index][length],
+                    rng.choice(PURPOSES), capacity, status, created[index], created[index],
+                ))
+                if status == 'APPROVED' and past and rng.random() < feedback_ratio:
+                    rating = rng.choices(RATINGS, RATING_WEIGHTS)[0]
+                    feedback.append((
+                        feedback_id, user_id, reservation_id, rating,
+                        rng.choice(FEEDBACK_TEXTS[rating]), ends[index][length],
+                    ))
+                    feedback_id += 1
+                reservation_id += 1
+
+            with transaction.atomic():
+                insert_rows(Reservation, reservation_columns, reservations)
+                insert_rows(Feedback, feedback_columns, feedback)
+
+            created_reservations += size
+            created_feedback += len(feedback)
+            elapsed = time.perf_counter() - batch_started
+            self.stdout.write(
+                f'  {created_reservations}/{total} reservasi '
+                f'({created_reservations / elapsed:,.0f}/detik)'
+            )
+
+        # ID diberikan manual, sequence PostgreSQL perlu disesuaikan
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [Reservation, Feedback]):
+                cursor.execute(sql)
+        return created_reservations, created_feedback
+
+
+def insert_rows(model, columns, rows):
+    """ INSERT banyak baris sekaligus; ``rows`` berisi tuple nilai yang sudah siap untuk database """
+    if not rows:
+        return
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    column_sql = ', '.join(quote(column) for column in columns)
+    row_sql = '(' + ', '.join(['%s'] * len(columns)) + ')'
+
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            # executemany sqlite3 berjalan di C dan tidak dibatasi jumlah parameter
+            cursor.executemany(f'INSERT INTO {table} ({column_sql}) VALUES {row_sql}', rows)
+            return
+        # PostgreSQL/MySQL: satu statement per maksimal ~60rb parameter
+        chunk = max(1, 60_000 // len(columns))
+        for offset in range(0, len(rows), chunk):
+            part = rows[offset:offset + chunk]
+            values_sql = ', '.join([row_sql] * len(part))
+            params = [value for row in part for value in row]
+            cursor.execute(f'INSERT INTO {table} ({column_sql}) VALUES {values_sql}', params)
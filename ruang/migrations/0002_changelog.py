@@ -0,0 +1,46 @@
+# Generated by Django 5.2 on 2026-10-19 06:23
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill(apps, schema_editor):
+    """ Satu baris log untuk setiap objek yang sudah ada, agar sync since=0 lengkap """
+    connection = schema_editor.connection
+    quote = connection.ops.quote_name
+    table = quote(apps.get_model('ruang', 'ChangeLog')._meta.db_table)
+    sources = [('location', 'Location', 'NULL'), ('room', 'Room', 'NULL'),
+               ('reservation', 'Reservation', 'requester_id'), ('feedback', 'Feedback', 'NULL')]
+    with connection.cursor() as cursor:
+        for name, model, owner in sources:
+            cursor.execute(
+                f'INSERT INTO {table} (model, object_id, owner_id, deleted, created_at) '
+                f'SELECT %s, id, {owner}, %s, %s FROM {quote(apps.get_model("ruang", model)._meta.db_table)} ORDER BY id',
+                [name, False, timezone.now()],
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ruang', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('owner_id', models.IntegerField(blank=True, null=True)),
+                ('deleted', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['model', 'object_id'], name='ruang_changelog_object_idx')],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
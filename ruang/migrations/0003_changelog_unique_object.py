@@ -0,0 +1,38 @@
+# Generated by Django 5.2 on 2026-10-19 07:00
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def drop_duplicates(apps, schema_editor):
+    """
+    record() yang berjalan bersamaan bisa meninggalkan dua baris untuk objek
+    yang sama; yang terbaru (id terbesar) dipertahankan
+    """
+    ChangeLog = apps.get_model('ruang', 'ChangeLog')
+    log = ChangeLog.objects.using(schema_editor.connection.alias)
+    latest = log.values('model', 'object_id').annotate(latest=Max('id')).values_list('latest', flat=True)
+    log.exclude(id__in=latest).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ruang', '0002_changelog'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicates, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='changelog',
+            name='ruang_changelog_object_idx',
+        ),
+        migrations.AddIndex(
+            model_name='changelog',
+            index=models.Index(fields=['created_at'], name='ruang_changelog_created_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='changelog',
+            constraint=models.UniqueConstraint(fields=('model', 'object_id'), name='ruang_changelog_object_uniq'),
+        ),
+    ]
@@ -1,9 +1,13 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
-from django.db.models import Avg, Sum
+from django.db.models import Avg, OuterRef, Subquery, Sum
 
-class Location(models.Model):
+from siruinsk.utils.models import TrackedFieldsMixin
+
+
+class Location(TrackedFieldsMixin, models.Model):
     name = models.CharField(max_length=100)
     address = models.CharField(max_length=255)
 
@@ -11,16 +15,36 @@ class Location(models.Model):
         return self.name
 
 
-class Room(models.Model):
+class RoomQuerySet(models.QuerySet):
+    def with_average_rating(self):
+        """
+        Anotasi ``average_rating`` lewat subquery berkorelasi, sehingga rating
+        list ruangan dihitung dalam query yang sama (tanpa N+1) dan hanya untuk
+        baris yang benar-benar dikembalikan halaman.
+        """
+        average = Feedback.objects.filter(reservation__room=OuterRef('pk')).values(
+            'reservation__room'
+        ).annotate(average=Avg('rating')).values('average')
+        return self.annotate(average_rating=Subquery(average))
+
+
+class Room(TrackedFieldsMixin, models.Model):
     name = models.CharField(max_length=100)
     location = models.ForeignKey(Location, on_delete=models.CASCADE)
     capacity = models.PositiveIntegerField(default=0)
 
+    objects = RoomQuerySet.as_manager()
+
     def get_average_rating(self):
         """
         Menghitung rata-rata rating dari semua feedback terkait.
         Mengembalikan 0 jika belum ada feedback.
         """
+        # Pakai anotasi dari RoomQuerySet.with_average_rating() jika ada
+        if hasattr(self, 'average_rating'):
+            average = self.average_rating
+            return 0.0 if average is None else round(average, 2)
+
         # Menghitung rata-rata rating menggunakan agregasi database
         avg_dict = Feedback.objects.filter(reservation__room=self).aggregate(average=Avg('rating'))
         average = avg_dict.get('average')
@@ -65,3 +89,25 @@ class Feedback(models.Model):
 
     def __str__(self):
         return f"Feedback {self.rating} for {self.reservation}"
+
+
+class ChangeLog(models.Model):
+    """
+    Log perubahan untuk ``GET /api/sync`` (lihat ``ruang/sync.py``): satu baris
+    per objek yang berubah (dijaga constraint unik), ``id`` yang naik terus
+    menjadi token sinkronisasi.
+    """
+    model = models.CharField(max_length=20)
+    object_id = models.BigIntegerField()
+    # Pemilik reservasi, reservasi hanya dikirim ke pemiliknya dan staff
+    owner_id = models.IntegerField(null=True, blank=True)
+    deleted = models.BooleanField(default=False)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['model', 'object_id'], name='ruang_changelog_object_uniq')]
+        # Mencari baris yang belum settled (lihat sync.changes_since)
+        indexes = [models.Index(fields=['created_at'], name='ruang_changelog_created_idx')]
+
+    def __str__(self):
+        return f"{self.pk} {'delete' if self.deleted else 'save'} {self.model} {self.object_id}"
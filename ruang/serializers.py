@@ -1,15 +1,16 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from siruinsk.utils.instrumentation import TimedSerializerMixin
 from .models import Location, Room, Reservation, Feedback
 
 
-class LocationSerializer(serializers.ModelSerializer):
+class LocationSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Location
         fields = ['id', 'name', 'address']
 
 
-class RoomSerializer(serializers.ModelSerializer):
+class RoomSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     location_name = serializers.CharField(source='location.name', read_only=True)
     rating = serializers.SerializerMethodField()
 
@@ -21,13 +22,13 @@ class RoomSerializer(serializers.ModelSerializer):
         return obj.get_average_rating()
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'username', 'first_name', 'last_name', 'email']
 
 
-class ReservationSerializer(serializers.ModelSerializer):
+class ReservationSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     requester_name = serializers.CharField(source='requester.username', read_only=True)
     requester_email = serializers.CharField(source='requester.email', read_only=True)
     room_name = serializers.CharField(source='room.name', read_only=True)
@@ -48,14 +49,14 @@ class ReservationSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class ReservationApprovalSerializer(serializers.ModelSerializer):
+class ReservationApprovalSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer khusus untuk approval/decline reservasi"""
     class Meta:
         model = Reservation
         fields = ['status']
 
 
-class FeedbackSerializer(serializers.ModelSerializer):
+class FeedbackSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     user_name = serializers.CharField(source='user.username', read_only=True)
     reservation_room = serializers.CharField(source='reservation.room.name', read_only=True)
     
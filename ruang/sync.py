@@ -0,0 +1,264 @@
+"""
+Change feed untuk ``GET /api/sync?since=<token>``: klien cukup meminta
+perubahan sejak token terakhir, bukan mengambil ulang seluruh list.
+
+Setiap create/update/delete ``Location``, ``Room``, ``Reservation``, dan
+``Feedback`` dikumpulkan per transaksi (``ChangeBuffer``, diisi signal di
+bawah yang dipasang oleh ``RuangConfig.ready``) dan ditulis ke ``ChangeLog``
+sekali setelah commit: satu DELETE dan satu INSERT massal per model, berapa
+pun objek yang ikut terhapus cascade. Log dipadatkan: perubahan baru menghapus
+baris lama objek yang sama (constraint unik ``(model, object_id)``), sehingga
+``id > token`` (range scan primary key) hanya berisi objek yang berubah sejak
+token, masing-masing sekali. Objek yang dihapus meninggalkan tombstone
+(``deleted=True``). Biaya satu poll sebanding dengan jumlah perubahan, bukan
+ukuran tabel.
+
+Field turunan ikut dicatat jika field sumbernya berubah (``DEPENDENT_FIELDS``,
+dibandingkan lewat ``TrackedFieldsMixin``): nama lokasi mencatat ulang
+ruangan dan reservasinya (``location_name``), nama ruangan mencatat ulang
+reservasi dan feedback-nya (``room_name``, ``reservation_room``), lokasi
+ruangan mencatat ulang reservasinya, dan feedback mencatat ulang ruangannya
+(``rating``). Perubahan username/email user tidak diteruskan.
+
+Reservasi hanya dikirim ke pemiliknya dan staff, seperti ``ReservationViewSet``.
+Baris log yang lebih muda dari ``SYNC_SETTLE_SECONDS`` ditunda ke poll
+berikutnya: id diberikan saat INSERT, jadi baris dengan id lebih kecil yang
+belum commit tidak boleh terlewati oleh token. Sampai titik itu token maju
+melewati semua baris yang sudah diperiksa, termasuk yang tidak boleh dilihat
+user, sehingga poll berikutnya tidak memindai ulang baris yang sama.
+"""
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Min, Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import ChangeLog, Feedback, Location, Reservation, Room
+from .serializers import FeedbackSerializer, LocationSerializer, ReservationSerializer, RoomSerializer
+
+# Nama di ChangeLog.model -> (kunci respons, queryset, serializer)
+FEEDS = {
+    'location': ('locations', lambda: Location.objects.all(), LocationSerializer),
+    'room': ('rooms', lambda: Room.objects.select_related('location').with_average_rating(), RoomSerializer),
+    'reservation': (
+        'reservations', lambda: Reservation.objects.select_related('requester', 'room', 'room__location'),
+        ReservationSerializer,
+    ),
+    'feedback': (
+        'feedback', lambda: Feedback.objects.select_related('user', 'reservation', 'reservation__room'),
+        FeedbackSerializer,
+    ),
+}
+# Model yang dikirim ke semua user yang login
+PUBLIC_MODELS = ('location', 'room', 'feedback')
+# Field lokasi/ruangan yang ditampilkan serializer model lain
+DEPENDENT_FIELDS = {'location': ('name',), 'room': ('name', 'location')}
+# record() bersamaan untuk objek yang sama: yang kalah constraint unik diulang
+RECORD_ATTEMPTS = 3
+
+_local = threading.local()
+
+
+def record(model, changes, deleted=False):
+    """ Catat ``changes`` (list ``(object_id, owner_id)``) sebagai perubahan terbaru objeknya """
+    write({model: {object_id: (owner_id, deleted) for object_id, owner_id in changes}})
+
+
+def write(changes):
+    """
+    Tulis ``changes`` (``{model: {object_id: (owner_id, deleted)}}``): satu
+    DELETE dan satu INSERT massal per model, dalam satu transaksi
+    """
+    changes = {model: rows for model, rows in changes.items() if rows}
+    if not changes:
+        return
+    for attempt in range(RECORD_ATTEMPTS):
+        now = timezone.now()
+        try:
+            with transaction.atomic():
+                for model, rows in changes.items():
+                    ChangeLog.objects.filter(model=model, object_id__in=list(rows)).delete()
+                    ChangeLog.objects.bulk_create(
+                        ChangeLog(model=model, object_id=object_id, owner_id=owner_id, deleted=deleted, created_at=now)
+                        for object_id, (owner_id, deleted) in rows.items()
+                    )
+            return
+        except IntegrityError:
+            # Transaksi lain menyisipkan baris objek yang sama setelah DELETE
+            # di atas; ulangi agar baris itu ikut diganti
+            if attempt == RECORD_ATTEMPTS - 1:
+                raise
+
+
+def changed_dependent_fields(model, instance):
+    """ Field di ``DEPENDENT_FIELDS`` yang berubah pada save ini """
+    fields = DEPENDENT_FIELDS[model]
+    if not hasattr(instance, '_original_values'):
+        # Instance tidak dimuat dari database: perubahan tidak diketahui
+        return fields
+    return tuple(field for field in fields if instance.has_changed(field))
+
+
+class ChangeBuffer:
+    """
+    Perubahan satu transaksi (atau savepoint), ditulis sekali setelah commit
+    oleh ``flush``. Menghapus ruangan dengan N reservasi memicu N+1 signal,
+    tetapi hanya satu DELETE dan satu INSERT per model.
+    """
+    def __init__(self):
+        # {model: {object_id: (owner_id, deleted)}}
+        self.changes = {}
+        # Baris turunan yang dicari setelah commit: {model: {object_id: fields}}
+        self.dependents = {'location': {}, 'room': {}}
+        # Reservasi yang rating ruangannya berubah karena feedback
+        self.rated_reservations = set()
+        self.flushed = False
+
+    def add(self, model, object_id, owner_id=None, deleted=False):
+        rows = self.changes.setdefault(model, {})
+        # Tombstone tidak tertimpa perubahan turunan yang datang belakangan
+        deleted = deleted or rows.get(object_id, (None, False))[1]
+        rows[object_id] = (owner_id, deleted)
+
+    def add_many(self, model, changes):
+        for object_id, owner_id in changes:
+            if object_id not in self.changes.get(model, {}):
+                self.add(model, object_id, owner_id)
+
+    def flush(self):
+        self.flushed = True
+        if self.rated_reservations:
+            rooms = Reservation.objects.filter(pk__in=self.rated_reservations).values_list('room', flat=True)
+            self.add_many('room', [(room, None) for room in set(rooms)])
+        locations = self.dependents['location']
+        if locations:
+            rooms = Room.objects.filter(location__in=locations).values_list('pk', flat=True)
+            self.add_many('room', [(pk, None) for pk in rooms])
+        rooms = self.dependents['room']
+        renamed = [pk for pk, fields in rooms.items() if 'name' in fields]
+        if renamed:
+            feedback = Feedback.objects.filter(reservation__room__in=renamed).values_list('pk', flat=True)
+            self.add_many('feedback', [(pk, None) for pk in feedback])
+        if locations or rooms:
+            reservations = Reservation.objects.filter(Q(room__location__in=locations) | Q(room__in=rooms))
+            self.add_many('reservation', reservations.values_list('pk', 'requester'))
+        write(self.changes)
+
+
+def _buffer():
+    """
+    ``(buffer, baru)`` untuk transaksi/savepoint saat ini. Buffer yang
+    callback flush-nya sudah dijalankan atau dibuang (rollback) tidak dipakai
+    lagi.
+    """
+    key = tuple(connection.savepoint_ids)
+    pending = {callback for _, callback, *_ in connection.run_on_commit}
+    buffers = {
+        savepoints: buffer for savepoints, buffer in getattr(_local, 'buffers', {}).items()
+        if not buffer.flushed and buffer.flush in pending
+    }
+    _local.buffers = buffers
+    if key in buffers:
+        return buffers[key], False
+    buffer = buffers[key] = ChangeBuffer()
+    return buffer, True
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_save, sender=Room)
+@receiver(post_save, sender=Reservation)
+@receiver(post_save, sender=Feedback)
+@receiver(post_delete, sender=Location)
+@receiver(post_delete, sender=Room)
+@receiver(post_delete, sender=Reservation)
+@receiver(post_delete, sender=Feedback)
+def log_change(sender, instance, created=False, **kwargs):
+    model = sender._meta.model_name
+    deleted = kwargs['signal'] is post_delete
+    buffer, new = _buffer()
+    buffer.add(model, instance.pk, instance.requester_id if sender is Reservation else None, deleted)
+    # Rating ruangan dihitung dari feedback
+    if sender is Feedback:
+        if Feedback.reservation.is_cached(instance):
+            buffer.add_many('room', [(instance.reservation.room_id, None)])
+        elif not deleted or getattr(kwargs['origin'], 'model', type(kwargs['origin'])) is Feedback:
+            buffer.rated_reservations.add(instance.reservation_id)
+        # Feedback yang ikut terhapus cascade: ruangannya dicatat oleh reservasi/ruangan yang dihapus
+    elif sender is Reservation and deleted:
+        buffer.add_many('room', [(instance.room_id, None)])
+    elif sender in (Location, Room) and not created and not deleted:
+        # Dibandingkan sekarang: snapshot diperbarui setelah save selesai
+        fields = changed_dependent_fields(model, instance)
+        if fields:
+            buffer.dependents[model].setdefault(instance.pk, set()).update(fields)
+    if new:
+        # Di luar transaksi (autocommit) langsung dijalankan
+        transaction.on_commit(buffer.flush)
+
+
+def changes_since(user, since, limit):
+    """
+    ``(entries, token, more)``: baris log setelah token ``since`` yang boleh
+    dilihat ``user``, urut id, paling banyak ``limit``, dan token berikutnya
+    """
+    settled = timezone.now() - timedelta(seconds=settings.SYNC_SETTLE_SECONDS)
+    log = ChangeLog.objects.filter(pk__gt=since)
+    # Titik settle: id terakhir sebelum baris pertama yang belum settled (index created_at)
+    unsettled = log.filter(created_at__gt=settled).aggregate(first=Min('pk'))['first']
+    if unsettled is not None:
+        log = log.filter(pk__lt=unsettled)
+    last = log.filter(created_at__lte=settled).order_by('-pk').values_list('pk', flat=True).first()
+    if last is None:
+        return [], since, False
+
+    entries = log.filter(pk__lte=last)
+    if not user.is_staff:
+        entries = entries.filter(Q(model__in=PUBLIC_MODELS) | Q(owner_id=user.pk))
+    entries = list(entries.order_by('pk').values_list('pk', 'model', 'object_id', 'deleted')[:limit + 1])
+    if len(entries) > limit:
+        return entries[:limit], entries[limit - 1][0], True
+    # Semua baris sampai ``last`` sudah diperiksa, terlihat atau tidak
+    return entries, last, False
+
+
+def feed(request, since, limit):
+    """ Isi respons ``/api/sync`` """
+    entries, token, more = changes_since(request.user, since, limit)
+    data = {'token': str(token), 'more': more}
+    for model, (key, queryset, serializer_class) in FEEDS.items():
+        updated = [entry[2] for entry in entries if entry[1] == model and not entry[3]]
+        deleted = [entry[2] for entry in entries if entry[1] == model and entry[3]]
+        rows = []
+        if updated:
+            objects = queryset().in_bulk(updated)
+            rows = [objects[pk] for pk in updated if pk in objects]
+        data[key] = {
+            'updated': serializer_class(rows, many=True, context={'request': request}).data,
+            'deleted': deleted,
+        }
+    return data
+
+
+def rebuild_log():
+    """
+    Susun ulang log dari isi tabel saat ini (mis. setelah ``manage.py seed``
+    yang menulis langsung tanpa signal). Tombstone lama hilang, jadi klien
+    perlu sinkronisasi penuh (``since=0``).
+    """
+    table = connection.ops.quote_name(ChangeLog._meta.db_table)
+    sources = [
+        ('location', Location, 'NULL'), ('room', Room, 'NULL'),
+        ('reservation', Reservation, 'requester_id'), ('feedback', Feedback, 'NULL'),
+    ]
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {table}')
+        for name, model, owner in sources:
+            cursor.execute(
+                f'INSERT INTO {table} (model, object_id, owner_id, deleted, created_at) '
+                f'SELECT %s, id, {owner}, %s, %s FROM {connection.ops.quote_name(model._meta.db_table)} ORDER BY id',
+                [name, False, timezone.now()],
+            )
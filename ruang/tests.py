@@ -1,11 +1,30 @@
-from django.test import TestCase
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
+from django.urls import include, path
 from rest_framework.test import APIClient, APITestCase
 from rest_framework import status
-from datetime import datetime, timedelta
+from rest_framework.renderers import JSONRenderer
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from types import SimpleNamespace
+from unittest import mock
 from django.utils import timezone
 
-from .models import Location, Room, Reservation, Feedback
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from profil import urls as profil_urls
+from profil.models import UserProfile
+from siruinsk.utils import query_budget
+from siruinsk.utils.query_budget import EndpointBudget
+from siruinsk.utils.row_mapper import RowMapper
+from . import urls as ruang_urls
+from . import sync
+from .models import ChangeLog, Location, Room, Reservation, Feedback
+from .serializers import FeedbackSerializer, ReservationSerializer, RoomSerializer
 
 User = get_user_model()
 
@@ -640,4 +659,553 @@ class FeedbackViewSetTest(APITestCase):
         
         response = self.client.delete(f'/api/feedback/{feedback.id}/')
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
-        self.assertEqual(Feedback.objects.count(), 0)
\ No newline at end of file
+        self.assertEqual(Feedback.objects.count(), 0)
+
+class ValuesListTest(APITestCase):
+    """List reservasi/feedback lewat values_list identik dengan serializer"""
+
+    def setUp(self):
+        self.staff_user = User.objects.create_user(username='staff', password='testpass123', is_staff=True)
+        self.user = User.objects.create_user(username='user', password='testpass123', email='user@example.com')
+        location = Location.objects.create(name='Gedung — Utama', address='Jl. 1')
+        room = Room.objects.create(name='Ruang A', location=location, capacity=10)
+        start = datetime(2025, 1, 6, 1, 30, 15, 123456, tzinfo=dt_timezone.utc)
+        for index, (requester, state) in enumerate([
+            (self.user, 'APPROVED'), (None, 'PENDING'), (self.staff_user, 'DECLINED'), (self.user, 'PENDING'),
+        ]):
+            reservation = Reservation.objects.create(
+                room=room, requester=requester, start=start + timedelta(days=index),
+                end=start + timedelta(days=index, hours=2), purpose=f'Rapat {index}', status=state,
+            )
+            Feedback.objects.create(user=requester, reservation=reservation, rating=index + 1, text='')
+
+    def serialized(self, serializer_class, queryset):
+        # Keluaran jalur lama: serializer atas instance model
+        return serializer_class(queryset.order_by('pk'), many=True).data
+
+    def test_reservation_list_identical(self):
+        self.client.force_authenticate(user=self.staff_user)
+        response = self.client.get('/api/reservations/')
+        expected = self.serialized(ReservationSerializer, Reservation.objects.all())
+        self.assertEqual(response.content, JSONRenderer().render({
+            'count': 4, 'next': None, 'previous': None, 'results': expected,
+        }))
+        # requester kosong: DRF melewati field requester_name/requester_email
+        self.assertNotIn('requester_name', response.json()['results'][1])
+        self.assertEqual(response.json()['results'][0]['start'], '2025-01-06T08:30:15.123456+07:00')
+
+    def test_filters_and_owner_scope(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get('/api/reservations/', {'status': 'PENDING'})
+        self.assertEqual([row['purpose'] for row in response.json()['results']], ['Rapat 3'])
+        response = self.client.get('/api/reservations/my_reservations/')
+        expected = self.serialized(ReservationSerializer, Reservation.objects.filter(requester=self.user))
+        self.assertEqual(response.content, JSONRenderer().render(expected))
+
+    def test_feedback_list_identical(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get('/api/feedback/')
+        expected = self.serialized(FeedbackSerializer, Feedback.objects.all())
+        self.assertEqual(response.content, JSONRenderer().render({
+            'count': 4, 'next': None, 'previous': None, 'results': expected,
+        }))
+        response = self.client.get('/api/feedback/my_feedback/')
+        expected = self.serialized(FeedbackSerializer, Feedback.objects.filter(user=self.user))
+        self.assertEqual(response.content, JSONRenderer().render(expected))
+
+    def test_unsupported_serializer(self):
+        with self.assertRaises(ImproperlyConfigured):
+            RowMapper(RoomSerializer)
+
+
+class SparseFieldsTest(APITestCase):
+    """?fields=/?exclude= memangkas respons dan kolom/join di query"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='user', password='testpass123', email='user@example.com')
+        self.location = Location.objects.create(name='Gedung A', address='Jl. 1')
+        self.room = Room.objects.create(name='Ruang A', location=self.location, capacity=10)
+        start = timezone.now() + timedelta(days=1)
+        self.reservation = Reservation.objects.create(
+            room=self.room, requester=self.user, start=start, end=start + timedelta(hours=1),
+            purpose='Rapat', status='APPROVED',
+        )
+        Feedback.objects.create(user=self.user, reservation=self.reservation, rating=4, text='Bagus')
+        self.client.force_authenticate(user=self.user)
+
+    def get(self, url, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json(), queries[-1]['sql']
+
+    def test_reservation_list_fields(self):
+        data, sql = self.get('/api/reservations/', {'fields': 'id,room_name,start,end,status'})
+        self.assertEqual(list(data['results'][0]), ['id', 'room_name', 'start', 'end', 'status'])
+        self.assertIn('"ruang_room"', sql)
+        self.assertNotIn('"auth_user"."email"', sql)
+        self.assertNotIn('"ruang_location"', sql)
+        self.assertNotIn('"purpose"', sql)
+
+    def test_reservation_detail_exclude(self):
+        data, sql = self.get(
+            f'/api/reservations/{self.reservation.pk}/', {'exclude': 'requester_email,location_name,purpose'}
+        )
+        self.assertNotIn('requester_email', data)
+        self.assertEqual(data['requester_name'], 'user')
+        self.assertNotIn('"ruang_location"', sql)
+        self.assertNotIn('"auth_user"."email"', sql)
+        self.assertNotIn('"purpose"', sql)
+
+    def test_room_rating_subquery_only_when_requested(self):
+        data, sql = self.get('/api/rooms/', {'fields': 'id,name'})
+        self.assertEqual(data['results'][0], {'id': self.room.pk, 'name': 'Ruang A'})
+        self.assertNotIn('"ruang_feedback"', sql)
+        self.assertNotIn('"ruang_location"', sql)
+
+        data, sql = self.get('/api/rooms/', {'fields': 'name,rating'})
+        self.assertEqual(data['results'][0], {'name': 'Ruang A', 'rating': 4.0})
+        self.assertIn('"ruang_feedback"', sql)
+
+    def test_feedback_and_location(self):
+        data, sql = self.get('/api/feedback/', {'exclude': 'user_name,reservation_room'})
+        self.assertNotIn('user_name', data['results'][0])
+        self.assertNotIn('"auth_user"', sql)
+        data, _ = self.get('/api/locations/', {'fields': 'name'})
+        self.assertEqual(data['results'], [{'name': 'Gedung A'}])
+
+    def test_unknown_field(self):
+        response = self.client.get('/api/reservations/', {'fields': 'id,secret', 'exclude': 'nope'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json(), {'fields': ['Unknown field: secret'], 'exclude': ['Unknown field: nope']})
+
+    def test_writes_return_all_fields(self):
+        response = self.client.patch(
+            f'/api/reservations/{self.reservation.pk}/?fields=id', {'purpose': 'Rapat 2'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['purpose'], 'Rapat 2')
+        self.assertIn('location_name', response.json())
+
+
+
+@override_settings(SYNC_SETTLE_SECONDS=0)
+class SyncTest(APITestCase):
+    """GET /api/sync hanya mengirim perubahan sejak token"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='user', password='testpass123')
+        self.other = User.objects.create_user(username='other', password='testpass123')
+        self.staff = User.objects.create_user(username='staff', password='testpass123', is_staff=True)
+        self.start = timezone.now() + timedelta(days=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.location = Location.objects.create(name='Gedung A', address='Jl. A')
+            self.room = Room.objects.create(name='R.101', location=self.location, capacity=30)
+            self.mine = self.reserve(self.user)
+            self.theirs = self.reserve(self.other, hours=3)
+        self.client.force_authenticate(self.user)
+
+    def reserve(self, user, hours=0, status='PENDING'):
+        return Reservation.objects.create(
+            room=self.room, requester=user, purpose='Rapat', status=status,
+            start=self.start + timedelta(hours=hours), end=self.start + timedelta(hours=hours + 1),
+        )
+
+    def sync(self, since=None, **params):
+        if since is not None:
+            params['since'] = since
+        response = self.client.get('/api/sync', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def test_full_sync_filters_owner(self):
+        data = self.sync()
+        self.assertEqual([row['name'] for row in data['locations']['updated']], ['Gedung A'])
+        self.assertEqual([row['id'] for row in data['rooms']['updated']], [self.room.pk])
+        self.assertEqual([row['id'] for row in data['reservations']['updated']], [self.mine.pk])
+        self.assertFalse(data['more'])
+
+        self.client.force_authenticate(self.staff)
+        staff = self.sync(0)
+        self.assertEqual([row['id'] for row in staff['reservations']['updated']], [self.mine.pk, self.theirs.pk])
+
+    def test_delta_after_update(self):
+        token = self.sync()['token']
+        self.assertEqual(self.sync(token)['reservations'], {'updated': [], 'deleted': []})
+
+        self.client.force_authenticate(self.staff)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'/api/reservations/{self.mine.pk}/approve/', {'status': 'APPROVED'}, format='json')
+        self.client.force_authenticate(self.user)
+
+        data = self.sync(token)
+        self.assertEqual([row['status'] for row in data['reservations']['updated']], ['APPROVED'])
+        self.assertEqual(data['rooms']['updated'], [])
+        self.assertGreater(int(data['token']), int(token))
+        self.assertEqual(self.sync(data['token'])['token'], data['token'])
+
+    def test_delete_leaves_tombstone(self):
+        token = self.sync()['token']
+        mine, room = self.mine.pk, self.room.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            self.mine.delete()
+            self.theirs.delete()
+        data = self.sync(token)
+        # Tombstone reservasi user lain tidak terlihat
+        self.assertEqual(data['reservations'], {'updated': [], 'deleted': [mine]})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.room.delete()
+        self.assertEqual(self.sync(data['token'])['rooms'], {'updated': [], 'deleted': [room]})
+
+    def test_derived_fields(self):
+        """Nama ruangan dan rating ikut tersinkron lewat baris yang menampilkannya"""
+        token = self.sync()['token']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.room.name = 'R.102'
+            self.room.save()
+        data = self.sync(token)
+        self.assertEqual([row['room_name'] for row in data['reservations']['updated']], ['R.102'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            approved = self.reserve(self.user, hours=6, status='APPROVED')
+        token = self.sync(data['token'])['token']
+        with self.captureOnCommitCallbacks(execute=True):
+            Feedback.objects.create(user=self.user, reservation=approved, rating=4, text='Bagus')
+        data = self.sync(token)
+        self.assertEqual(len(data['feedback']['updated']), 1)
+        self.assertEqual([row['rating'] for row in data['rooms']['updated']], [4.0])
+
+    def test_dependents_only_on_displayed_fields(self):
+        """Reservasi/feedback hanya dicatat ulang jika nama atau lokasi ruangan berubah"""
+        token = self.sync()['token']
+        logged = set(ChangeLog.objects.filter(model='reservation').values_list('pk', flat=True))
+        self.client.force_authenticate(self.staff)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(f'/api/rooms/{self.room.pk}/', {'capacity': 40}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(ChangeLog.objects.filter(model='reservation').values_list('pk', flat=True)), logged)
+        data = self.sync(token)
+        self.assertEqual([row['capacity'] for row in data['rooms']['updated']], [40])
+        self.assertEqual(data['reservations']['updated'], [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            other = Location.objects.create(name='Gedung B', address='Jl. B')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'/api/rooms/{self.room.pk}/', {'location': other.pk}, format='json')
+        data = self.sync(data['token'])
+        self.assertEqual(
+            sorted(row['location_name'] for row in data['reservations']['updated']), ['Gedung B', 'Gedung B']
+        )
+
+    def test_record_retries_concurrent_insert(self):
+        """record() yang kalah constraint unik terhadap record() lain diulang, objek tetap satu baris"""
+        bulk_create = ChangeLog.objects.bulk_create
+        calls = []
+
+        def racing_bulk_create(objs):
+            if not calls:
+                # record() lain menyisipkan baris objek yang sama setelah DELETE
+                bulk_create([ChangeLog(model='reservation', object_id=self.mine.pk)])
+            calls.append(1)
+            return bulk_create(objs)
+
+        with mock.patch.object(ChangeLog.objects, 'bulk_create', racing_bulk_create):
+            sync.record('reservation', [(self.mine.pk, self.user.pk)])
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(ChangeLog.objects.filter(model='reservation', object_id=self.mine.pk).count(), 1)
+
+    def delete_room_with_reservations(self, count):
+        """ Hapus ruangan berisi ``count`` reservasi berfeedback; query sampai log selesai ditulis """
+        with self.captureOnCommitCallbacks(execute=True):
+            room = Room.objects.create(name=f'R.{count}', location=self.location, capacity=30)
+            reservations = Reservation.objects.bulk_create(
+                Reservation(
+                    room=room, requester=self.user, purpose='Rapat', status='APPROVED',
+                    start=self.start + timedelta(hours=2 * i), end=self.start + timedelta(hours=2 * i + 1),
+                )
+                for i in range(count)
+            )
+            Feedback.objects.bulk_create(
+                Feedback(user=self.user, reservation=reservation, rating=4, text='Bagus')
+                for reservation in reservations
+            )
+        with CaptureQueriesContext(connection) as ctx, self.captureOnCommitCallbacks(execute=True):
+            room.delete()
+        tombstones = ChangeLog.objects.filter(
+            model='reservation', object_id__in=[reservation.pk for reservation in reservations], deleted=True
+        )
+        self.assertEqual(tombstones.count(), count)
+        return ctx.captured_queries
+
+    def test_cascade_delete_logged_in_one_write(self):
+        """Log reservasi/feedback yang terhapus cascade ditulis sekali per model, tidak per objek"""
+        few = self.delete_room_with_reservations(1)
+        many = self.delete_room_with_reservations(50)
+        self.assertEqual(len(many), len(few), '\n'.join(query['sql'] for query in many))
+        writes = [query['sql'] for query in many if '"ruang_changelog"' in query['sql']]
+        # DELETE + INSERT untuk reservasi, feedback, dan ruangan
+        self.assertEqual(len(writes), 6, '\n'.join(writes))
+
+    def test_token_skips_invisible_rows(self):
+        """Token maju melewati perubahan yang tidak boleh dilihat user"""
+        token = self.sync()['token']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.theirs.purpose = 'Rapat lain'
+            self.theirs.save()
+        data = self.sync(token)
+        self.assertEqual(data['reservations']['updated'], [])
+        self.assertEqual(int(data['token']), ChangeLog.objects.latest('pk').pk)
+
+    def test_compacted_and_paged(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for purpose in ('Rapat 2', 'Rapat 3'):
+                self.mine.purpose = purpose
+                self.mine.save()
+        # Satu baris log per objek
+        self.assertEqual(ChangeLog.objects.filter(model='reservation', object_id=self.mine.pk).count(), 1)
+
+        first = self.sync(0, limit=2)
+        self.assertTrue(first['more'])
+        self.assertEqual(len(first['locations']['updated']) + len(first['rooms']['updated']), 2)
+        rest = self.sync(first['token'], limit=2)
+        self.assertEqual([row['purpose'] for row in rest['reservations']['updated']], ['Rapat 3'])
+        self.assertFalse(rest['more'])
+
+    def test_unsettled_changes_deferred(self):
+        token = self.sync()['token']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.mine.save()
+        with self.settings(SYNC_SETTLE_SECONDS=60):
+            data = self.sync(token)
+        self.assertEqual((data['token'], data['more'], data['reservations']['updated']), (token, False, []))
+
+    def test_invalid_params(self):
+        for params in ({'since': 'abc'}, {'since': -1}, {'limit': 0}):
+            response = self.client.get('/api/sync', params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get('/api/sync').status_code, status.HTTP_401_UNAUTHORIZED)
+
+class AsyncReadUrls:
+    """URLconf mode ASGI untuk test view async"""
+    urlpatterns = [
+        path('api/', include(ruang_urls.get_async_urlpatterns())),
+        path('api/profile/', include(profil_urls.get_async_urlpatterns())),
+    ]
+
+
+@override_settings(ROOT_URLCONF=AsyncReadUrls, ASGI_DB_THREADS=0)
+class AsyncReadViewTest(TestCase):
+    """Test view baca async (mode ASGI)"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='user', password='testpass123')
+        self.staff_user = User.objects.create_user(username='staff', password='testpass123', is_staff=True)
+        self.location = Location.objects.create(name='Main Building', address='123 Main St')
+        self.room = Room.objects.create(name='Conference Room A', location=self.location, capacity=10)
+        self.start = timezone.now() + timedelta(days=1)
+        self.end = self.start + timedelta(hours=2)
+        reservation = Reservation.objects.create(
+            room=self.room, requester=self.user, start=self.start, end=self.end,
+            purpose='Test Meeting', status='APPROVED'
+        )
+        Feedback.objects.create(user=self.user, reservation=reservation, rating=4, text='Bagus')
+        token = str(RefreshToken.for_user(self.user).access_token)
+        self.auth = {'headers': {'Authorization': f'Bearer {token}'}}
+
+    async def test_room_list(self):
+        """List ruangan async sama dengan versi sync, termasuk rating"""
+        response = await self.async_client.get('/api/rooms/', **self.auth)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(data['results'][0]['location_name'], 'Main Building')
+        self.assertEqual(data['results'][0]['rating'], 4.0)
+
+    async def test_room_list_sparse_fields(self):
+        """?fields= juga berlaku di view async"""
+        response = await self.async_client.get('/api/rooms/', {'fields': 'id,rating'}, **self.auth)
+        self.assertEqual(response.json()['results'], [{'id': self.room.id, 'rating': 4.0}])
+
+    async def test_room_list_filters(self):
+        """Filter availability tetap berlaku"""
+        response = await self.async_client.get('/api/rooms/', {
+            'available_from': self.start.isoformat(),
+            'available_to': self.end.isoformat(),
+        }, **self.auth)
+        self.assertEqual(response.json()['count'], 0)
+
+    async def test_location_list_requires_auth(self):
+        """Permission viewset tetap berlaku"""
+        response = await self.async_client.get('/api/locations/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = await self.async_client.get('/api/locations/', **self.auth)
+        self.assertEqual(response.json()['results'][0]['name'], 'Main Building')
+
+    async def test_room_availability(self):
+        """Availability async mendeteksi reservasi yang bentrok"""
+        response = await self.async_client.get(
+            f'/api/rooms/{self.room.id}/availability/',
+            {'start': self.start.isoformat(), 'end': self.end.isoformat()},
+            **self.auth
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.json()['available'])
+
+        response = await self.async_client.get(f'/api/rooms/{self.room.id}/availability/', **self.auth)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_writes_use_sync_viewset(self):
+        """POST pada URL yang sama diteruskan ke viewset sync"""
+        response = await self.async_client.post('/api/locations/', {'name': 'X', 'address': 'Y'}, **self.auth)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    async def test_profile_read(self):
+        """Profil dibaca lewat view async"""
+        response = await self.async_client.get('/api/profile/me', **self.auth)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['username'], 'user')
+
+
+def _detail(attr):
+    return lambda test: {'pk': getattr(test.rows, attr).pk}
+
+
+def _reservation_data(test):
+    start = timezone.now() + timedelta(days=30)
+    return {
+        'room': test.rows.room.pk,
+        'start': start.isoformat(),
+        'end': (start + timedelta(hours=1)).isoformat(),
+        'purpose': 'Seminar',
+        'requested_capacity': 10,
+    }
+
+
+def _availability_query(test):
+    start = timezone.now() + timedelta(days=1)
+    return {'start': start.isoformat(), 'end': (start + timedelta(hours=1)).isoformat()}
+
+
+class RuangQueryBudgetTest(query_budget.QueryBudgetTestCase):
+    """Jumlah query endpoint ruang tidak boleh bertambah mengikuti jumlah baris"""
+    urls = ruang_urls
+    namespace = 'ruang'
+    budgets = [
+        EndpointBudget('api-root', 'GET', 1),
+        EndpointBudget('location-list', 'GET', 3),
+        EndpointBudget('location-list', 'POST', 2, user='staff',
+                       data={'name': 'Gedung Baru', 'address': 'Jl. Baru'}),
+        EndpointBudget('location-detail', 'GET', 2, kwargs=_detail('location')),
+        EndpointBudget('location-detail', 'PUT', 3, user='staff', kwargs=_detail('location'),
+                       data={'name': 'Gedung A', 'address': 'Jl. A'}),
+        EndpointBudget('location-detail', 'PATCH', 3, user='staff', kwargs=_detail('location'),
+                       data={'name': 'Gedung B'}),
+        # Receiver post_delete ChangeLog: feedback yang ikut terhapus dimuat dulu (tombstone), bukan fast delete
+        EndpointBudget('location-detail', 'DELETE', 9, user='staff', kwargs=_detail('location')),
+        EndpointBudget('room-list', 'GET', 3),
+        EndpointBudget('room-list', 'POST', 4, user='staff',
+                       data=lambda test: {'name': 'Ruang Baru', 'location': test.rows.location.pk, 'capacity': 30}),
+        EndpointBudget('room-detail', 'GET', 2, kwargs=_detail('room')),
+        EndpointBudget('room-detail', 'PUT', 4, user='staff', kwargs=_detail('room'),
+                       data=lambda test: {'name': 'Ruang A', 'location': test.rows.location.pk, 'capacity': 40}),
+        EndpointBudget('room-detail', 'PATCH', 3, user='staff', kwargs=_detail('room'),
+                       data={'capacity': 50}),
+        EndpointBudget('room-detail', 'DELETE', 7, user='staff', kwargs=_detail('room')),
+        EndpointBudget('room-availability', 'GET', 3, kwargs=_detail('room'), query=_availability_query),
+        EndpointBudget('reservation-list', 'GET', 3),
+        EndpointBudget('reservation-list', 'POST', 4, data=_reservation_data),
+        EndpointBudget('reservation-detail', 'GET', 2, kwargs=_detail('reservation')),
+        EndpointBudget('reservation-detail', 'PUT', 5, kwargs=_detail('reservation'), data=_reservation_data),
+        EndpointBudget('reservation-detail', 'PATCH', 3, kwargs=_detail('reservation'),
+                       data={'purpose': 'Kuliah umum'}),
+        EndpointBudget('reservation-detail', 'DELETE', 5, kwargs=_detail('reservation')),
+        EndpointBudget('reservation-approve', 'PATCH', 4, user='staff', kwargs=_detail('reservation'),
+                       data={'status': 'APPROVED'}),
+        EndpointBudget('reservation-my-reservations', 'GET', 2),
+        EndpointBudget('feedback-list', 'GET', 3),
+        EndpointBudget('feedback-list', 'POST', 5,
+                       data=lambda test: {'reservation': test.rows.reservation.pk, 'rating': 5, 'text': 'Nyaman'}),
+        EndpointBudget('feedback-detail', 'GET', 2, kwargs=_detail('feedback')),
+        EndpointBudget('feedback-detail', 'PUT', 6, kwargs=_detail('feedback'),
+                       data=lambda test: {'reservation': test.rows.reservation.pk, 'rating': 3, 'text': 'Cukup'}),
+        EndpointBudget('feedback-detail', 'PATCH', 3, kwargs=_detail('feedback'), data={'rating': 2}),
+        EndpointBudget('feedback-detail', 'DELETE', 3, kwargs=_detail('feedback')),
+        EndpointBudget('feedback-my-feedback', 'GET', 2),
+        # Dua query titik settle, satu query log, satu query per jenis objek yang berubah
+        EndpointBudget('sync', 'GET', 8, user='staff'),
+        EndpointBudget('sync', 'GET', 8),
+    ]
+
+    def make_rows(self, count):
+        user = self.users['user']
+        start = timezone.now() + timedelta(days=1)
+        locations = Location.objects.bulk_create(
+            Location(name=f'Gedung {i}', address=f'Jl. Kampus {i}') for i in range(count)
+        )
+        rooms = Room.objects.bulk_create(
+            Room(name=f'Ruang {i}', location=locations[i], capacity=20) for i in range(count)
+        )
+        reservations = Reservation.objects.bulk_create(
+            Reservation(
+                requester=user, room=rooms[i], purpose='Rapat', status='APPROVED',
+                start=start + timedelta(hours=2 * i), end=start + timedelta(hours=2 * i + 1),
+            )
+            for i in range(count)
+        )
+        feedback = Feedback.objects.bulk_create(
+            Feedback(user=user, reservation=reservations[i], rating=4, text='Bagus') for i in range(count)
+        )
+        # bulk_create tidak memicu signal ChangeLog
+        sync.rebuild_log()
+        return SimpleNamespace(
+            location=locations[0], room=rooms[0], reservation=reservations[0], feedback=feedback[0]
+        )
+
+
+class SeedCommandTest(TestCase):
+    """Test management command seed"""
+
+    def seed(self, **options):
+        options = {'locations': 2, 'rooms': 5, 'users': 20, 'reservations': 300, 'weeks': 2,
+                   'batch_size': 100, 'stdout': StringIO(), **options}
+        call_command('seed', **options)
+
+    def snapshot(self):
+        return list(Reservation.objects.order_by('pk').values_list(
+            'requester__username', 'room__name', 'start', 'end', 'status', 'purpose'
+        ))
+
+    def test_seed_creates_consistent_data(self):
+        self.seed()
+        self.assertEqual(Location.objects.count(), 2)
+        self.assertEqual(Room.objects.count(), 5)
+        self.assertEqual(User.objects.filter(username__startswith='seed_').count(), 20)
+        self.assertEqual(UserProfile.objects.count(), 20)
+        self.assertEqual(Reservation.objects.count(), 300)
+        self.assertEqual(ChangeLog.objects.filter(model='reservation').count(), 300)
+
+        approved = Reservation.objects.filter(status='APPROVED')
+        for reservation in approved:
+            self.assertFalse(approved.filter(
+                room=reservation.room, start__lt=reservation.end, end__gt=reservation.start
+            ).exclude(pk=reservation.pk).exists())
+        for feedback in Feedback.objects.select_related('reservation'):
+            self.assertEqual(feedback.reservation.status, 'APPROVED')
+            self.assertEqual(feedback.user_id, feedback.reservation.requester_id)
+
+    def test_seed_is_deterministic(self):
+        self.seed(seed=7)
+        first = self.snapshot()
+        self.seed(seed=7, clear=True)
+        self.assertEqual(self.snapshot(), first)
+        self.seed(seed=8, clear=True)
+        self.assertNotEqual(self.snapshot(), first)
+
+    def test_clear_keeps_change_log_ids_increasing(self):
+        """Token sync lama tetap di bawah id log setelah --clear, jadi klien menerima data baru"""
+        self.seed()
+        token = ChangeLog.objects.latest('pk').pk
+        self.seed(clear=True)
+        self.assertGreater(ChangeLog.objects.earliest('pk').pk, token)
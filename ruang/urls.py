@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from . import views
@@ -11,9 +12,38 @@ router.register(r'reservations', views.ReservationViewSet, basename='reservation
 router.register(r'feedback', views.FeedbackViewSet, basename='feedback')
 
 urlpatterns = [
+    path('sync', views.SyncView.as_view(), name='sync'),
     path('', include(router.urls)),
 ]
 
+
+def get_async_urlpatterns():
+    """
+    Jalur baca async untuk mode ASGI. GET/HEAD dilayani view async, metode lain
+    diteruskan ke viewset sync yang sama seperti yang dipasang router.
+    """
+    from siruinsk.utils.async_views import split_by_method
+    from . import async_views
+
+    location_list = views.LocationViewSet.as_view({'get': 'list', 'post': 'create'})
+    room_list = views.RoomViewSet.as_view({'get': 'list', 'post': 'create'})
+    room_availability = views.RoomViewSet.as_view({'get': 'availability'}, detail=True)
+
+    return [
+        path('locations/', split_by_method(async_views.LocationListAsyncView.as_view(), location_list),
+             name='location-list'),
+        path('rooms/', split_by_method(async_views.RoomListAsyncView.as_view(), room_list),
+             name='room-list'),
+        path('rooms/<pk>/availability/',
+             split_by_method(async_views.RoomAvailabilityAsyncView.as_view(), room_availability),
+             name='room-availability'),
+    ]
+
+
+# Mode ASGI: pola async didaftarkan sebelum router sehingga menang saat resolve
+if settings.SERVER_MODE == 'asgi':
+    urlpatterns = get_async_urlpatterns() + urlpatterns
+
 # URL patterns yang akan dihasilkan:
 # GET/POST    /api/locations/                 - List/Create locations (staff only untuk POST)
 # GET/PUT/PATCH/DELETE /api/locations/{id}/   - Detail location (staff only untuk PUT/PATCH/DELETE)
@@ -29,6 +59,8 @@ urlpatterns = [
 #
 # GET/POST    /api/feedback/                  - List/Create feedback
 # GET/PUT/PATCH/DELETE /api/feedback/{id}/    - Detail feedback
+#
+# GET         /api/sync?since={token}         - Perubahan location/room/reservation/feedback sejak token
 # GET         /api/feedback/my_feedback/      - User's own feedback
 
 # Contoh filter parameters:
@@ -45,4 +77,9 @@ urlpatterns = [
 # GET /api/rooms/?min_capacity=20
 
 # Filter berdasarkan lokasi saja (case-insensitive)
-# GET /api/rooms/?location=building
\ No newline at end of file
+# GET /api/rooms/?location=building
+
+# Sparse fieldset (semua viewset ruang, GET): hanya field yang diminta dan
+# kolom/join yang dibutuhkannya yang diambil dari database
+# GET /api/reservations/?fields=id,room_name,start,end,status
+# GET /api/rooms/?exclude=rating
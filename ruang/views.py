@@ -1,24 +1,30 @@
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.conf import settings
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from django_filters import rest_framework as django_filters
+from django.db import DEFAULT_DB_ALIAS
 from django.db.models import Q
-from datetime import datetime
+from datetime import datetime, timezone as dt_timezone
 from django.utils.dateparse import parse_datetime
 from django.utils.timezone import is_naive, make_aware
 from django.utils import timezone
 
-from .models import Location, Room, Reservation, Feedback
+from . import sync
+from .models import Location, Room, RoomQuerySet, Reservation, Feedback
 from .serializers import (
     LocationSerializer, RoomSerializer, ReservationSerializer, 
     ReservationApprovalSerializer, FeedbackSerializer
 )
 from siruinsk.utils.permissions import IsStaffOrReadOnly, IsOwnerOrStaffOrReadOnly, IsStaffForApproval
+from siruinsk.utils.row_mapper import ValuesListMixin
+from siruinsk.utils.sparse_fields import SparseFieldsMixin
 
 
-class LocationViewSet(viewsets.ModelViewSet):
+class LocationViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Location.objects.all()
     serializer_class = LocationSerializer
     permission_classes = [IsStaffOrReadOnly]
@@ -44,7 +50,6 @@ class RoomFilter(django_filters.FilterSet):
         
         if available_from and available_to:
             try:
-                from datetime import datetime
                 # Parse datetime jika berupa string
                 if isinstance(available_from, str):
                     start_dt = datetime.fromisoformat(available_from.replace('Z', '+00:00'))
@@ -71,8 +76,10 @@ class RoomFilter(django_filters.FilterSet):
         return queryset
 
 
-class RoomViewSet(viewsets.ModelViewSet):
+class RoomViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Room.objects.select_related('location')
+    # Subquery rating hanya ditambahkan jika field rating ikut diminta
+    sparse_annotations = {'rating': RoomQuerySet.with_average_rating}
     serializer_class = RoomSerializer
     permission_classes = [IsStaffOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
@@ -82,49 +89,69 @@ class RoomViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'])
     def availability(self, request, pk=None):
         room = self.get_object()
-        start_time = request.query_params.get('start')
-        end_time = request.query_params.get('end')
+        period = parse_availability_period(request)
+        if isinstance(period, Response):
+            return period
+
+        conflicting = conflicting_reservations(room, *period).exists()
+        return availability_response(request, room, conflicting)
+
+
+def parse_availability_period(request):
+    """
+    Ambil parameter ``start``/``end`` untuk cek availability. Mengembalikan
+    tuple datetime (timezone-aware), atau ``Response`` 400 jika tidak valid.
+    """
+    start_time = request.query_params.get('start')
+    end_time = request.query_params.get('end')
+
+    if not start_time or not end_time:
+        return Response(
+            {'error': 'start and end query parameters are required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
 
-        if not start_time or not end_time:
-            return Response(
-                {'error': 'start and end query parameters are required'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+    start_dt = parse_datetime(start_time)
+    end_dt = parse_datetime(end_time)
 
-        start_dt = parse_datetime(start_time)
-        end_dt = parse_datetime(end_time)
+    if not start_dt or not end_dt:
+        return Response(
+            {'error': 'Invalid datetime format. Use ISO format.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
 
-        if not start_dt or not end_dt:
-            return Response(
-                {'error': 'Invalid datetime format. Use ISO format.'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+    # Pastikan timezone-aware (UTC)
+    if is_naive(start_dt):
+        start_dt = make_aware(start_dt, dt_timezone.utc)
 
-        # Pastikan timezone-aware (UTC)
-        if is_naive(start_dt):
-            start_dt = make_aware(start_dt, timezone.utc)
+    if is_naive(end_dt):
+        end_dt = make_aware(end_dt, dt_timezone.utc)
 
-        if is_naive(end_dt):
-            end_dt = make_aware(end_dt, timezone.utc)
+    return start_dt, end_dt
 
-        conflicting = Reservation.objects.filter(
-            room=room,
-            status='APPROVED',
-            start__lt=end_dt,
-            end__gt=start_dt
-        ).exists()
 
-        return Response({
-            'room': room.id,
-            'available': not conflicting,
-            'checked_period': {
-                'start': start_time,
-                'end': end_time
-            }
-        })
+def conflicting_reservations(room, start_dt, end_dt):
+    # Cek bentrok selalu di primary, replica bisa tertinggal beberapa detik
+    return Reservation.objects.using(DEFAULT_DB_ALIAS).filter(
+        room=room,
+        status='APPROVED',
+        start__lt=end_dt,
+        end__gt=start_dt
+    )
 
 
-class ReservationViewSet(viewsets.ModelViewSet):
+def availability_response(request, room, conflicting):
+    return Response({
+        'room': room.id,
+        'available': not conflicting,
+        'checked_period': {
+            'start': request.query_params.get('start'),
+            'end': request.query_params.get('end')
+        }
+    })
+
+
+class ReservationViewSet(SparseFieldsMixin, ValuesListMixin, viewsets.ModelViewSet):
     serializer_class = ReservationSerializer
     permission_classes = [IsOwnerOrStaffOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
@@ -132,6 +159,9 @@ class ReservationViewSet(viewsets.ModelViewSet):
     search_fields = ['purpose', 'room__name', 'room__location__name']
     
     def get_queryset(self):
+        # Schema OpenAPI dibangun tanpa request (siruinsk/utils/schema.py)
+        if getattr(self, 'swagger_fake_view', False):
+            return Reservation.objects.none()
         if self.request.user.is_staff:
             return Reservation.objects.select_related('requester', 'room', 'room__location')
         else:
@@ -152,11 +182,8 @@ class ReservationViewSet(viewsets.ModelViewSet):
         if serializer.is_valid():
             # Validasi tidak ada conflict jika approve
             if request.data.get('status') == 'APPROVED':
-                conflicting = Reservation.objects.filter(
-                    room=reservation.room,
-                    status='APPROVED',
-                    start__lt=reservation.end,
-                    end__gt=reservation.start
+                conflicting = conflicting_reservations(
+                    reservation.room, reservation.start, reservation.end
                 ).exclude(id=reservation.id).exists()
                 
                 if conflicting:
@@ -173,11 +200,10 @@ class ReservationViewSet(viewsets.ModelViewSet):
     def my_reservations(self, request):
         """Get reservasi milik user yang login"""
         reservations = self.get_queryset().filter(requester=request.user)
-        serializer = self.get_serializer(reservations, many=True)
-        return Response(serializer.data)
+        return Response(self.map_rows(self.values_list_queryset(reservations)))
 
 
-class FeedbackViewSet(viewsets.ModelViewSet):
+class FeedbackViewSet(SparseFieldsMixin, ValuesListMixin, viewsets.ModelViewSet):
     serializer_class = FeedbackSerializer
     permission_classes = [IsOwnerOrStaffOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
@@ -191,5 +217,22 @@ class FeedbackViewSet(viewsets.ModelViewSet):
     def my_feedback(self, request):
         """Get feedback yang dibuat oleh user yang login"""
         feedback = self.get_queryset().filter(user=request.user)
-        serializer = self.get_serializer(feedback, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        return Response(self.map_rows(self.values_list_queryset(feedback)))
+
+
+class SyncView(APIView):
+    """
+    Perubahan sejak token: ``GET /api/sync?since=<token>&limit=<n>``.
+    Tanpa ``since`` (atau ``since=0``) semua data dikirim dari awal.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            since = int(request.query_params.get('since') or 0)
+            limit = min(int(request.query_params.get('limit') or settings.SYNC_MAX_CHANGES), settings.SYNC_MAX_CHANGES)
+        except ValueError:
+            return Response({'error': 'since and limit must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+        if since < 0 or limit < 1:
+            return Response({'error': 'since must be >= 0 and limit >= 1'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(sync.feed(request, since, limit))
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class SiruinskConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'siruinsk'
+
+    def ready(self):
+        # Pasang execute wrapper instrumentasi di setiap koneksi database baru
+        from .utils import instrumentation  # noqa: F401
@@ -0,0 +1,23 @@
+"""
+Versi async ``BatchView`` untuk mode ASGI (lihat ``siruinsk/urls.py``):
+sub-request batch baca dijalankan bersamaan.
+"""
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from .serializers import BatchSerializer
+from .utils import batch, replicas
+from .utils.async_views import AsyncAPIView
+
+
+class BatchAsyncView(AsyncAPIView):
+    permission_classes = [IsAuthenticated]
+
+    async def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data['requests']
+        alias = await replicas.aread_alias(request) if batch.is_read_only(items) else None
+        with batch.routing(request, items, alias):
+            responses = await batch.aexecute_all(request, items)
+        return Response({'responses': responses})
@@ -0,0 +1,26 @@
+"""
+Tulis schema OpenAPI (JSON) ke ``OPENAPI_SCHEMA_FILE`` agar worker tidak perlu
+membangunnya saat runtime. Dijalankan saat build image (lihat ``Dockerfile``).
+
+Contoh:
+    python manage.py generate_schema
+    python manage.py generate_schema --output /tmp/openapi.json
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from siruinsk.utils import schema
+
+
+class Command(BaseCommand):
+    help = 'Bangun schema OpenAPI sekali dan simpan ke file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=None, help='Default: OPENAPI_SCHEMA_FILE')
+
+    def handle(self, *args, **options):
+        path = options['output'] or settings.OPENAPI_SCHEMA_FILE
+        content = schema.generate()
+        with open(path, 'wb') as f:
+            f.write(content)
+        self.stdout.write(self.style.SUCCESS(f'Schema OpenAPI ({len(content)} byte) ditulis ke {path}'))
@@ -1,7 +1,30 @@
+from django.conf import settings
 from django.contrib.auth.models import User
 from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
-from rest_framework.validators import UniqueValidator
+from django.db import IntegrityError, transaction
+from django.db.models import Func, Q
+from django.db.models.functions import Lower
+
+from .utils.instrumentation import TimedSerializerMixin
+
+USERNAME_TAKEN_MESSAGE = "Username ini sudah terdaftar."
+EMAIL_TAKEN_MESSAGE = "Email ini sudah terdaftar."
+
+# Index/constraint unik auth_user -> (field, pesan). Nama ini muncul di pesan
+# IntegrityError SQLite ("index 'auth_user_email_lower_uniq'", "auth_user.username")
+# maupun PostgreSQL ('constraint "auth_user_username_key"').
+UNIQUE_CONSTRAINT_ERRORS = {
+    'auth_user_email_lower_uniq': ('email', EMAIL_TAKEN_MESSAGE),
+    'auth_user_username_lower_uniq': ('username', USERNAME_TAKEN_MESSAGE),
+    'auth_user_username_key': ('username', USERNAME_TAKEN_MESSAGE),
+    'auth_user.username': ('username', USERNAME_TAKEN_MESSAGE),
+}
+
+
+class LowerNonEmpty(Func):
+    """ LOWER(NULLIF(kolom, '')), harus identik dengan ekspresi index email agar index terpakai """
+    template = "LOWER(NULLIF(%(expressions)s, ''))"
 
 class ResetPasswordSerializer(serializers.Serializer):
     email = serializers.EmailField()
@@ -10,7 +33,7 @@ class ResetPasswordSerializer(serializers.Serializer):
         if not User.objects.filter(email=value).exists():
             raise serializers.ValidationError("Email tidak ditemukan.")
         return value
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer untuk menampilkan data dasar pengguna.
     """
@@ -18,16 +41,10 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
         fields = ['id', 'username', 'email', ]
 
-class RegistrationSerializer(serializers.ModelSerializer):
+class RegistrationSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     username = serializers.CharField(max_length=30)
     
-    email = serializers.CharField(
-        max_length=100,
-        validators=[UniqueValidator(
-            queryset=User.objects.all(), 
-            message="Email ini sudah terdaftar."
-        )]
-    )
+    email = serializers.CharField(max_length=100)
     password1 = serializers.CharField(
         write_only=True, required=True, validators=[validate_password]
     )
@@ -47,10 +64,7 @@ class RegistrationSerializer(serializers.ModelSerializer):
         if len(cleaned_username) > 30:
             raise serializers.ValidationError("Username maksimal 30 karakter.")
 
-        # 3. Cek keunikan secara case-insensitive
-        if User.objects.filter(username__iexact=cleaned_username).exists():
-            raise serializers.ValidationError("Username ini sudah terdaftar.")
-        
+        # Keunikan dicek sekaligus dengan email di validate()
         return cleaned_username
 
     def validate_first_name(self, value):
@@ -70,16 +84,73 @@ class RegistrationSerializer(serializers.ModelSerializer):
     def validate(self, data):
         if data['password1'] != data['password2']:
             raise serializers.ValidationError({"password2": "Konfirmasi password tidak cocok."})
+
+        # Cek keunikan username dan email (case-insensitive) dalam satu query,
+        # memakai index LOWER(username) / LOWER(email) dari migrasi profil 0002
+        username = data['username']
+        email = data['email'].lower()
+        taken = User.objects.annotate(
+            username_lower=Lower('username'), email_lower=LowerNonEmpty('email')
+        ).filter(
+            Q(username_lower=username) | Q(email_lower=email)
+        ).values_list('username_lower', 'email_lower')
+
+        errors = {}
+        for taken_username, taken_email in taken:
+            if taken_username == username:
+                errors['username'] = [USERNAME_TAKEN_MESSAGE]
+            if taken_email == email:
+                errors['email'] = [EMAIL_TAKEN_MESSAGE]
+        if errors:
+            raise serializers.ValidationError(errors)
         return data
 
     def create(self, validated_data):
         validated_data.pop('password2')
 
-        user = User.objects.create_user(
-            username=validated_data['username'],
-            email=validated_data['email'],
-            password=validated_data['password1'],
-            first_name=validated_data['first_name'],
-            last_name=validated_data['last_name']
-        )
-        return user
\ No newline at end of file
+        # User dan UserProfile (lewat signal post_save) dibuat dalam satu transaksi.
+        # Registrasi bersamaan yang lolos validate() ditangkap oleh index unik.
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(
+                    username=validated_data['username'],
+                    email=validated_data['email'],
+                    password=validated_data['password1'],
+                    first_name=validated_data['first_name'],
+                    last_name=validated_data['last_name']
+                )
+        except IntegrityError as exc:
+            for constraint, (field, message) in UNIQUE_CONSTRAINT_ERRORS.items():
+                if constraint in str(exc):
+                    raise serializers.ValidationError({field: [message]})
+            raise
+        return user
+
+
+class BatchItemSerializer(serializers.Serializer):
+    """ Satu sub-request ``/api/batch`` """
+    id = serializers.CharField(required=False, max_length=100)
+    method = serializers.CharField(default='GET')
+    path = serializers.CharField(max_length=2000)
+    body = serializers.JSONField(required=False)
+    headers = serializers.DictField(child=serializers.CharField(), required=False)
+
+    def validate_method(self, value):
+        value = value.upper()
+        if value not in settings.BATCH_ALLOWED_METHODS:
+            raise serializers.ValidationError(f"Metode {value} tidak diizinkan dalam batch.")
+        return value
+
+    def validate_path(self, value):
+        if not value.startswith('/api/'):
+            raise serializers.ValidationError("Path harus diawali /api/.")
+        return value
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = BatchItemSerializer(many=True, allow_empty=False)
+
+    def validate_requests(self, value):
+        if len(value) > settings.BATCH_MAX_REQUESTS:
+            raise serializers.ValidationError(f"Maksimal {settings.BATCH_MAX_REQUESTS} request per batch.")
+        return value
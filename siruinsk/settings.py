@@ -1,6 +1,9 @@
 from decouple import config, Csv
 from pathlib import Path
+import os
+import tempfile
 from datetime import timedelta
+from importlib.util import find_spec
 from corsheaders.defaults import default_headers
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -33,10 +36,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'siruinsk.utils.instrumentation.QueryInstrumentationMiddleware',
+    'siruinsk.utils.metrics.MetricsMiddleware',
+    'siruinsk.utils.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'siruinsk.utils.replicas.ReplicaRoutingMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
@@ -45,6 +52,21 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'siruinsk.urls'
 WSGI_APPLICATION = 'siruinsk.wsgi.application'
+ASGI_APPLICATION = 'siruinsk.asgi.application'
+
+# "wsgi" (gunicorn sync worker) atau "asgi" (gunicorn + uvicorn worker).
+# Mode asgi juga memasang view async untuk jalur baca utama (lihat ruang/urls.py).
+SERVER_MODE = config('SERVER_MODE', default='wsgi')
+# Ukuran thread pool query untuk view async per worker (siruinsk/utils/async_views.py)
+ASGI_DB_THREADS = config('ASGI_DB_THREADS', default=10, cast=int)
+# POST /api/batch (siruinsk/utils/batch.py): metode sub-request yang diizinkan
+# (tambahkan POST/PATCH/... untuk mengizinkan penulisan) dan jumlah maksimal
+BATCH_ALLOWED_METHODS = config('BATCH_ALLOWED_METHODS', default='GET,HEAD', cast=Csv(str.upper))
+BATCH_MAX_REQUESTS = config('BATCH_MAX_REQUESTS', default=20, cast=int)
+# GET /api/sync (ruang/sync.py): maksimal perubahan per respons, dan umur
+# minimal baris log sebelum dikirim (transaksi lain yang belum commit)
+SYNC_MAX_CHANGES = config('SYNC_MAX_CHANGES', default=500, cast=int)
+SYNC_SETTLE_SECONDS = config('SYNC_SETTLE_SECONDS', default=2.0, cast=float)
 
 AUTH_PASSWORD_VALIDATORS = [
     # {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',},
@@ -77,6 +99,48 @@ DATABASES = {
         'PASSWORD': config('DB_PASSWORD', default=''),
         'HOST': config('DB_HOST', default=''),
         'PORT': config('DB_PORT', default=''),
+        # Koneksi persisten: dipakai ulang antar request selama N detik (0 = tutup tiap request)
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=60, cast=int),
+        # Cek koneksi persisten masih hidup sebelum dipakai di request berikutnya
+        'CONN_HEALTH_CHECKS': config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
+    }
+}
+
+# Connection pool bawaan Django untuk PostgreSQL (butuh psycopg 3 + psycopg-pool,
+# bukan psycopg2). Pool menggantikan koneksi persisten, jadi CONN_MAX_AGE harus 0.
+if config('DB_POOL', default=False, cast=bool):
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+            'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+            'timeout': config('DB_POOL_TIMEOUT', default=10, cast=int),
+        }
+    }
+
+# READ REPLICA
+# Host replica dipisah koma; tiap replica memakai konfigurasi 'default' dengan
+# HOST diganti (untuk SQLite nilainya dipakai sebagai NAME/path file).
+# Request GET/HEAD/OPTIONS ke app di REPLICA_APPS dibaca dari replica.
+# Butuh CACHE_BACKEND yang dibagi antar worker (pin read-your-writes).
+for index, replica_host in enumerate(config('DB_REPLICA_HOSTS', default='', cast=Csv()), start=1):
+    replica = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+    replica['NAME' if 'sqlite3' in replica['ENGINE'] else 'HOST'] = replica_host
+    DATABASES[f'replica_{index}'] = replica
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['siruinsk.utils.replicas.ReplicaRouter']
+REPLICA_APPS = ['ruang', 'profil']
+# Lama klien dibaca dari primary setelah menulis (read-your-writes)
+REPLICA_STICKY_SECONDS = config('DB_REPLICA_STICKY_SECONDS', default=10, cast=int)
+
+# CACHE
+# Default LocMemCache hanya berlaku per proses worker. Untuk produksi dengan
+# beberapa worker gunicorn, arahkan ke cache server (Redis/Memcached).
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default=''),
     }
 }
 
@@ -102,6 +166,25 @@ EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD')
 EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=True, cast=bool)
 
 
+# Renderer/parser JSON: "orjson" (siruinsk/utils/fastjson.py, otomatis kembali
+# ke json stdlib jika paket orjson tidak terpasang) atau "stdlib" (bawaan DRF)
+JSON_BACKEND = config('JSON_BACKEND', default='orjson')
+JSON_RENDERER_CLASS, JSON_PARSER_CLASS = {
+    'orjson': ('siruinsk.utils.fastjson.FastJSONRenderer', 'siruinsk.utils.fastjson.FastJSONParser'),
+    'stdlib': ('siruinsk.utils.fastjson.StdlibJSONRenderer', 'rest_framework.parsers.JSONParser'),
+}[JSON_BACKEND]
+
+# Format respons tambahan lewat negosiasi konten (Accept atau ?format=), JSON
+# tetap default: "msgpack" (hanya jika paket msgpack terpasang) dan "columnar"
+# (JSON kolumnar untuk respons list), lihat siruinsk/utils/compact_formats.py
+API_EXTRA_FORMATS = config('API_EXTRA_FORMATS', default='msgpack,columnar', cast=Csv())
+API_RENDERER_CLASSES, API_PARSER_CLASSES = [JSON_RENDERER_CLASS], [JSON_PARSER_CLASS]
+if 'columnar' in API_EXTRA_FORMATS:
+    API_RENDERER_CLASSES.append('siruinsk.utils.compact_formats.ColumnarJSONRenderer')
+if 'msgpack' in API_EXTRA_FORMATS and find_spec('msgpack') is not None:
+    API_RENDERER_CLASSES.append('siruinsk.utils.compact_formats.MessagePackRenderer')
+    API_PARSER_CLASSES.append('siruinsk.utils.compact_formats.MessagePackParser')
+
 # Konfigurasi REST_FRAMEWORK umum
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
@@ -113,10 +196,35 @@ REST_FRAMEWORK = {
     ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
-    "DEFAULT_RENDERER_CLASSES": ("rest_framework.renderers.JSONRenderer",),
+    "DEFAULT_RENDERER_CLASSES": API_RENDERER_CLASSES,
+    "DEFAULT_PARSER_CLASSES": (
+        *API_PARSER_CLASSES,
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
     "EXCEPTION_HANDLER": "rest_framework.views.exception_handler",
+    # Rate token bucket per endpoint autentikasi, format "jumlah/periode"
+    "DEFAULT_THROTTLE_RATES": {
+        "login_ip": config("THROTTLE_LOGIN_IP_RATE", default="20/min"),
+        "login_identifier": config("THROTTLE_LOGIN_IDENTIFIER_RATE", default="5/min"),
+        "register_ip": config("THROTTLE_REGISTER_IP_RATE", default="10/hour"),
+        "reset_password_ip": config("THROTTLE_RESET_PASSWORD_IP_RATE", default="5/hour"),
+        "reset_password_identifier": config("THROTTLE_RESET_PASSWORD_IDENTIFIER_RATE", default="3/hour"),
+    },
+    # 0 = identitas klien dari REMOTE_ADDR; X-Forwarded-For hanya dibaca jika
+    # diisi jumlah reverse proxy tepercaya di depan aplikasi
+    "NUM_PROXIES": config("NUM_PROXIES", default=0, cast=int),
 }
 
+# Penyimpanan state token bucket yang dibagi antar worker:
+# "cache" memakai CACHES['default'], "sqlite" memakai file lokal,
+# "auto" memilih sqlite jika cache hanya per proses (LocMem/Dummy).
+THROTTLE_STORE = config("THROTTLE_STORE", default="auto")
+THROTTLE_SQLITE_PATH = config("THROTTLE_SQLITE_PATH", default=str(BASE_DIR / "throttle.sqlite3"))
+
+# `manage.py test` memakai direktori sementara untuk file state di atas
+TEST_RUNNER = "siruinsk.utils.test_runner.TestRunner"
+
 
 # JWT Settings
 SIMPLE_JWT = {
@@ -129,7 +237,7 @@ SIMPLE_JWT = {
 }
 
 # CORS Header tambahan
-CORS_ALLOW_HEADERS = list(default_headers) + ["Authorization"]
+CORS_ALLOW_HEADERS = list(default_headers) + ["Authorization", "X-Profile"]
 CSRF_TRUSTED_ORIGINS = [
     f"{'http' if DEBUG else 'https'}://{host}"
     for host in ALLOWED_HOSTS if host
@@ -139,8 +247,84 @@ CORS_ALLOWED_ORIGINS = config('CORS_ALLOWED_ORIGINS', default='', cast=Csv())
 SECURE_BROWSER_XSS_FILTER = config('SECURE_BROWSER_XSS_FILTER', default=True, cast=bool)
 SECURE_CONTENT_TYPE_NOSNIFF = config('SECURE_CONTENT_TYPE_NOSNIFF', default=True, cast=bool)
 SECURE_SSL_REDIRECT = config('SECURE_SSL_REDIRECT', default=True, cast=bool)
+# Di-scrape/di-probe lewat jaringan internal tanpa TLS
+SECURE_REDIRECT_EXEMPT = [r'^metrics$', r'^health/']
 SESSION_COOKIE_SECURE = config('SESSION_COOKIE_SECURE', default=True, cast=bool)
 CSRF_COOKIE_SECURE = config('CSRF_COOKIE_SECURE', default=True, cast=bool)
 CORS_ALLOW_ALL_ORIGINS = config('CORS_ALLOW_ALL_ORIGINS', default=False, cast=bool)
 CORS_ALLOW_CREDENTIALS = True
-SESSION_COOKIE_NAME = 'sir_uinsk'
\ No newline at end of file
+SESSION_COOKIE_NAME = 'sir_uinsk'
+# Worker lokal untuk pekerjaan di luar jalur request (siruinsk/utils/tasks.py)
+BACKGROUND_TASK_WORKERS = config('BACKGROUND_TASK_WORKERS', default=2, cast=int)
+BACKGROUND_TASKS_EAGER = config('BACKGROUND_TASKS_EAGER', default=False, cast=bool)
+
+# Gambar profil (profil/images.py)
+PROFILE_IMAGE_MAX_UPLOAD_SIZE = config('PROFILE_IMAGE_MAX_UPLOAD_SIZE', default=15 * 1024 * 1024, cast=int)
+PROFILE_IMAGE_MAX_PIXELS = config('PROFILE_IMAGE_MAX_PIXELS', default=50_000_000, cast=int)
+PROFILE_IMAGE_MAX_DIMENSION = config('PROFILE_IMAGE_MAX_DIMENSION', default=2048, cast=int)
+PROFILE_IMAGE_RENDITION_SIZES = config('PROFILE_IMAGE_RENDITION_SIZES', default='64,256,1024', cast=Csv(int))
+
+# Cache GET /api/profile/me per user (profil/cache.py): "auto" hanya jika
+# CACHES['default'] dibagi antar worker (bukan LocMem/Dummy), "on" selalu, "off" tidak pernah
+PROFILE_CACHE = config('PROFILE_CACHE', default='auto')
+# Lama cache GET /api/profile/me per user (detik), dihapus otomatis saat profil berubah
+PROFILE_CACHE_TIMEOUT = config('PROFILE_CACHE_TIMEOUT', default=300, cast=int)
+
+# Instrumentasi SQL per request: header Server-Timing + log JSON (siruinsk/utils/instrumentation.py)
+QUERY_INSTRUMENTATION = config('QUERY_INSTRUMENTATION', default=False, cast=bool)
+# Porsi request yang diukur (0.0 - 1.0)
+QUERY_INSTRUMENTATION_SAMPLE_RATE = config('QUERY_INSTRUMENTATION_SAMPLE_RATE', default=0.05, cast=float)
+# Jumlah query paling lambat yang ikut di log
+QUERY_INSTRUMENTATION_SLOWEST = config('QUERY_INSTRUMENTATION_SLOWEST', default=3, cast=int)
+
+# Slow query log + EXPLAIN per fingerprint, dibaca staff di /api/slow-queries
+SLOW_QUERY_LOG = config('SLOW_QUERY_LOG', default=False, cast=bool)
+SLOW_QUERY_THRESHOLD_MS = config('SLOW_QUERY_THRESHOLD_MS', default=200, cast=float)
+SLOW_QUERY_EXPLAIN = config('SLOW_QUERY_EXPLAIN', default=True, cast=bool)
+# Lama ringkasan disimpan di cache (detik)
+SLOW_QUERY_RETENTION = config('SLOW_QUERY_RETENTION', default=86400, cast=int)
+
+# Profiling per request untuk staff, token dari POST /api/profiling/token (siruinsk/utils/profiling.py)
+PROFILING_ENABLED = config('PROFILING_ENABLED', default=False, cast=bool)
+PROFILING_TOKEN_MAX_AGE = config('PROFILING_TOKEN_MAX_AGE', default=600, cast=int)
+# Interval sampling profiler di worker ASGI (detik)
+PROFILING_SAMPLE_INTERVAL = config('PROFILING_SAMPLE_INTERVAL', default=0.001, cast=float)
+# Lama dan jumlah maksimum profil yang disimpan di cache
+PROFILING_RETENTION = config('PROFILING_RETENTION', default=3600, cast=int)
+PROFILING_MAX_STORED = config('PROFILING_MAX_STORED', default=50, cast=int)
+
+# Schema OpenAPI hasil `manage.py generate_schema` (saat build image); jika file
+# tidak ada, schema dibangun sekali saat pertama diminta (siruinsk/utils/schema.py)
+OPENAPI_SCHEMA_FILE = config('OPENAPI_SCHEMA_FILE', default=str(BASE_DIR / 'openapi.json'))
+
+# Metrik Prometheus di /metrics, digabung antar worker lewat file mmap (siruinsk/utils/metrics.py)
+METRICS_ENABLED = config('METRICS_ENABLED', default=True, cast=bool)
+# Harus sama untuk semua worker; gunicorn.conf.py mengosongkannya saat start
+METRICS_DIR = config('METRICS_DIR', default=os.path.join(tempfile.gettempdir(), 'siruinsk_metrics'))
+# Bearer token untuk scraper; kosong = endpoint /metrics nonaktif (404)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# Probe /health/live dan /health/ready (siruinsk/utils/health.py)
+# Batas waktu tiap cek dependensi (detik)
+HEALTH_CHECK_TIMEOUT = config('HEALTH_CHECK_TIMEOUT', default=1.0, cast=float)
+# Lama hasil readiness dipakai ulang per proses (detik)
+HEALTH_CACHE_TTL = config('HEALTH_CACHE_TTL', default=5.0, cast=float)
+# Readiness gagal jika pekerjaan background yang antre melebihi ini
+HEALTH_MAX_PENDING_TASKS = config('HEALTH_MAX_PENDING_TASKS', default=100, cast=int)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'simple': {'format': '%(asctime)s %(levelname)s %(name)s %(message)s'},
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': 'simple'},
+    },
+    'loggers': {
+        'siruinsk': {
+            'handlers': ['console'],
+            'level': config('LOG_LEVEL', default='INFO'),
+        },
+    },
+}
@@ -1,9 +1,51 @@
-from django.test import TestCase
+from django.conf import settings
+from django.core import signing
+from django.core.management import call_command
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, connection, router
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from django.test import AsyncClient, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import include, path
 from django.contrib.auth.models import User
+from asgiref.sync import async_to_sync, sync_to_async
 from rest_framework.test import APIClient, APITestCase
-from rest_framework import status
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework import serializers, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+import datetime
+import decimal
+import io
 import json
+import marshal
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import uuid
+from contextvars import copy_context
+from unittest import mock, skipUnless
+
+from profil import urls as profil_urls
+from profil.models import UserProfile
+from ruang import urls as ruang_urls
+from ruang.models import Location, Room
+from ruang.views import conflicting_reservations
+from .serializers import RegistrationSerializer
+from . import urls as siruinsk_urls
+from .async_views import BatchAsyncView
+from .utils import (
+    batch, compact_formats, fastjson, health, instrumentation, metrics, profiling, query_budget, schema,
+    slow_queries, warmup,
+)
+from .utils.query_budget import EndpointBudget
+from .utils.replicas import ReplicaRoutingMiddleware
+from .utils.throttling import get_bucket_store, SQLiteBucketStore
 
 
 class RegistrationViewTest(APITestCase):
@@ -489,4 +531,1135 @@ class AuthIntegrationTest(APITestCase):
         
         # Note: Access token masih valid sampai expire
         # Tapi refresh token sudah di-blacklist
-        # Jadi user tidak bisa mendapatkan access token baru
\ No newline at end of file
+        # Jadi user tidak bisa mendapatkan access token baru
+
+@override_settings(THROTTLE_STORE='cache')
+class AuthThrottleTest(APITestCase):
+    """Test token bucket throttle pada endpoint autentikasi"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.login_url = '/api/login'
+        get_bucket_store().clear()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+
+    def tearDown(self):
+        get_bucket_store().clear()
+
+    def test_login_throttled_per_identifier(self):
+        """Identifier yang sama ditolak setelah bucket habis, sebelum cek password"""
+        data = {'username': 'testuser', 'password': 'wrongpassword'}
+        rates = api_settings.DEFAULT_THROTTLE_RATES
+        capacity = int(rates['login_identifier'].split('/')[0])
+        for _ in range(capacity):
+            response = self.client.post(self.login_url, data)
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        with self.assertNumQueries(0):
+            response = self.client.post(self.login_url, data)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+
+        # Identifier lain masih punya bucket sendiri
+        response = self.client.post(self.login_url, {'username': 'other', 'password': 'x'})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_login_throttled_per_ip(self):
+        """Satu IP dengan banyak identifier tetap dibatasi"""
+        rates = api_settings.DEFAULT_THROTTLE_RATES
+        capacity = int(rates['login_ip'].split('/')[0])
+        for i in range(capacity):
+            self.client.post(self.login_url, {'username': f'user{i}', 'password': 'x'})
+        response = self.client.post(self.login_url, {'username': 'fresh', 'password': 'x'})
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        response = self.client.post(
+            self.login_url, {'username': 'fresh', 'password': 'x'}, REMOTE_ADDR='10.0.0.2'
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_spoofed_forwarded_for_shares_bucket(self):
+        """X-Forwarded-For dari klien tidak memberi bucket IP baru"""
+        rates = api_settings.DEFAULT_THROTTLE_RATES
+        capacity = int(rates['login_ip'].split('/')[0])
+        for i in range(capacity):
+            self.client.post(
+                self.login_url, {'username': f'user{i}', 'password': 'x'},
+                HTTP_X_FORWARDED_FOR=f'192.0.2.{i}'
+            )
+        response = self.client.post(
+            self.login_url, {'username': 'fresh', 'password': 'x'},
+            HTTP_X_FORWARDED_FOR='198.51.100.7'
+        )
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_bucket_refills_over_time(self):
+        """Token terisi kembali sesuai rate"""
+        store = get_bucket_store()
+        allowed, _ = store.consume('refill', 1, 1.0, now=100.0)
+        self.assertTrue(allowed)
+        allowed, _ = store.consume('refill', 1, 1.0, now=100.5)
+        self.assertFalse(allowed)
+        allowed, _ = store.consume('refill', 1, 1.0, now=101.6)
+        self.assertTrue(allowed)
+
+    def test_sqlite_store_shared_between_instances(self):
+        """Store SQLite dipakai bersama oleh beberapa proses lewat satu file"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'throttle.sqlite3')
+            first, second = SQLiteBucketStore(path), SQLiteBucketStore(path)
+            self.assertTrue(first.consume('shared', 1, 0.01, now=10.0)[0])
+            self.assertFalse(second.consume('shared', 1, 0.01, now=10.0)[0])
+
+
+@override_settings(THROTTLE_STORE='cache')
+class RegistrationUniquenessTest(APITestCase):
+    """Test cek keunikan username/email pada registrasi"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.registration_url = '/api/register'
+        get_bucket_store().clear()
+        User.objects.create_user(
+            username='existing',
+            email='Existing@Example.com',
+            password='testpass123'
+        )
+        self.data = {
+            'username': 'newuser',
+            'email': 'newuser@example.com',
+            'password1': 'strongpassword123',
+            'password2': 'strongpassword123',
+            'first_name': 'John',
+            'last_name': 'Doe'
+        }
+
+    def test_registration_creates_user_and_profile(self):
+        """Registrasi membuat user beserta profilnya"""
+        response = self.client.post(self.registration_url, self.data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        user = User.objects.get(username='newuser')
+        self.assertTrue(UserProfile.objects.filter(user=user).exists())
+
+    def test_uniqueness_checked_in_single_query(self):
+        """Username dan email dicek dalam satu query ke auth_user"""
+        serializer = RegistrationSerializer(data=self.data)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+    def test_duplicate_username_case_insensitive(self):
+        """Username yang sama dengan huruf berbeda ditolak"""
+        self.data['username'] = 'EXISTING'
+        response = self.client.post(self.registration_url, self.data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['username'], ['Username ini sudah terdaftar.'])
+
+    def test_duplicate_email_case_insensitive(self):
+        """Email yang sama dengan huruf berbeda ditolak"""
+        self.data['email'] = 'existing@example.COM'
+        response = self.client.post(self.registration_url, self.data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['email'], ['Email ini sudah terdaftar.'])
+
+    def test_integrity_error_maps_to_field_error(self):
+        """Registrasi bersamaan yang lolos validasi ditangkap index unik"""
+        serializer = RegistrationSerializer(data=self.data)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        User.objects.create_user(username='other', email='NEWUSER@example.com')
+        with self.assertRaises(ValidationError) as ctx:
+            serializer.save()
+        self.assertEqual(ctx.exception.detail['email'], ['Email ini sudah terdaftar.'])
+        self.assertFalse(User.objects.filter(username='newuser').exists())
+
+    def test_integrity_error_on_username_index(self):
+        """Bentrok index LOWER(username) dipetakan ke field username"""
+        serializer = RegistrationSerializer(data=self.data)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        User.objects.create_user(username='NewUser', email='other@example.com')
+        with self.assertRaises(ValidationError) as ctx:
+            serializer.save()
+        self.assertEqual(ctx.exception.detail['username'], ['Username ini sudah terdaftar.'])
+
+    def test_unrecognised_integrity_error_is_raised(self):
+        """IntegrityError selain index unik user tidak disamarkan sebagai bentrok username/email"""
+        serializer = RegistrationSerializer(data=self.data)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        error = IntegrityError('NOT NULL constraint failed: profil_userprofile.user_id')
+        with mock.patch.object(User.objects, 'create_user', side_effect=error):
+            with self.assertRaises(IntegrityError):
+                serializer.save()
+
+
+@override_settings(DATABASE_REPLICAS=['replica_1'])
+class ReplicaRoutingTest(TestCase):
+    """Routing baca ke replica oleh ReplicaRoutingMiddleware + ReplicaRouter"""
+
+    def setUp(self):
+        # Pin read-your-writes butuh cache yang dibagi antar proses
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        overrides = override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': directory.name,
+        }})
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.factory = RequestFactory()
+        self.routed = {}
+
+    def auth(self, user_id):
+        token = AccessToken.for_user(User(pk=user_id))
+        return {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+
+    def view(self, status_code=200):
+        def get_response(request):
+            now = timezone.now()
+            self.routed = {
+                'room': router.db_for_read(Room),
+                'profile': router.db_for_read(UserProfile),
+                'user': router.db_for_read(User),
+                'write': router.db_for_write(Room),
+                'conflict': conflicting_reservations(1, now, now).db,
+            }
+            return HttpResponse(status=status_code)
+        return ReplicaRoutingMiddleware(get_response)
+
+    def test_get_reads_from_replica(self):
+        """GET ke app ruang/profil dibaca dari replica, auth dan penulisan tetap ke primary"""
+        self.view()(self.factory.get('/api/rooms/'))
+        self.assertEqual(self.routed['room'], 'replica_1')
+        self.assertEqual(self.routed['profile'], 'replica_1')
+        self.assertEqual(self.routed['user'], DEFAULT_DB_ALIAS)
+        self.assertEqual(self.routed['write'], DEFAULT_DB_ALIAS)
+
+    def test_conflict_check_on_primary(self):
+        """Cek bentrok reservasi tidak pernah dibaca dari replica"""
+        self.view()(self.factory.get('/api/rooms/1/availability/'))
+        self.assertEqual(self.routed['conflict'], DEFAULT_DB_ALIAS)
+
+    def test_write_pins_client_to_primary(self):
+        """Setelah menulis, GET dari user yang sama dibaca dari primary"""
+        self.view()(self.factory.post('/api/reservations/', **self.auth(1)))
+        self.assertEqual(self.routed['room'], DEFAULT_DB_ALIAS)
+
+        self.view()(self.factory.get('/api/reservations/', **self.auth(1)))
+        self.assertEqual(self.routed['room'], DEFAULT_DB_ALIAS)
+
+        self.view()(self.factory.get('/api/reservations/', **self.auth(2)))
+        self.assertEqual(self.routed['room'], 'replica_1')
+
+    def test_pin_survives_token_refresh(self):
+        """Pin mengikuti id user, bukan isi header: access token baru tetap dibaca dari primary"""
+        writer = self.auth(1)
+        self.view()(self.factory.post('/api/reservations/', **writer))
+        refreshed = self.auth(1)
+        self.assertNotEqual(refreshed, writer)
+        self.view()(self.factory.get('/api/reservations/', **refreshed))
+        self.assertEqual(self.routed['room'], DEFAULT_DB_ALIAS)
+
+    def test_anonymous_pinned_by_ip(self):
+        """Tanpa JWT yang valid klien dikenali dari REMOTE_ADDR"""
+        self.view()(self.factory.post('/api/register', REMOTE_ADDR='10.0.0.1'))
+        self.view()(self.factory.get('/api/rooms/', REMOTE_ADDR='10.0.0.1', HTTP_AUTHORIZATION='Bearer palsu'))
+        self.assertEqual(self.routed['room'], DEFAULT_DB_ALIAS)
+        self.view()(self.factory.get('/api/rooms/', REMOTE_ADDR='10.0.0.2'))
+        self.assertEqual(self.routed['room'], 'replica_1')
+
+    def test_failed_write_does_not_pin(self):
+        """Request tulis yang gagal tidak mengubah data, jadi tidak di-pin"""
+        auth = self.auth(1)
+        self.view(status_code=400)(self.factory.post('/api/reservations/', **auth))
+        self.view()(self.factory.get('/api/reservations/', **auth))
+        self.assertEqual(self.routed['room'], 'replica_1')
+
+    def test_read_only_post_does_not_pin(self):
+        """POST yang hanya membaca (batch GET) tidak mem-pin klien ke primary"""
+        auth = self.auth(1)
+        request = self.factory.post('/api/batch', **auth)
+        request.replica_read_only = True
+        self.view()(request)
+        self.view()(self.factory.get('/api/reservations/', **auth))
+        self.assertEqual(self.routed['room'], 'replica_1')
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas_configured(self):
+        self.view()(self.factory.get('/api/rooms/'))
+        self.assertEqual(self.routed['room'], DEFAULT_DB_ALIAS)
+
+    def test_process_local_pin_cache_rejected(self):
+        """Replica dengan cache LocMem ditolak saat start: pin tidak terlihat oleh worker lain"""
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            with self.assertRaises(ImproperlyConfigured):
+                self.view()
+
+    async def test_async_middleware(self):
+        """Di mode ASGI alias replica tetap terlihat oleh view sync yang dijalankan di thread"""
+        async def get_response(request):
+            self.routed['room'] = await sync_to_async(router.db_for_read)(Room)
+            return HttpResponse()
+
+        await ReplicaRoutingMiddleware(get_response)(self.factory.get('/api/rooms/'))
+        self.assertEqual(self.routed['room'], 'replica_1')
+
+
+class ReplicaSQLiteTest(SimpleTestCase):
+    """
+    Routing end-to-end dengan replica SQLite sungguhan (file terpisah) di proses
+    baru, karena alias database tidak bisa ditambahkan setelah Django start
+    """
+    script = """
+import json, shutil, django
+django.setup()
+from django.test.utils import setup_test_environment
+setup_test_environment()
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connections
+from django.test import Client
+from rest_framework_simplejwt.tokens import RefreshToken
+from ruang.models import Location
+
+call_command('migrate', verbosity=0)
+staff = User.objects.create_user(username='staff', password='x', is_staff=True)
+other = User.objects.create_user(username='other', password='x')
+connections.close_all()
+# Snapshot primary sebagai replica; baris setelah ini belum tereplikasi
+shutil.copy(settings.DATABASES['default']['NAME'], settings.DATABASES['replica_1']['NAME'])
+Location.objects.create(name='Hanya di primary', address='-')
+
+def client(user):
+    return Client(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+
+def names(client):
+    return [row['name'] for row in client.get('/api/locations/').json()['results']]
+
+writer, reader = client(staff), client(other)
+result = {'before_write': names(writer)}
+result['write_status'] = writer.post(
+    '/api/locations/', {'name': 'Baru', 'address': '-'}, content_type='application/json'
+).status_code
+result['after_write'] = names(writer)
+# Access token baru (refresh) untuk user yang sama tetap di-pin
+result['after_refresh'] = names(client(staff))
+result['other_client'] = names(reader)
+print(json.dumps(result))
+"""
+
+    def test_reads_from_replica_and_read_your_writes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(
+                os.environ, DJANGO_SETTINGS_MODULE='siruinsk.settings', SECURE_SSL_REDIRECT='False',
+                DB_ENGINE='django.db.backends.sqlite3', DB_POOL='False', METRICS_ENABLED='False',
+                DB_NAME=os.path.join(tmp, 'primary.sqlite3'), DB_REPLICA_HOSTS=os.path.join(tmp, 'replica.sqlite3'),
+                CACHE_BACKEND='django.core.cache.backends.filebased.FileBasedCache',
+                CACHE_LOCATION=os.path.join(tmp, 'cache'), THROTTLE_SQLITE_PATH=os.path.join(tmp, 'throttle.sqlite3'),
+            )
+            result = subprocess.run(
+                [sys.executable, '-c', self.script], env=env, cwd=settings.BASE_DIR, capture_output=True, text=True,
+            )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        result = json.loads(result.stdout.strip().splitlines()[-1])
+        # Baca pertama dari replica: baris yang belum tereplikasi tidak terlihat
+        self.assertEqual(result['before_write'], [])
+        self.assertEqual(result['write_status'], status.HTTP_201_CREATED)
+        # Setelah menulis klien di-pin ke primary dan melihat kedua baris
+        self.assertCountEqual(result['after_write'], ['Hanya di primary', 'Baru'])
+        self.assertCountEqual(result['after_refresh'], ['Hanya di primary', 'Baru'])
+        # Klien lain tetap membaca replica
+        self.assertEqual(result['other_client'], [])
+
+
+@override_settings(QUERY_INSTRUMENTATION=True, QUERY_INSTRUMENTATION_SAMPLE_RATE=1.0)
+class QueryInstrumentationTest(APITestCase):
+    """Header Server-Timing dan log JSON dari QueryInstrumentationMiddleware"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='timing', password='pass12345')
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_server_timing_and_log(self):
+        Location.objects.create(name='Gedung A', address='Jl. A')
+        with self.assertLogs('siruinsk.instrumentation', level='INFO') as logs:
+            response = self.client.get('/api/locations/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        summary = json.loads(logs.records[0].getMessage())
+        self.assertEqual(summary['path'], '/api/locations/')
+        self.assertEqual(summary['status'], 200)
+        self.assertGreater(summary['queries'], 0)
+        self.assertLessEqual(len(summary['slowest']), 3)
+
+        timing = response['Server-Timing']
+        self.assertIn(f'db;dur={summary["db_ms"]};desc="{summary["queries"]} queries"', timing)
+        for metric in ('serialize;dur=', 'render;dur=', 'app;dur=', 'total;dur='):
+            self.assertIn(metric, timing)
+        self.assertGreater(summary['serialize_ms'], 0)
+
+    def test_concurrent_serialization_recorded_separately(self):
+        """Serialisasi bersamaan dengan recorder yang sama (sub-request batch ASGI) tercatat masing-masing"""
+        barrier = threading.Barrier(2, timeout=5)
+
+        class WaitingSerializer(instrumentation.TimedSerializerMixin, serializers.Serializer):
+            name = serializers.SerializerMethodField()
+
+            def get_name(self, obj):
+                barrier.wait()
+                return obj
+
+        recorder = instrumentation.QueryRecorder()
+        token = instrumentation._recorder.set(recorder)
+        try:
+            threads = [
+                threading.Thread(target=copy_context().run, args=(lambda: WaitingSerializer('x').data,))
+                for _ in range(2)
+            ]
+        finally:
+            instrumentation._recorder.reset(token)
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(recorder.serialize_times), 2)
+
+    @override_settings(QUERY_INSTRUMENTATION_SAMPLE_RATE=0.0)
+    def test_not_sampled(self):
+        response = self.client.get('/api/locations/')
+        self.assertNotIn('Server-Timing', response)
+
+
+@override_settings(SLOW_QUERY_LOG=True, SLOW_QUERY_THRESHOLD_MS=0, BACKGROUND_TASKS_EAGER=True)
+class SlowQueryLogTest(APITestCase):
+    """Slow query log, EXPLAIN, dan endpoint /api/slow-queries"""
+
+    def setUp(self):
+        cache.clear()
+        self.staff = User.objects.create_user(username='staff', password='pass12345', is_staff=True)
+        token = RefreshToken.for_user(self.staff).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_fingerprint_ignores_literals_and_in_lists(self):
+        self.assertEqual(
+            slow_queries.fingerprint('SELECT * FROM t WHERE id IN (%s, %s) LIMIT 10 OFFSET 20'),
+            slow_queries.fingerprint('SELECT  *  FROM t WHERE id IN (%s) LIMIT 10 OFFSET 400'),
+        )
+        self.assertNotEqual(
+            slow_queries.fingerprint("SELECT * FROM t WHERE name = 'a'"),
+            slow_queries.fingerprint('SELECT * FROM u WHERE name = %s'),
+        )
+
+    def test_slow_queries_logged_and_aggregated(self):
+        with self.assertLogs('siruinsk.slow_query', level='WARNING') as logs:
+            self.client.get('/api/locations/')
+            self.client.get('/api/locations/')
+
+        event = json.loads(logs.records[-1].getMessage())
+        self.assertIn('/api/locations/', event['view'])
+        self.assertIn('fingerprint', event)
+
+        with self.settings(SLOW_QUERY_LOG=False):
+            response = self.client.get('/api/slow-queries')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        location_query = next(
+            entry for entry in response.data['queries'] if 'ruang_location' in entry['sql']
+        )
+        self.assertEqual(location_query['count'], 2)
+        self.assertTrue(location_query['explain'])
+
+        with self.settings(SLOW_QUERY_LOG=False):
+            self.client.delete('/api/slow-queries')
+            self.assertEqual(self.client.get('/api/slow-queries').data['queries'], [])
+
+    def test_param_values_not_stored(self):
+        """Nilai parameter (hash password, email) tidak masuk log maupun ringkasan"""
+        with self.assertLogs('siruinsk.slow_query', level='WARNING') as logs:
+            User.objects.filter(pk=self.staff.pk).update(
+                email='rahasia@example.com', password='pbkdf2_sha256$rahasia'
+            )
+        self.assertNotIn('rahasia', '\n'.join(logs.output))
+        event = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(event['param_types'], ['str', 'str', 'int'])
+
+        with self.settings(SLOW_QUERY_LOG=False):
+            response = self.client.get('/api/slow-queries')
+        self.assertNotIn('rahasia', json.dumps(response.data))
+
+    def test_staff_only(self):
+        user = User.objects.create_user(username='biasa', password='pass12345')
+        token = RefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        response = self.client.get('/api/slow-queries')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+@override_settings(PROFILING_ENABLED=True)
+class ProfilingTest(APITestCase):
+    """Profiling request opt-in untuk staff dan endpoint /api/profiling"""
+
+    def setUp(self):
+        cache.clear()
+        self.staff = User.objects.create_user(username='staff', password='pass12345', is_staff=True)
+        self.user = User.objects.create_user(username='biasa', password='pass12345')
+        self.staff_auth = f'Bearer {RefreshToken.for_user(self.staff).access_token}'
+        self.user_auth = f'Bearer {RefreshToken.for_user(self.user).access_token}'
+        self.client.credentials(HTTP_AUTHORIZATION=self.staff_auth)
+        self.token = self.client.post('/api/profiling/token').data['token']
+
+    def test_profile_via_header(self):
+        response = self.client.get('/api/locations/', HTTP_X_PROFILE=self.token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        profile_id = response['X-Profile-Id']
+
+        detail = self.client.get(f'/api/profiling/{profile_id}').data
+        self.assertEqual(detail['profiler'], 'cprofile')
+        self.assertEqual(detail['path'], '/api/locations/')
+        self.assertTrue(any('ruang_location' in query['sql'] for query in detail['sql']))
+        self.assertEqual(detail['queries'], len(detail['sql']))
+        self.assertIn('cumulative', detail['top'])
+
+        download = self.client.get(f'/api/profiling/{profile_id}/download')
+        self.assertIn(f'profile-{profile_id}.prof', download['Content-Disposition'])
+        self.assertIsInstance(marshal.loads(download.content), dict)
+
+        listing = self.client.get('/api/profiling').data['profiles']
+        self.assertEqual([entry['id'] for entry in listing], [profile_id])
+        self.client.delete('/api/profiling')
+        self.assertEqual(self.client.get('/api/profiling').data['profiles'], [])
+
+    def test_token_bound_to_issuing_staff(self):
+        """Token yang bocor tidak bisa dipakai klien lain, termasuk staff lain dan klien anonim"""
+        other_staff = User.objects.create_user(username='staff2', password='pass12345', is_staff=True)
+        for auth in (self.user_auth, f'Bearer {RefreshToken.for_user(other_staff).access_token}', None):
+            self.client.credentials(**({'HTTP_AUTHORIZATION': auth} if auth else {}))
+            response = self.client.get('/api/locations/', HTTP_X_PROFILE=self.token)
+            self.assertNotIn('X-Profile-Id', response)
+
+    def test_query_param_not_accepted(self):
+        """Token di query string akan tercatat di access log, jadi diabaikan"""
+        response = self.client.get('/api/locations/', {'_profile': self.token})
+        self.assertNotIn('X-Profile-Id', response)
+
+    def test_requests_without_valid_token_not_profiled(self):
+        forged = signing.dumps({'u': self.user.pk}, salt=profiling.SALT)
+        for token in (None, 'salah', forged):
+            headers = {'HTTP_X_PROFILE': token} if token else {}
+            response = self.client.get('/api/locations/', **headers)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('X-Profile-Id', response)
+
+        with self.settings(PROFILING_ENABLED=False):
+            response = self.client.get('/api/locations/', HTTP_X_PROFILE=self.token)
+        self.assertNotIn('X-Profile-Id', response)
+
+    @override_settings(PROFILING_TOKEN_MAX_AGE=-1)
+    def test_expired_token(self):
+        response = self.client.get('/api/locations/', HTTP_X_PROFILE=self.token)
+        self.assertNotIn('X-Profile-Id', response)
+
+    def test_staff_only(self):
+        self.client.credentials(HTTP_AUTHORIZATION=self.user_auth)
+        for method, url in (('post', '/api/profiling/token'), ('get', '/api/profiling')):
+            response = getattr(self.client, method)(url)
+            self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_sampling_profiler_under_asgi(self):
+        async def profiled_request():
+            client = AsyncClient()
+            return await client.get('/api/locations/', headers={
+                'Authorization': self.staff_auth, 'X-Profile': self.token,
+            })
+
+        response = async_to_sync(profiled_request)()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        detail = self.client.get(f'/api/profiling/{response["X-Profile-Id"]}').data
+        self.assertEqual(detail['profiler'], 'sampling')
+        self.assertTrue(any('ruang_location' in query['sql'] for query in detail['sql']))
+
+
+class MetricsTest(APITestCase):
+    """Metrik per view digabung antar proses dan endpoint /metrics"""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(lambda: metrics.clear_directory(directory))
+        overrides = override_settings(METRICS_DIR=directory, METRICS_TOKEN='rahasia')
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        cache.clear()
+
+        self.user = User.objects.create_user(username='metrik', password='pass12345')
+        self.auth = f'Bearer {RefreshToken.for_user(self.user).access_token}'
+
+    def scrape(self):
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer rahasia')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        return response.content.decode()
+
+    def test_request_metrics_per_view(self):
+        self.client.get('/api/locations/', HTTP_AUTHORIZATION=self.auth)
+        self.client.get('/api/locations/', HTTP_AUTHORIZATION=self.auth)
+        self.client.post('/api/login', {'username': 'metrik', 'password': 'salah'})
+        text = self.scrape()
+
+        self.assertIn('# TYPE siruinsk_http_request_duration_seconds histogram', text)
+        self.assertIn(
+            'siruinsk_http_requests_total{view="LocationViewSet.list",method="GET",status="200"} 2.0', text
+        )
+        self.assertIn('siruinsk_http_requests_total{view="LoginView",method="POST",status="401"} 1.0', text)
+        self.assertIn(
+            'siruinsk_http_request_duration_seconds_bucket{view="LocationViewSet.list",method="GET",le="+Inf"} 2.0',
+            text
+        )
+        self.assertIn('siruinsk_http_request_duration_seconds_count{view="LocationViewSet.list",method="GET"} 2.0', text)
+        self.assertIn('siruinsk_db_queries_total{view="LocationViewSet.list"}', text)
+        self.assertIn('siruinsk_db_query_duration_seconds_total{view="LocationViewSet.list"}', text)
+
+    @override_settings(PROFILE_CACHE='on')
+    def test_profile_cache_hit_rate(self):
+        self.client.get('/api/profile/me', HTTP_AUTHORIZATION=self.auth)
+        self.client.get('/api/profile/me', HTTP_AUTHORIZATION=self.auth)
+        text = self.scrape()
+        self.assertIn('siruinsk_cache_requests_total{cache="profile",result="miss"} 1.0', text)
+        self.assertIn('siruinsk_cache_requests_total{cache="profile",result="hit"} 1.0', text)
+
+    def test_aggregated_across_processes(self):
+        """Counter proses lain (termasuk yang sudah mati) dijumlahkan, gauge proses mati diabaikan"""
+        dead = subprocess.Popen(['true'])
+        dead.wait()
+        key = metrics._key('siruinsk_background_tasks_pending', ())
+        metrics.set_gauge('siruinsk_background_tasks_pending', 2)
+        metrics.MmapStore(os.path.join(settings.METRICS_DIR, f'gauge_{dead.pid}.db')).set(key, 5)
+
+        labels = (('cache', 'profile'), ('result', 'hit'))
+        metrics.inc('siruinsk_cache_requests_total', labels)
+        other = metrics.MmapStore(os.path.join(settings.METRICS_DIR, f'counter_{dead.pid}.db'))
+        other.add(metrics._key('siruinsk_cache_requests_total', labels), 3)
+
+        text = self.scrape()
+        self.assertIn('siruinsk_background_tasks_pending 2.0', text)
+        self.assertIn('siruinsk_cache_requests_total{cache="profile",result="hit"} 4.0', text)
+
+    def test_dead_worker_counters_folded(self):
+        """Counter worker yang keluar dipindah ke file agregat, total tidak berubah dan file tidak menumpuk"""
+        labels = (('cache', 'profile'), ('result', 'miss'))
+        key = metrics._key('siruinsk_cache_requests_total', labels)
+        for pid, amount in ((1000001, 2), (1000002, 3)):
+            worker = metrics.MmapStore(os.path.join(settings.METRICS_DIR, f'counter_{pid}.db'))
+            worker.add(key, amount)
+            worker.close()
+            metrics.MmapStore(os.path.join(settings.METRICS_DIR, f'gauge_{pid}.db')).close()
+            metrics.mark_process_dead(pid, settings.METRICS_DIR)
+
+        self.assertEqual(sorted(os.listdir(settings.METRICS_DIR)), ['.lock', metrics.AGGREGATE_FILE])
+        self.assertIn('siruinsk_cache_requests_total{cache="profile",result="miss"} 5.0', self.scrape())
+
+    def test_store_grows_and_reopens(self):
+        path = os.path.join(settings.METRICS_DIR, 'counter_1.db')
+        store = metrics.MmapStore(path)
+        for index in range(3000):
+            store.add(metrics._key('siruinsk_db_queries_total', (('view', f'view{index}'),)), index)
+        reopened = metrics.MmapStore(path)
+        reopened.add(metrics._key('siruinsk_db_queries_total', (('view', 'view2999'),)), 1)
+        self.assertIn('siruinsk_db_queries_total{view="view2999"} 3000.0', self.scrape())
+
+    def test_requires_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer salah')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        with self.settings(METRICS_TOKEN=''):
+            response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer ')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(HEALTH_CHECK_TIMEOUT=0.5, HEALTH_CACHE_TTL=60)
+class HealthCheckTest(TestCase):
+    """Probe liveness/readiness tanpa autentikasi, dengan batas waktu dan cache singkat"""
+
+    def setUp(self):
+        health.reset()
+        self.addCleanup(health.reset)
+
+    def test_live(self):
+        with self.assertNumQueries(0):
+            response = self.client.get('/health/live')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {'status': 'ok'})
+        self.assertEqual(response['Cache-Control'], 'no-store')
+
+    def test_ready_reports_latency(self):
+        response = self.client.get('/health/ready')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.json()
+        self.assertEqual(body['status'], 'ok')
+        self.assertEqual(set(body['checks']), {'database', 'cache', 'storage', 'tasks'})
+        for result in body['checks'].values():
+            self.assertEqual(result['status'], 'ok')
+            self.assertGreaterEqual(result['latency_ms'], 0)
+
+    def test_result_cached(self):
+        with mock.patch.object(health, 'run_checks', wraps=health.run_checks) as run_checks:
+            first = self.client.get('/health/ready').json()
+            second = self.client.get('/health/ready').json()
+        self.assertEqual(run_checks.call_count, 1)
+        self.assertFalse(first['cached'])
+        self.assertTrue(second['cached'])
+        self.assertEqual(first['checks'], second['checks'])
+
+    @override_settings(HEALTH_CACHE_TTL=0, HEALTH_MAX_PENDING_TASKS=5)
+    def test_backlog_not_ready(self):
+        with mock.patch.object(health.tasks, 'pending_count', return_value=6), \
+                self.assertLogs('siruinsk.utils.health', level='ERROR'):
+            response = self.client.get('/health/ready')
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        body = response.json()
+        self.assertEqual(body['status'], 'fail')
+        self.assertEqual(body['checks']['tasks']['status'], 'error')
+        self.assertEqual(body['checks']['database']['status'], 'ok')
+
+    @override_settings(HEALTH_CACHE_TTL=0)
+    def test_error_detail_logged_not_returned(self):
+        """Pesan error dependensi (host, driver) hanya masuk log server"""
+        def failing_storage():
+            raise OSError('mount /srv/media@10.0.0.5 tidak bisa diakses')
+
+        with mock.patch.object(health, 'check_storage', failing_storage), \
+                self.assertLogs('siruinsk.utils.health', level='ERROR') as logs:
+            response = self.client.get('/health/ready')
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(set(response.json()['checks']['storage']), {'status', 'latency_ms'})
+        self.assertNotIn(b'10.0.0.5', response.content)
+        self.assertIn('10.0.0.5', logs.output[0])
+
+    @override_settings(HEALTH_CACHE_TTL=0, HEALTH_CHECK_TIMEOUT=0.05)
+    def test_hung_dependency_times_out(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        calls = []
+
+        def hung_storage():
+            calls.append(1)
+            release.wait(5)
+
+        with mock.patch.object(health, 'check_storage', hung_storage), \
+                self.assertLogs('siruinsk.utils.health', level='ERROR'):
+            first = self.client.get('/health/ready')
+            second = self.client.get('/health/ready')
+        self.assertEqual(first.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(first.json()['checks']['storage']['status'], 'timeout')
+        self.assertEqual(second.json()['checks']['storage']['status'], 'timeout')
+        # Cek yang masih macet tidak dijalankan ulang
+        self.assertEqual(len(calls), 1)
+
+    def test_exempt_from_ssl_redirect(self):
+        with self.settings(SECURE_SSL_REDIRECT=True):
+            self.assertEqual(self.client.get('/health/live').status_code, status.HTTP_200_OK)
+            self.assertEqual(self.client.get('/health/ready').status_code, status.HTTP_200_OK)
+            self.assertEqual(self.client.get('/api/locations/').status_code, status.HTTP_301_MOVED_PERMANENTLY)
+
+
+class FastJSONTest(TestCase):
+    """Renderer/parser orjson menghasilkan keluaran yang sama dengan bawaan DRF"""
+
+    data = {
+        'results': [{
+            'id': 1,
+            'purpose': 'Rapat \u2028 himpunan — ruang 2',
+            'utc': datetime.datetime(2025, 1, 6, 1, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            'local': datetime.datetime(2025, 1, 6, 8, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=7))),
+            'date': datetime.date(2025, 1, 6),
+            'time': datetime.time(8, 30),
+            'price': decimal.Decimal('12.50'),
+            'duration': datetime.timedelta(hours=2),
+            'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'label': gettext_lazy('This field is required.'),
+            'errors': {0: [ValidationError('salah').detail[0]]},
+            'empty': None,
+        }],
+    }
+
+    def render(self, renderer_class, accepted_media_type=None):
+        return renderer_class().render(self.data, accepted_media_type, {})
+
+    def test_same_output_as_drf(self):
+        from rest_framework.renderers import JSONRenderer
+
+        self.assertEqual(self.render(fastjson.FastJSONRenderer), self.render(JSONRenderer))
+        self.assertEqual(
+            self.render(fastjson.FastJSONRenderer, 'application/json; indent=2'),
+            self.render(JSONRenderer, 'application/json; indent=2'),
+        )
+        self.assertIn(b'"2025-01-06T01:30:15.123456Z"', self.render(fastjson.FastJSONRenderer))
+        # Integer di luar 64 bit ditolak orjson, dirender ulang dengan json stdlib
+        self.assertEqual(fastjson.FastJSONRenderer().render({'huge': 2 ** 70}), b'{"huge":1180591620717411303424}')
+
+    def test_stdlib_fallback(self):
+        from rest_framework.renderers import JSONRenderer
+
+        expected = self.render(JSONRenderer)
+        with mock.patch.object(fastjson, 'orjson', None):
+            self.assertEqual(self.render(fastjson.FastJSONRenderer), expected)
+            self.assertEqual(fastjson.FastJSONParser().parse(io.BytesIO(b'{"a": [1]}')), {'a': [1]})
+
+    def test_parser(self):
+        from rest_framework.exceptions import ParseError
+        from rest_framework.parsers import JSONParser
+
+        parser = fastjson.FastJSONParser()
+        body = '{"purpose": "Rapat — ruang 2", "capacity": 30, "huge": %d}' % 2 ** 70
+        self.assertEqual(parser.parse(io.BytesIO(body.encode())), JSONParser().parse(io.BytesIO(body.encode())))
+        latin = parser.parse(io.BytesIO('{"a": "é"}'.encode('latin-1')), parser_context={'encoding': 'latin-1'})
+        self.assertEqual(latin, {'a': 'é'})
+        with self.assertRaisesMessage(ParseError, 'JSON parse error'):
+            parser.parse(io.BytesIO(b'{"a": NaN}'))
+
+    def test_api_uses_configured_backend(self):
+        user = User.objects.create_user(username='json', password='pass12345')
+        response = self.client.post(
+            '/api/login', json.dumps({'username': 'json', 'password': 'pass12345'}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(response.accepted_renderer, fastjson.FastJSONRenderer)
+        self.assertEqual(response.json()['user']['username'], user.username)
+
+
+
+class CompactFormatTest(APITestCase):
+    """Format MessagePack dan JSON kolumnar berisi data yang sama dengan JSON"""
+
+    rows = [
+        {'id': 1, 'room_name': 'Ruang 101', 'status': 'PENDING', 'requester_username': 'a'},
+        {'id': 2, 'room_name': 'Ruang 101', 'status': 'APPROVED', 'requester_username': None},
+        {'id': 3, 'room_name': 'Ruang 102', 'status': 'PENDING'},
+        {'id': 4, 'room_name': 'Ruang 101', 'status': 'PENDING', 'requester_username': 'b'},
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        from ruang.models import Location
+
+        location = Location.objects.create(name='Gedung A')
+        Room.objects.bulk_create(
+            Room(name=f'Ruang {index}', location=location, capacity=20 + index) for index in range(5)
+        )
+        cls.user = User.objects.create_user(username='format', password='pass12345')
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_columnar_roundtrip(self):
+        data = compact_formats.to_columnar(self.rows)
+        self.assertEqual(data['columns'], ['id', 'room_name', 'status', 'requester_username'])
+        self.assertEqual(data['values'][1], [0, 0, 1, 0])
+        self.assertEqual(data['dictionaries'], {'room_name': ['Ruang 101', 'Ruang 102'], 'status': ['PENDING', 'APPROVED']})
+        # Field yang dilewati serializer menjadi null, string unik tidak di-encode
+        self.assertEqual(data['values'][3], ['a', None, None, 'b'])
+        decoded = compact_formats.decode_columnar(json.loads(json.dumps(data)))
+        self.assertEqual(decoded, [{'requester_username': None, **row} for row in self.rows])
+        self.assertEqual(compact_formats.decode_columnar(compact_formats.to_columnar([])), [])
+
+    def test_columnar_list_response(self):
+        expected = self.client.get('/api/rooms/').json()
+        response = self.client.get('/api/rooms/', HTTP_ACCEPT='application/vnd.siruinsk.columnar+json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/vnd.siruinsk.columnar+json')
+        self.assertIn('Accept', response['Vary'])
+        data = json.loads(response.content)
+        self.assertEqual(data['count'], expected['count'])
+        self.assertEqual(data['results']['dictionaries']['location_name'], ['Gedung A'])
+        self.assertEqual(compact_formats.decode_columnar(data['results']), expected['results'])
+        self.assertLess(len(response.content), len(json.dumps(expected, separators=(',', ':'))))
+
+    def test_columnar_other_responses_unchanged(self):
+        room = Room.objects.first()
+        expected = self.client.get(f'/api/rooms/{room.pk}/').content
+        response = self.client.get(f'/api/rooms/{room.pk}/', {'format': 'columnar'})
+        self.assertEqual(response.content, expected)
+        response = self.client.get('/api/rooms/', {'format': 'columnar', 'page': 99})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertIn('detail', json.loads(response.content))
+
+    @skipUnless(compact_formats.msgpack, 'msgpack tidak terpasang')
+    def test_msgpack_response(self):
+        expected = self.client.get('/api/rooms/').json()
+        response = self.client.get('/api/rooms/', HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(compact_formats.msgpack.unpackb(response.content), expected)
+        self.assertEqual(self.client.get('/api/rooms/', {'format': 'msgpack'}).content, response.content)
+        # Default tetap JSON, dan ikut membawa Vary: Accept untuk cache bersama
+        default = self.client.get('/api/rooms/', HTTP_ACCEPT='*/*')
+        self.assertEqual(default['Content-Type'], 'application/json')
+        self.assertIn('Accept', default['Vary'])
+
+    @skipUnless(compact_formats.msgpack, 'msgpack tidak terpasang')
+    def test_profile_etag_per_media_type(self):
+        """JSON dan msgpack /api/profile/me punya ETag berbeda, keduanya Vary: Accept"""
+        UserProfile.objects.get_or_create(user=self.user)
+        json_response = self.client.get('/api/profile/me')
+        packed = self.client.get('/api/profile/me', HTTP_ACCEPT='application/msgpack')
+        self.assertNotEqual(json_response['ETag'], packed['ETag'])
+        self.assertIn('Accept', json_response['Vary'])
+        revalidated = self.client.get(
+            '/api/profile/me', HTTP_ACCEPT='application/msgpack', HTTP_IF_NONE_MATCH=json_response['ETag']
+        )
+        self.assertEqual(revalidated.status_code, status.HTTP_200_OK)
+        revalidated = self.client.get(
+            '/api/profile/me', HTTP_ACCEPT='application/msgpack', HTTP_IF_NONE_MATCH=packed['ETag']
+        )
+        self.assertEqual(revalidated.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertIn('Accept', revalidated['Vary'])
+
+    @skipUnless(compact_formats.msgpack, 'msgpack tidak terpasang')
+    def test_msgpack_request_body(self):
+        from rest_framework.exceptions import ParseError
+
+        self.client.force_authenticate(None)
+        User.objects.create_user(username='packed', password='pass12345')
+        body = compact_formats.msgpack.packb({'username': 'packed', 'password': 'pass12345'})
+        response = self.client.post(
+            '/api/login', body, content_type='application/msgpack', HTTP_ACCEPT='application/msgpack',
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(compact_formats.msgpack.unpackb(response.content)['user']['username'], 'packed')
+        with self.assertRaisesMessage(ParseError, 'MessagePack parse error'):
+            compact_formats.MessagePackParser().parse(io.BytesIO(b'\xc1'))
+
+
+class BatchUrls:
+    """URLconf mode ASGI untuk test batch async"""
+    urlpatterns = [
+        path('api/batch', BatchAsyncView.as_view(), name='batch'),
+        path('api/', include(ruang_urls.get_async_urlpatterns())),
+        path('api/profile/', include(profil_urls.get_async_urlpatterns())),
+    ]
+
+
+class BatchTest(APITestCase):
+    """POST /api/batch menjalankan beberapa request API dalam satu round trip"""
+
+    requests = [
+        {'id': 'profil', 'path': '/api/profile/me'},
+        {'id': 'ruang', 'path': '/api/rooms/?fields=id,name'},
+        {'id': 'lokasi', 'method': 'get', 'path': '/api/locations/'},
+        {'id': 'hilang', 'path': '/api/tidak-ada/'},
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        from ruang.models import Location
+
+        cls.user = User.objects.create_user(username='batch', password='pass12345')
+        cls.staff = User.objects.create_user(username='batch_staff', password='pass12345', is_staff=True)
+        location = Location.objects.create(name='Gedung A')
+        cls.room = Room.objects.create(name='Ruang 101', location=location, capacity=30)
+
+    def setUp(self):
+        cache.clear()
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {RefreshToken.for_user(self.user).access_token}'}
+
+    def post(self, requests, **extra):
+        return self.client.post('/api/batch', {'requests': requests}, format='json', **{**self.auth, **extra})
+
+    def assert_responses(self, responses):
+        self.assertEqual([item['id'] for item in responses], ['profil', 'ruang', 'lokasi', 'hilang'])
+        self.assertEqual([item['status'] for item in responses], [200, 200, 200, 404])
+        self.assertEqual(responses[0]['body']['username'], 'batch')
+        self.assertIn('ETag', responses[0]['headers'])
+        self.assertEqual(responses[1]['body']['results'], [{'id': self.room.pk, 'name': 'Ruang 101'}])
+        self.assertEqual(responses[2]['body']['results'][0]['name'], 'Gedung A')
+
+    def test_read_batch(self):
+        from rest_framework_simplejwt.authentication import JWTAuthentication
+
+        with mock.patch.object(JWTAuthentication, 'authenticate', wraps=JWTAuthentication().authenticate) as jwt:
+            response = self.post(self.requests)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assert_responses(response.json()['responses'])
+        # Token hanya di-decode sekali untuk seluruh batch
+        self.assertEqual(jwt.call_count, 1)
+
+    def test_sub_request_permissions(self):
+        response = self.post([
+            {'path': '/api/locations/', 'method': 'GET'},
+            {'path': '/api/slow-queries'},
+            {'path': '/api/batch'},
+        ])
+        self.assertEqual([item['status'] for item in response.json()['responses']], [200, 403, 400])
+
+    def test_requires_authentication(self):
+        response = self.client.post('/api/batch', {'requests': self.requests}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_validation(self):
+        response = self.post([{'method': 'POST', 'path': '/api/locations/'}, {'path': '/admin/'}])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json(), {'requests': [
+            {'method': ['Metode POST tidak diizinkan dalam batch.']},
+            {'path': ['Path harus diawali /api/.']},
+        ]})
+        with self.settings(BATCH_MAX_REQUESTS=2):
+            response = self.post(self.requests)
+        self.assertEqual(response.json(), {'requests': ['Maksimal 2 request per batch.']})
+        self.assertEqual(self.post([]).status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(BATCH_ALLOWED_METHODS=['GET', 'POST'])
+    def test_writes_when_allowed(self):
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {RefreshToken.for_user(self.staff).access_token}'}
+        response = self.post([
+            {'id': 'baru', 'method': 'POST', 'path': '/api/locations/', 'body': {'name': 'Gedung B', 'address': 'Jl. B'}},
+            {'id': 'list', 'path': '/api/locations/?search=Gedung B'},
+        ])
+        responses = response.json()['responses']
+        self.assertEqual(responses[0]['status'], status.HTTP_201_CREATED)
+        # Dijalankan berurutan: sub-request berikutnya melihat hasil penulisan
+        self.assertEqual(responses[1]['body']['count'], 1)
+
+    @override_settings(ROOT_URLCONF=BatchUrls, ASGI_DB_THREADS=0)
+    async def test_async_batch(self):
+        """Mode ASGI: sub-request baca dijalankan bersamaan dengan hasil yang sama"""
+        with mock.patch.object(batch.asyncio, 'gather', wraps=batch.asyncio.gather) as gather:
+            response = await self.async_client.post(
+                '/api/batch', {'requests': self.requests}, content_type='application/json',
+                headers={'Authorization': self.auth['HTTP_AUTHORIZATION']},
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assert_responses(response.json()['responses'])
+        self.assertIn(len(self.requests), [len(call.args) for call in gather.call_args_list])
+
+@override_settings(OPENAPI_SCHEMA_FILE='')
+class OpenAPISchemaTest(APITestCase):
+    """Schema OpenAPI dibangun sekali dan drf_yasg dimuat saat dibutuhkan"""
+
+    def setUp(self):
+        schema.reset()
+        self.addCleanup(schema.reset)
+        self.staff = User.objects.create_user(username='staff', password='pass12345', is_staff=True)
+        self.client.force_login(self.staff)
+
+    def test_schema_generated_once(self):
+        with mock.patch.object(schema, 'generate', wraps=schema.generate) as generate:
+            first = self.client.get('/api/doc/', {'format': 'openapi'})
+            second = self.client.get('/api/redoc/', {'format': 'openapi'})
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(first['Content-Type'], 'application/openapi+json; charset=utf-8')
+        document = json.loads(first.content)
+        approve = document['paths']['/reservations/{id}/approve/']['patch']
+        body = next(param for param in approve['parameters'] if param['in'] == 'body')
+        self.assertEqual(body['schema'], {'$ref': '#/definitions/Reservation'})
+        self.assertEqual(approve['responses']['200']['schema'], {'$ref': '#/definitions/Reservation'})
+        listing = document['paths']['/reservations/']['get']['responses']['200']['schema']
+        self.assertEqual(listing['properties']['results']['items'], {'$ref': '#/definitions/Reservation'})
+        self.assertIn('status', document['definitions']['Reservation']['properties'])
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(generate.call_count, 1)
+
+    def test_sparse_fields_viewsets_in_schema(self):
+        """Viewset dengan SparseFieldsMixin tetap punya definisi saat schema dibangun tanpa request"""
+        document = json.loads(schema.generate())
+        for name in ('Location', 'Room', 'Reservation', 'Feedback'):
+            self.assertIn(name, document['definitions'])
+
+    def test_ui_page(self):
+        response = self.client.get('/api/doc/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(b'swagger-ui', response.content)
+
+    def test_precomputed_file(self):
+        path = os.path.join(tempfile.mkdtemp(), 'openapi.json')
+        self.addCleanup(os.remove, path)
+        call_command('generate_schema', output=path, stdout=open(os.devnull, 'w'))
+        with open(path, 'rb') as f:
+            content = f.read()
+        self.assertEqual(json.loads(content)['info']['title'], 'Teknohole API')
+
+        schema.reset()
+        with self.settings(OPENAPI_SCHEMA_FILE=path), mock.patch.object(schema, 'generate') as generate:
+            response = self.client.get('/api/doc/', {'format': 'openapi'})
+        self.assertEqual(response.content, content)
+        generate.assert_not_called()
+
+    def test_staff_only(self):
+        self.client.force_login(User.objects.create_user(username='biasa', password='pass12345'))
+        response = self.client.get('/api/doc/', {'format': 'openapi'})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_urls_do_not_import_drf_yasg_views(self):
+        code = (
+            "import sys, django; django.setup(); import siruinsk.urls; "
+            "sys.exit('drf_yasg.views' in sys.modules)"
+        )
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE='siruinsk.settings')
+        result = subprocess.run([sys.executable, '-c', code], env=env, cwd=settings.BASE_DIR)
+        self.assertEqual(result.returncode, 0)
+
+
+class WarmupTest(TestCase):
+    """Warmup worker gunicorn tidak menyentuh database dan hanya berjalan sekali"""
+
+    def setUp(self):
+        patcher = mock.patch.object(warmup, '_done', False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_no_queries_and_idempotent(self):
+        with self.assertNumQueries(0), self.assertLogs('siruinsk.utils.warmup', 'INFO') as logs:
+            warmup.run()
+            warmup.run()
+        self.assertEqual(len(logs.records), 1)
+        self.assertTrue(warmup._done)
+
+
+class SiruinskQueryBudgetTest(query_budget.QueryBudgetTestCase):
+    """Jumlah query endpoint autentikasi dan dokumentasi"""
+    urls = siruinsk_urls
+    budgets = [
+        EndpointBudget('index', 'GET', 0, user=None),
+        EndpointBudget('login', 'POST', 3, user=None,
+                       data={'username': 'budget_user', 'password': 'pass12345'}),
+        EndpointBudget('logout', 'POST', 8,
+                       data=lambda test: {'refresh': str(RefreshToken.for_user(test.users['user']))}),
+        EndpointBudget('register', 'POST', 5, user=None, data={
+            'username': 'pendaftar', 'email': 'pendaftar@example.com',
+            'password1': 'strongpassword123', 'password2': 'strongpassword123',
+            'first_name': 'Siti', 'last_name': 'Aminah',
+        }),
+        EndpointBudget('token_refresh', 'POST', 13, user=None,
+                       data=lambda test: {'refresh': str(RefreshToken.for_user(test.users['user']))}),
+        EndpointBudget('reset_password', 'POST', 1, user=None, data={'email': 'budget@example.com'}),
+        # METRICS_TOKEN kosong saat test: endpoint nonaktif
+        EndpointBudget('metrics', 'GET', 0, user=None, status=404),
+        # Cek readiness berjalan di thread sendiri, bukan koneksi request
+        EndpointBudget('health_live', 'GET', 0, user=None),
+        EndpointBudget('health_ready', 'GET', 0, user=None),
+        # Satu query user untuk autentikasi batch, sisanya milik sub-request
+        EndpointBudget('batch', 'POST', 6, data={'requests': [
+            {'path': '/api/profile/me'}, {'path': '/api/locations/'}, {'path': '/api/rooms/'},
+        ]}),
+        EndpointBudget('slow_queries', 'GET', 1, user='staff'),
+        EndpointBudget('slow_queries', 'DELETE', 1, user='staff'),
+        EndpointBudget('profiling', 'GET', 1, user='staff'),
+        EndpointBudget('profiling', 'DELETE', 1, user='staff'),
+        EndpointBudget('profiling_token', 'POST', 1, user='staff'),
+        EndpointBudget('profiling_detail', 'GET', 1, user='staff', kwargs={'profile_id': 'x'}, status=404),
+        EndpointBudget('profiling_download', 'GET', 1, user='staff', kwargs={'profile_id': 'x'}, status=404),
+        EndpointBudget('schema-swagger-ui', 'GET', 2, user='staff', auth='session'),
+        EndpointBudget('schema-redoc', 'GET', 2, user='staff', auth='session'),
+    ]
+
+    def make_users(self):
+        users = super().make_users()
+        users['user'].email = 'budget@example.com'
+        users['user'].save()
+        return users
+
+    def make_rows(self, count):
+        return User.objects.bulk_create(
+            User(username=f'anggota{i}', email=f'anggota{i}@example.com') for i in range(count)
+        )
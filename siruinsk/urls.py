@@ -4,39 +4,41 @@ from .views import *
 from rest_framework_simplejwt.views import TokenRefreshView
 from django.conf.urls.static import static
 from django.conf import settings
-from rest_framework.permissions import AllowAny
-from rest_framework.authentication import SessionAuthentication
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-from utils.permissions import IsSwaggerAllowed
 from django.views.generic import TemplateView
+from .utils import schema
+
+
+def get_batch_view():
+    # Mode ASGI: sub-request baca dalam batch dijalankan bersamaan
+    if settings.SERVER_MODE == 'asgi':
+        from .async_views import BatchAsyncView
+        return BatchAsyncView.as_view()
+    return BatchView.as_view()
 
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Teknohole API",
-        default_version='v1',
-        description="Dokumentasi REST API Teknohole",
-        contact=openapi.Contact(email="teknohole@gmail.com"),
-    ),
-    public=True,
-    permission_classes=[IsSwaggerAllowed],
-    authentication_classes=[SessionAuthentication],
-)
 
 urlpatterns = [
-    path('', TemplateView.as_view(template_name='index.html')),
+    path('', TemplateView.as_view(template_name='index.html'), name='index'),
     path('admin/', admin.site.urls),
     path('api/login', LoginView.as_view(), name='login'),
     path('api/logout', LogoutView.as_view(), name='logout'),
     path('api/register', RegistrationView.as_view(), name='register'),
     path('api/token/refresh', TokenRefreshView.as_view(), name='token_refresh'),
     path('api/reset-password', ResetPasswordView.as_view(), name='reset_password'),
+    path('metrics', MetricsView.as_view(), name='metrics'),
+    path('health/live', HealthLiveView.as_view(), name='health_live'),
+    path('health/ready', HealthReadyView.as_view(), name='health_ready'),
+    path('api/slow-queries', SlowQueryView.as_view(), name='slow_queries'),
+    path('api/batch', get_batch_view(), name='batch'),
+    path('api/profiling', ProfilingListView.as_view(), name='profiling'),
+    path('api/profiling/token', ProfilingTokenView.as_view(), name='profiling_token'),
+    path('api/profiling/<str:profile_id>', ProfilingDetailView.as_view(), name='profiling_detail'),
+    path('api/profiling/<str:profile_id>/download', ProfilingDownloadView.as_view(), name='profiling_download'),
     path('api/', include('ruang.urls')),
     path('api/profile/', include('profil.urls')),
 
-    # Dokumentasi Swagger & Redoc
-    path('api/doc/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('api/redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    # Dokumentasi Swagger & Redoc (drf_yasg dimuat saat pertama diakses, lihat utils/schema.py)
+    path('api/doc/', schema.ui_view('swagger'), name='schema-swagger-ui'),
+    path('api/redoc/', schema.ui_view('redoc'), name='schema-redoc'),
 ]
 
 if settings.DEBUG:
@@ -0,0 +1,144 @@
+"""
+Dukungan view async untuk mode ASGI (``SERVER_MODE=asgi``).
+
+Di bawah ASGI Django menjalankan semua view sync lewat satu thread bersama per
+worker, dan ORM async Django (``aget``, ``acount``, ...) juga diteruskan ke
+thread yang sama, sehingga satu query lambat menahan semua request di worker
+itu. ``AsyncAPIView`` menjalankan dispatch di event loop dan mengirim setiap
+blok kerja database ke thread pool khusus (``run_db``) dengan koneksi per
+thread, sehingga beberapa query bisa berjalan bersamaan. Hanya dipakai untuk
+jalur baca yang sering diakses; penulisan tetap lewat viewset sync
+(lihat ``split_by_method``).
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from . import metrics
+
+_db_executor = None
+_in_flight = 0
+_in_flight_lock = threading.Lock()
+
+
+def _track_in_flight(delta):
+    global _in_flight
+    with _in_flight_lock:
+        _in_flight += delta
+        metrics.set_gauge('siruinsk_asgi_db_calls_in_flight', _in_flight)
+
+
+async def _tracked(coroutine):
+    # Dihitung sejak dikirim ke pool, jadi termasuk waktu antre
+    _track_in_flight(1)
+    try:
+        return await coroutine
+    finally:
+        _track_in_flight(-1)
+
+
+def run_db(fn, *args, **kwargs):
+    """
+    Jalankan ``fn`` (kode sync yang menyentuh database) tanpa memblokir event
+    loop. Dengan ``ASGI_DB_THREADS=0`` dijalankan di thread sync bersama milik
+    Django (perilaku ORM async bawaan), mis. saat test dalam satu transaksi.
+    """
+    global _db_executor
+    if not settings.ASGI_DB_THREADS:
+        return sync_to_async(fn)(*args, **kwargs)
+    if _db_executor is None:
+        _db_executor = ThreadPoolExecutor(
+            max_workers=settings.ASGI_DB_THREADS, thread_name_prefix='siruinsk-db'
+        )
+
+    def call():
+        # Thread pool tidak mengikuti siklus request Django, jadi kelola
+        # koneksi (CONN_MAX_AGE / health check) sendiri di sini
+        close_old_connections()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return _tracked(sync_to_async(call, thread_sensitive=False, executor=_db_executor)())
+
+
+class AsyncAPIView(GenericAPIView):
+    """
+    ``GenericAPIView`` dengan dispatch async. Handler (``get``) harus ``async def``
+    dan menjalankan query lewat ``run_db``; permission dan filter backend tetap
+    class DRF biasa karena tidak menyentuh database sampai queryset dievaluasi.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+            handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def ainitial(self, request, *args, **kwargs):
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+        neg = self.perform_content_negotiation(request)
+        request.accepted_renderer, request.accepted_media_type = neg
+        version, scheme = self.determine_version(request, *args, **kwargs)
+        request.version, request.versioning_scheme = version, scheme
+
+        await self.aperform_authentication(request)
+        self.check_permissions(request)
+        if self.get_throttles():
+            await run_db(self.check_throttles, request)
+
+    async def aperform_authentication(self, request):
+        # JWTAuthentication mengambil user dari database
+        await run_db(self.perform_authentication, request)
+
+    async def aget_object(self):
+        return await run_db(self.get_object)
+
+    def list_page(self, request):
+        """ Query + serialisasi list (sync), dijalankan lewat ``run_db`` """
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(queryset, many=True).data)
+
+    async def alist(self, request, *args, **kwargs):
+        return await run_db(self.list_page, request)
+
+
+def split_by_method(async_view, sync_view):
+    """
+    Gabungkan view async (untuk GET/HEAD) dan view sync (metode lain) pada satu
+    URL. View sync dijalankan di thread lewat ``sync_to_async`` seperti yang
+    dilakukan Django untuk view sync di bawah ASGI.
+    """
+    sync_handler = sync_to_async(sync_view)
+
+    async def view(request, *args, **kwargs):
+        if request.method in SAFE_METHODS and request.method != 'OPTIONS':
+            return await async_view(request, *args, **kwargs)
+        return await sync_handler(request, *args, **kwargs)
+
+    view.cls = getattr(sync_view, 'cls', None)
+    view.initkwargs = getattr(sync_view, 'initkwargs', {})
+    view.actions = getattr(sync_view, 'actions', None)
+    return csrf_exempt(view)
@@ -0,0 +1,144 @@
+"""
+``POST /api/batch``: beberapa request API dalam satu round trip, mis. semua
+data dashboard saat halaman dibuka::
+
+    {"requests": [
+        {"id": "profil", "path": "/api/profile/me"},
+        {"id": "reservasi", "path": "/api/reservations/my_reservations/"},
+        {"id": "ruang", "path": "/api/rooms/?page=2"},
+        {"id": "cek", "path": "/api/rooms/3/availability/?start=...&end=..."}
+    ]}
+
+Setiap sub-request di-resolve lalu view-nya dipanggil langsung di proses yang
+sama, sebagai user yang sudah diautentikasi oleh request batch: token JWT
+tidak di-decode ulang dan middleware tidak dijalankan lagi, sedangkan
+permission, throttle, filter, dan paginasi view tetap berlaku. Hasilnya urut
+sesuai request::
+
+    {"responses": [{"id": "profil", "status": 200, "headers": {"ETag": "..."}, "body": {...}}, ...]}
+
+``body`` adalah data respons DRF yang dirender sekali bersama seluruh batch
+(ikut format yang dinegosiasikan request batch); respons non-DRF disertakan
+jika JSON, selain itu ``null``.
+
+Hanya metode di ``BATCH_ALLOWED_METHODS`` (default GET/HEAD) yang diterima,
+paling banyak ``BATCH_MAX_REQUESTS`` sub-request. Batch yang hanya membaca
+dirutekan ke read replica seperti request GET dan tidak mem-pin klien ke
+primary; di mode ASGI sub-request-nya dijalankan bersamaan. Batch yang berisi
+penulisan selalu dijalankan berurutan di primary.
+"""
+import asyncio
+import io
+import json
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from asgiref.sync import iscoroutinefunction
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from rest_framework.response import Response
+
+from . import replicas
+from .async_views import run_db
+
+# Header respons sub-request yang diteruskan ke klien
+FORWARDED_HEADERS = ('ETag', 'Last-Modified', 'Cache-Control', 'Location', 'Retry-After')
+# Header request batch yang tidak berlaku untuk sub-request
+_DROPPED_META = ('CONTENT_TYPE', 'CONTENT_LENGTH', 'HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE')
+
+
+def is_read_only(items):
+    return all(item['method'] in replicas.SAFE_METHODS for item in items)
+
+
+def build_request(parent, item):
+    """ ``HttpRequest`` satu sub-request, dengan user dan autentikasi request batch """
+    url = urlsplit(item['path'])
+    body = b'' if item.get('body') is None else json.dumps(item['body']).encode()
+    request = HttpRequest()
+    request.method = item['method']
+    request.path = request.path_info = url.path
+    request.META = {key: value for key, value in parent.META.items() if key not in _DROPPED_META}
+    request.META.update({
+        'REQUEST_METHOD': request.method, 'PATH_INFO': url.path, 'QUERY_STRING': url.query,
+        'HTTP_ACCEPT': 'application/json', 'CONTENT_TYPE': 'application/json', 'CONTENT_LENGTH': str(len(body)),
+    })
+    for name, value in item.get('headers', {}).items():
+        request.META['HTTP_' + name.upper().replace('-', '_')] = value
+    request.GET = QueryDict(url.query)
+    request.COOKIES = parent.COOKIES
+    request._stream = io.BytesIO(body)
+    request._read_started = False
+    request.user = parent.user
+    # Dibaca rest_framework.request.Request: autentikasi tidak diulang
+    request._force_auth_user, request._force_auth_token = parent.user, parent.auth
+    return request
+
+
+def prepare(parent, item):
+    """ ``(view, request, args, kwargs)``, atau dict hasil jika path tidak bisa dipanggil """
+    try:
+        match = resolve(urlsplit(item['path']).path)
+    except Resolver404:
+        return error(item, 404, 'Not found.')
+    if match.url_name == 'batch':
+        return error(item, 400, 'Batch tidak bisa bersarang.')
+    request = build_request(parent, item)
+    request.resolver_match = match
+    return match.func, request, match.args, match.kwargs
+
+
+def error(item, status, detail):
+    return {'id': item.get('id'), 'status': status, 'headers': {}, 'body': {'detail': detail}}
+
+
+def result(item, response):
+    if isinstance(response, Response):
+        body = response.data
+    elif not response.streaming and response.get('Content-Type', '').startswith('application/json'):
+        body = json.loads(response.content)
+    else:
+        body = None
+    headers = {name: response[name] for name in FORWARDED_HEADERS if response.has_header(name)}
+    return {'id': item.get('id'), 'status': response.status_code, 'headers': headers, 'body': body}
+
+
+def execute(parent, item):
+    prepared = prepare(parent, item)
+    if isinstance(prepared, dict):
+        return prepared
+    view, request, args, kwargs = prepared
+    return result(item, view(request, *args, **kwargs))
+
+
+async def aexecute(parent, item):
+    prepared = prepare(parent, item)
+    if isinstance(prepared, dict):
+        return prepared
+    view, request, args, kwargs = prepared
+    if iscoroutinefunction(view):
+        response = await view(request, *args, **kwargs)
+    else:
+        # View sync (mis. viewset) di thread pool query agar bisa berjalan bersamaan
+        response = await run_db(view, request, *args, **kwargs)
+    return result(item, response)
+
+
+async def aexecute_all(parent, items):
+    if is_read_only(items):
+        return list(await asyncio.gather(*(aexecute(parent, item) for item in items)))
+    return [await aexecute(parent, item) for item in items]
+
+
+@contextmanager
+def routing(parent, items, alias):
+    """
+    Batch baca memakai replica ``alias`` (dari ``replicas.read_alias``) dan
+    tidak mem-pin klien ke primary walaupun metodenya POST
+    """
+    if not is_read_only(items):
+        yield
+        return
+    parent._request.replica_read_only = True
+    with replicas.use_replica(alias):
+        yield
@@ -0,0 +1,108 @@
+"""
+Format respons ringkas yang dipilih lewat negosiasi konten (header ``Accept``
+atau ``?format=``); JSON biasa tetap default.
+
+- ``application/msgpack`` (``?format=msgpack``): MessagePack, isi sama
+  dengan respons JSON (datetime tetap string ISO 8601). Butuh paket
+  ``msgpack``; jika tidak terpasang format ini tidak ditawarkan (lihat
+  ``API_EXTRA_FORMATS`` di settings).
+- ``application/vnd.siruinsk.columnar+json`` (``?format=columnar``): untuk
+  respons list (daftar objek, atau ``results`` pada respons paginasi) nama
+  field ditulis sekali dan nilainya per kolom. Kolom string yang banyak
+  berulang (nama ruangan/lokasi, status) di-encode dengan kamus: nilainya
+  indeks ke ``dictionaries[kolom]``. Respons selain list dirender seperti
+  JSON biasa. Contoh bentuk ``results``::
+
+      {"length": 3, "columns": ["id", "room_name", "status"],
+       "values": [[1, 2, 3], [0, 0, 1], [0, 1, 0]],
+       "dictionaries": {"room_name": ["Ruang 101", "Ruang 102"],
+                        "status": ["PENDING", "APPROVED"]}}
+
+  Field yang tidak ada pada sebagian objek (dilewati serializer) bernilai
+  ``null`` di kolomnya. ``decode_columnar`` mengembalikan bentuk list.
+"""
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from .fastjson import FastJSONRenderer, VaryAcceptMixin
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+_default = JSONEncoder().default
+
+
+def _is_rows(data):
+    return isinstance(data, list) and all(isinstance(item, dict) for item in data)
+
+
+def to_columnar(rows):
+    """ List dict -> ``{length, columns, values, dictionaries}`` """
+    columns = {}
+    for row in rows:
+        for key in row:
+            columns.setdefault(key, None)
+    values, dictionaries = [], {}
+    for column in columns:
+        column_values = [row.get(column) for row in rows]
+        present = [value for value in column_values if value is not None]
+        if present and all(isinstance(value, str) for value in present):
+            distinct = dict.fromkeys(present)
+            if len(distinct) * 2 <= len(present):
+                index = {value: position for position, value in enumerate(distinct)}
+                column_values = [None if value is None else index[value] for value in column_values]
+                dictionaries[column] = list(distinct)
+        values.append(column_values)
+    return {'length': len(rows), 'columns': list(columns), 'values': values, 'dictionaries': dictionaries}
+
+
+def decode_columnar(data):
+    """ Kebalikan ``to_columnar`` (field yang tidak ada menjadi ``None``) """
+    columns = []
+    for name, column_values in zip(data['columns'], data['values']):
+        dictionary = data['dictionaries'].get(name)
+        if dictionary is not None:
+            column_values = [None if value is None else dictionary[value] for value in column_values]
+        columns.append(column_values)
+    return [dict(zip(data['columns'], row)) for row in zip(*columns)] if columns else [{} for _ in range(data['length'])]
+
+
+class ColumnarJSONRenderer(FastJSONRenderer):
+    """ JSON kolumnar untuk respons list, JSON biasa untuk respons lain """
+    media_type = 'application/vnd.siruinsk.columnar+json'
+    format = 'columnar'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if _is_rows(data):
+            data = to_columnar(data)
+        elif isinstance(data, dict) and _is_rows(data.get('results')):
+            data = {**data, 'results': to_columnar(data['results'])}
+        return super().render(data, accepted_media_type, renderer_context)
+
+
+class MessagePackRenderer(VaryAcceptMixin, BaseRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        # Tipe yang tidak dikenal msgpack (Decimal, string lazy, ...) diubah
+        # seperti oleh JSONEncoder DRF
+        return msgpack.packb(data, default=_default, use_bin_type=True)
+
+
+class MessagePackParser(BaseParser):
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False, strict_map_key=False)
+        except (ValueError, TypeError) as exc:
+            raise ParseError(f'MessagePack parse error - {exc}')
@@ -0,0 +1,93 @@
+"""
+Renderer dan parser JSON berbasis ``orjson`` (dipilih lewat ``JSON_BACKEND``
+di settings).
+
+Keluaran sama byte demi byte dengan ``JSONRenderer`` DRF pada konfigurasi
+default (``COMPACT_JSON``, ``UNICODE_JSON``): tipe yang tidak dikenal orjson
+(``Decimal``, string lazy terjemahan, ``timedelta``, ...) diserahkan ke
+``JSONEncoder`` DRF, datetime diformat seperti DRF (``Z`` untuk UTC), dan
+``\\u2028``/``\\u2029`` tetap di-escape. Respons berindentasi (``Accept:
+application/json; indent=4``) dan data yang ditolak orjson (mis. integer di
+luar 64 bit) dirender dengan ``json`` stdlib seperti DRF. Perbedaan yang
+tersisa: float NaN/Infinity ditulis ``null`` oleh orjson, bukan error (model
+di repo ini tidak memakai float).
+
+Jika ``orjson`` tidak terpasang kedua class ini berperilaku persis seperti
+``JSONRenderer``/``JSONParser`` bawaan.
+
+Semua renderer API (JSON, juga ``JSON_BACKEND=stdlib``, dan format di
+``compact_formats.py``) memakai ``VaryAcceptMixin``: representasi dipilih
+lewat ``Accept``, jadi setiap respons membawa ``Vary: Accept`` agar cache
+bersama tidak memberi JSON ke klien msgpack atau sebaliknya.
+"""
+import codecs
+import io
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_default = JSONEncoder().default
+_UTF8 = {'utf-8', 'utf8'}
+# Kunci non-string (mis. indeks error ListField) dijadikan string seperti json stdlib
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z if orjson is not None else 0
+
+
+class VaryAcceptMixin:
+    """ Mixin renderer: tambahkan ``Accept`` ke header ``Vary`` respons """
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        response = (renderer_context or {}).get('response')
+        if response is not None:
+            patch_vary_headers(response, ('Accept',))
+        return super().render(data, accepted_media_type, renderer_context)
+
+
+class StdlibJSONRenderer(VaryAcceptMixin, JSONRenderer):
+    """ ``JSONRenderer`` bawaan DRF (``JSON_BACKEND=stdlib``) dengan ``Vary: Accept`` """
+
+
+class FastJSONRenderer(VaryAcceptMixin, JSONRenderer):
+    """ ``JSONRenderer`` dengan ``orjson.dumps`` untuk respons compact (default) """
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None or data is None or not self.compact or self.ensure_ascii
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=_default, option=_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    """ ``JSONParser`` dengan ``orjson.loads`` """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        data = stream.read()
+        try:
+            if encoding.lower() not in _UTF8:
+                data = codecs.decode(data, encoding)
+            return orjson.loads(data)
+        except (orjson.JSONDecodeError, UnicodeDecodeError):
+            pass
+        # Dokumen yang ditolak orjson (mis. integer di luar 64 bit) diparse
+        # ulang dengan json stdlib: hasil dan pesan error sama dengan DRF
+        if isinstance(data, str):
+            data = data.encode(encoding)
+        return super().parse(io.BytesIO(data), media_type, parser_context)
@@ -0,0 +1,153 @@
+"""
+Pemeriksaan kesehatan untuk orchestrator: ``/health/live`` dan ``/health/ready``.
+
+Liveness hanya memastikan proses worker masih melayani request (tanpa
+menyentuh dependensi), readiness memeriksa database (semua alias, termasuk
+replica), cache, storage media, dan antrean pekerjaan background
+(``utils/tasks.py``). Setiap cek berjalan di thread terpisah dengan batas
+``HEALTH_CHECK_TIMEOUT`` detik, sehingga dependensi yang macet membuat cek
+gagal alih-alih menahan probe. Cek yang masih macet dari probe sebelumnya
+tidak dijalankan ulang (tidak ada thread yang menumpuk).
+
+Respons hanya berisi status dan latensi tiap cek; pesan error (host, driver,
+path) dicatat di log server, bukan dikirim ke klien yang tidak diautentikasi.
+
+Hasil readiness disimpan di memori proses selama ``HEALTH_CACHE_TTL`` detik:
+probe yang lebih sering dari itu tidak menambah beban. Cache per proses
+memang disengaja, karena yang diperiksa adalah dependensi dari worker ini
+(dan cache Django sendiri termasuk yang diperiksa).
+"""
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.signals import setting_changed
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from . import tasks
+
+logger = logging.getLogger(__name__)
+CACHE_PROBE_KEY = 'health_probe'
+STORAGE_PROBE_NAME = '.health'
+
+_lock = threading.Lock()
+_executor = None
+_running = {}
+_last = None
+
+
+def check_database(alias):
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+    finally:
+        # Koneksi milik thread cek tidak ikut siklus request Django
+        connections[alias].close()
+
+
+def check_cache():
+    value = uuid.uuid4().hex
+    cache.set(CACHE_PROBE_KEY, value, 30)
+    if cache.get(CACHE_PROBE_KEY) != value:
+        raise RuntimeError('Nilai cache tidak terbaca kembali')
+
+
+def check_storage():
+    # Cukup satu stat/HEAD: mendeteksi mount atau bucket yang macet/tidak bisa diakses
+    default_storage.exists(STORAGE_PROBE_NAME)
+
+
+def check_tasks():
+    pending = tasks.pending_count()
+    if pending > settings.HEALTH_MAX_PENDING_TASKS:
+        raise RuntimeError(f'{pending} pekerjaan background antre')
+
+
+def checks():
+    """ ``{nama: callable}`` yang diperiksa readiness """
+    found = {}
+    for alias in settings.DATABASES:
+        name = 'database' if alias == DEFAULT_DB_ALIAS else f'database:{alias}'
+        found[name] = lambda alias=alias: check_database(alias)
+    found['cache'] = check_cache
+    found['storage'] = check_storage
+    found['tasks'] = check_tasks
+    return found
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(thread_name_prefix='siruinsk-health')
+    return _executor
+
+
+def _timed(fn):
+    """ ``(latensi, exception atau None)`` """
+    start = time.perf_counter()
+    try:
+        fn()
+    except Exception as exc:
+        return time.perf_counter() - start, exc
+    return time.perf_counter() - start, None
+
+
+def run_checks():
+    """ Jalankan semua cek secara paralel, masing-masing dengan batas waktu """
+    timeout = settings.HEALTH_CHECK_TIMEOUT
+    futures = {}
+    with _lock:
+        for name, fn in checks().items():
+            future = _running.get(name)
+            if future is None or future.done():
+                future = _running[name] = _get_executor().submit(_timed, fn)
+            futures[name] = future
+
+    deadline = time.perf_counter() + timeout
+    results = {}
+    for name, future in futures.items():
+        try:
+            latency, error = future.result(timeout=max(deadline - time.perf_counter(), 0))
+        except TimeoutError:
+            logger.error('Health check %s melewati batas %s detik', name, timeout)
+            results[name] = {'status': 'timeout', 'latency_ms': round(timeout * 1000, 2)}
+            continue
+        if error is not None:
+            logger.error('Health check %s gagal', name, exc_info=error)
+        results[name] = {'status': 'ok' if error is None else 'error', 'latency_ms': round(latency * 1000, 2)}
+    return results
+
+
+def readiness():
+    """ ``(siap, hasil)``; hasil yang berumur kurang dari ``HEALTH_CACHE_TTL`` dipakai ulang """
+    global _last
+    now = time.monotonic()
+    last = _last
+    if last is not None and now - last[0] < settings.HEALTH_CACHE_TTL:
+        checked_at, results = last
+        cached = True
+    else:
+        checked_at, results = now, run_checks()
+        _last = (checked_at, results)
+        cached = False
+    ready = all(result['status'] == 'ok' for result in results.values())
+    return ready, {
+        'status': 'ok' if ready else 'fail',
+        'checks': results,
+        'cached': cached,
+        'age_s': round(now - checked_at, 3),
+    }
+
+
+def reset(**kwargs):
+    global _last
+    _last = None
+
+
+setting_changed.connect(reset)
@@ -0,0 +1,247 @@
+"""
+Instrumentasi SQL per request (opt-in, ``QUERY_INSTRUMENTATION=True``).
+
+Untuk request yang terpilih sampel (``QUERY_INSTRUMENTATION_SAMPLE_RATE``)
+dicatat jumlah query, total waktu database, query paling lambat, waktu
+serialisasi (serializer proyek dengan ``TimedSerializerMixin``), dan waktu
+render response. Hasilnya
+dikirim sebagai header ``Server-Timing`` dan satu baris log JSON di logger
+``siruinsk.instrumentation``.
+
+Execute wrapper dipasang sekali di setiap koneksi database (signal
+``connection_created``) dan hanya mencatat jika ada recorder aktif di context
+request, sehingga request yang tidak disampel hanya membayar satu
+``ContextVar.get()`` per query. Context ikut ke thread ``sync_to_async``,
+jadi query dari view async (``run_db``) juga tercatat.
+
+Wrapper yang sama juga meneruskan query lambat ke slow query log
+(``SLOW_QUERY_LOG``, lihat ``siruinsk/utils/slow_queries.py``).
+"""
+import json
+import logging
+import random
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from . import slow_queries
+
+logger = logging.getLogger('siruinsk.instrumentation')
+
+_recorder = ContextVar('siruinsk_query_recorder', default=None)
+_current_request = ContextVar('siruinsk_current_request', default=None)
+# Waktu query selama serialisasi terluar di context ini (list satu elemen)
+_serializing = ContextVar('siruinsk_serializing', default=None)
+
+
+def current_request():
+    """ Request yang sedang diproses di context ini (untuk log), atau ``None`` """
+    return _current_request.get()
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.queries = []
+        self.started = time.perf_counter()
+        self.render_started = None
+        self.render_time = 0.0
+        # Diisi dari beberapa thread sekaligus oleh sub-request batch (ASGI)
+        self.serialize_times = []
+
+    def add(self, sql, duration):
+        self.queries.append((sql, duration))
+
+    def start_render(self, response):
+        self.render_started = time.perf_counter()
+        response.add_post_render_callback(self.finish_render)
+
+    def finish_render(self, response):
+        self.render_time = time.perf_counter() - self.render_started
+
+    def summary(self, request, response):
+        total = time.perf_counter() - self.started
+        db_time = sum(duration for _, duration in self.queries)
+        serialize_time = sum(self.serialize_times)
+        other = db_time + serialize_time + self.render_time
+        counts = Counter(sql for sql, _ in self.queries)
+        slowest = sorted(self.queries, key=lambda query: query[1], reverse=True)
+        match = request.resolver_match
+        return {
+            'method': request.method,
+            'path': request.path,
+            'route': match.route if match else None,
+            'status': response.status_code,
+            'queries': len(self.queries),
+            # Query identik yang berulang biasanya tanda N+1
+            'duplicate_queries': sum(count - 1 for count in counts.values()),
+            'db_ms': round(db_time * 1000, 2),
+            'serialize_ms': round(serialize_time * 1000, 2),
+            'render_ms': round(self.render_time * 1000, 2),
+            'app_ms': round(max(total - other, 0) * 1000, 2),
+            'total_ms': round(total * 1000, 2),
+            'slowest': [
+                {'sql': sql[:300], 'ms': round(duration * 1000, 2)}
+                for sql, duration in slowest[:settings.QUERY_INSTRUMENTATION_SLOWEST]
+            ],
+        }
+
+
+@contextmanager
+def capture_queries():
+    """
+    Kumpulkan ``(sql, durasi)`` semua query di dalam blok ke list yang
+    di-yield. Jika request sudah disampel, recorder request tetap dipakai.
+    """
+    captured = []
+    recorder = _recorder.get()
+    if recorder is not None:
+        start = len(recorder.queries)
+        try:
+            yield captured
+        finally:
+            captured.extend(recorder.queries[start:])
+        return
+
+    recorder = QueryRecorder()
+    token = _recorder.set(recorder)
+    try:
+        yield captured
+    finally:
+        _recorder.reset(token)
+        captured.extend(recorder.queries)
+
+
+def _execute_wrapper(execute, sql, params, many, context):
+    recorder = _recorder.get()
+    if recorder is None and not settings.SLOW_QUERY_LOG:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - start
+        if recorder is not None:
+            recorder.add(sql, duration)
+            serializing = _serializing.get()
+            if serializing is not None:
+                serializing[0] += duration
+        if settings.SLOW_QUERY_LOG and duration * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+            slow_queries.record(context['connection'], sql, params, many, duration)
+
+
+def install_execute_wrapper(connection):
+    if _execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_execute_wrapper)
+
+
+@receiver(connection_created)
+def instrument_new_connection(sender, connection, **kwargs):
+    install_execute_wrapper(connection)
+
+
+class TimedSerializerMixin:
+    """
+    Mixin serializer proyek: waktu ``to_representation`` terluar dicatat ke
+    recorder aktif. Serializer bersarang dan item ``many=True`` di dalam
+    serializer lain sudah termasuk waktu induknya; query yang berjalan di
+    dalamnya (relasi lazy, N+1) tetap dihitung sebagai ``db``. State per
+    context, jadi sub-request batch yang berjalan bersamaan tidak saling
+    mengganggu.
+    """
+    def to_representation(self, instance):
+        recorder = _recorder.get()
+        if recorder is None or _serializing.get() is not None:
+            return super().to_representation(instance)
+        db_time = [0.0]
+        token = _serializing.set(db_time)
+        start = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            recorder.serialize_times.append(time.perf_counter() - start - db_time[0])
+            _serializing.reset(token)
+
+
+def server_timing(summary):
+    return ', '.join([
+        f'db;dur={summary["db_ms"]};desc="{summary["queries"]} queries"',
+        f'serialize;dur={summary["serialize_ms"]}',
+        f'render;dur={summary["render_ms"]}',
+        f'app;dur={summary["app_ms"]}',
+        f'total;dur={summary["total_ms"]}',
+    ])
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Letakkan di awal ``MIDDLEWARE`` agar ``total`` mencakup middleware lain.
+    Serialisasi adalah waktu ``TimedSerializerMixin`` di view; render dihitung
+    dari ``process_template_response`` sampai callback post-render (encoding
+    response DRF). ``app`` adalah sisanya.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+        # Koneksi yang sudah terbuka sebelum middleware dimuat
+        for connection in connections.all(initialized_only=True):
+            install_execute_wrapper(connection)
+
+    def _sampled(self):
+        return settings.QUERY_INSTRUMENTATION and random.random() < settings.QUERY_INSTRUMENTATION_SAMPLE_RATE
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        request_token = _current_request.set(request)
+        try:
+            if not self._sampled():
+                return self.get_response(request)
+
+            recorder = request._query_recorder = QueryRecorder()
+            token = _recorder.set(recorder)
+            try:
+                response = self.get_response(request)
+            finally:
+                _recorder.reset(token)
+            return self.finish(request, response, recorder)
+        finally:
+            _current_request.reset(request_token)
+
+    async def __acall__(self, request):
+        request_token = _current_request.set(request)
+        try:
+            if not self._sampled():
+                return await self.get_response(request)
+
+            recorder = request._query_recorder = QueryRecorder()
+            token = _recorder.set(recorder)
+            try:
+                response = await self.get_response(request)
+            finally:
+                _recorder.reset(token)
+            return self.finish(request, response, recorder)
+        finally:
+            _current_request.reset(request_token)
+
+    def process_template_response(self, request, response):
+        recorder = getattr(request, '_query_recorder', None)
+        if recorder is not None:
+            recorder.start_render(response)
+        return response
+
+    def finish(self, request, response, recorder):
+        summary = recorder.summary(request, response)
+        response['Server-Timing'] = server_timing(summary)
+        logger.info(json.dumps(summary))
+        return response
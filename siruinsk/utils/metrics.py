@@ -0,0 +1,376 @@
+"""
+Metrik aplikasi (counter, gauge, histogram latensi) yang digabung antar proses
+worker gunicorn dan diekspos dalam format teks Prometheus di ``/metrics``.
+
+Setiap proses menulis ke file miliknya sendiri di ``METRICS_DIR`` yang
+di-``mmap``: satu penulis per file, jadi menambah nilai cukup satu lock
+thread dan satu tulis 8 byte ke memori, tanpa syscall. Endpoint scrape membaca
+dan menjumlahkan file semua proses. Counter dan histogram proses yang sudah
+mati tetap dihitung (nilainya tidak boleh turun): master gunicorn melipatnya
+ke satu file ``counter_aggregate.db`` saat worker keluar lalu menghapus file
+worker itu, sehingga jumlah file tidak bertambah setiap worker didaur ulang.
+Gauge hanya dari proses yang masih hidup. Direktori dikosongkan saat master
+gunicorn mulai (``gunicorn.conf.py``).
+
+Format file (sama dengan mode multiprocess ``prometheus_client``): 4 byte
+panjang data terpakai, lalu entri ``[panjang kunci][kunci, padding 8][double]``.
+"""
+import fcntl
+import glob
+import json
+import mmap
+import os
+import shutil
+import struct
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.signals import setting_changed
+
+from .instrumentation import capture_queries
+
+# nama -> (tipe, keterangan)
+FAMILIES = {
+    'siruinsk_http_requests_total': ('counter', 'Jumlah request per view, metode, dan status'),
+    'siruinsk_http_request_duration_seconds': ('histogram', 'Latensi request per view dan metode'),
+    'siruinsk_db_queries_total': ('counter', 'Jumlah query database per view'),
+    'siruinsk_db_query_duration_seconds_total': ('counter', 'Total waktu query database per view'),
+    'siruinsk_cache_requests_total': ('counter', 'Lookup cache aplikasi per hasil (hit/miss)'),
+    'siruinsk_background_tasks_pending': ('gauge', 'Pekerjaan background yang antre atau berjalan'),
+    'siruinsk_asgi_db_calls_in_flight': ('gauge', 'Blok kerja database view async yang antre atau berjalan'),
+}
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float('inf'))
+
+_INITIAL_SIZE = 64 * 1024
+# Counter worker yang sudah keluar, ditulis hanya oleh master gunicorn
+AGGREGATE_FILE = 'counter_aggregate.db'
+_lock = threading.Lock()
+_stores = {}
+_keys = {}
+
+
+class MmapStore:
+    """ Nilai float per kunci di satu file mmap (hanya ditulis satu proses) """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'a+b')
+        if os.fstat(self._file.fileno()).st_size == 0:
+            self._file.truncate(_INITIAL_SIZE)
+        self._capacity = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), self._capacity)
+        self._positions = {}
+        self._used = struct.unpack_from('i', self._map, 0)[0]
+        if self._used == 0:
+            self._used = 8
+            struct.pack_into('i', self._map, 0, self._used)
+        else:
+            for key, _, position in _read_entries(self._map, self._used):
+                self._positions[key] = position
+
+    def _init_value(self, key):
+        encoded = key.encode('utf-8')
+        padding = 8 - (len(encoded) + 4) % 8
+        entry = struct.pack(f'i{len(encoded)}s{padding}xd', len(encoded), encoded, 0.0)
+        while self._used + len(entry) > self._capacity:
+            self._capacity *= 2
+            self._file.truncate(self._capacity)
+            self._map.close()
+            self._map = mmap.mmap(self._file.fileno(), self._capacity)
+        self._map[self._used:self._used + len(entry)] = entry
+        self._used += len(entry)
+        # Header terakhir: pembaca tidak pernah melihat entri setengah jadi
+        struct.pack_into('i', self._map, 0, self._used)
+        self._positions[key] = self._used - 8
+
+    def add(self, key, amount):
+        position = self._positions.get(key)
+        if position is None:
+            self._init_value(key)
+            position = self._positions[key]
+        value = struct.unpack_from('d', self._map, position)[0]
+        struct.pack_into('d', self._map, position, value + amount)
+
+    def set(self, key, value):
+        if key not in self._positions:
+            self._init_value(key)
+        struct.pack_into('d', self._map, self._positions[key], value)
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+def _read_entries(data, used):
+    position = 8
+    while position < used:
+        length = struct.unpack_from('i', data, position)[0]
+        key = bytes(data[position + 4:position + 4 + length]).decode('utf-8')
+        position += 4 + length + (8 - (length + 4) % 8)
+        yield key, struct.unpack_from('d', data, position)[0], position
+        position += 8
+
+
+def _read_file(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < 8:
+        return []
+    return [(key, value) for key, value, _ in _read_entries(data, struct.unpack_from('i', data, 0)[0])]
+
+
+@contextmanager
+def _directory_lock(directory, exclusive=False):
+    # Scrape (shared) tidak boleh melihat counter worker yang sedang dilipat
+    # (exclusive): terhitung dua kali atau hilang sesaat terbaca sebagai reset
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, '.lock'), 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield
+
+
+def _store(kind):
+    store = _stores.get(kind)
+    if store is None:
+        os.makedirs(settings.METRICS_DIR, exist_ok=True)
+        store = _stores[kind] = MmapStore(os.path.join(settings.METRICS_DIR, f'{kind}_{os.getpid()}.db'))
+    return store
+
+
+def _reset_stores(**kwargs):
+    if kwargs.get('setting', 'METRICS_DIR') == 'METRICS_DIR':
+        _stores.clear()
+
+
+# Proses anak hasil fork (mis. gunicorn preload_app) menulis ke file sendiri
+os.register_at_fork(after_in_child=_reset_stores)
+setting_changed.connect(_reset_stores)
+
+
+def _key(name, labels):
+    # Kunci JSON di-cache: hanya dibangun sekali per kombinasi label
+    key = _keys.get((name, labels))
+    if key is None:
+        key = _keys[(name, labels)] = json.dumps([name, labels])
+    return key
+
+
+def inc(name, labels=(), amount=1.0):
+    """ Tambah counter; ``labels`` berupa tuple pasangan ``(nama, nilai)`` """
+    if not settings.METRICS_ENABLED:
+        return
+    with _lock:
+        _store('counter').add(_key(name, labels), amount)
+
+
+def observe(name, value, labels=()):
+    """ Catat satu observasi histogram """
+    if not settings.METRICS_ENABLED:
+        return
+    bucket = BUCKETS[bisect_left(BUCKETS, value)]
+    with _lock:
+        store = _store('counter')
+        store.add(_key(f'{name}_bucket', labels + (('le', bucket),)), 1.0)
+        store.add(_key(f'{name}_sum', labels), value)
+        store.add(_key(f'{name}_count', labels), 1.0)
+
+
+def set_gauge(name, value, labels=()):
+    """ Gauge milik proses ini; nilai yang diekspos adalah jumlah semua proses hidup """
+    if not settings.METRICS_ENABLED:
+        return
+    with _lock:
+        _store('gauge').set(_key(name, labels), value)
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _merged():
+    values = {}
+    with _directory_lock(settings.METRICS_DIR):
+        for path in glob.glob(os.path.join(settings.METRICS_DIR, '*.db')):
+            kind, _, pid = os.path.basename(path)[:-3].partition('_')
+            if kind == 'gauge' and not _pid_alive(int(pid)):
+                continue
+            for key, value in _read_file(path):
+                values[key] = values.get(key, 0.0) + value
+    return values
+
+
+def _family(sample_name):
+    if sample_name in FAMILIES:
+        return sample_name
+    for suffix in ('_bucket', '_sum', '_count'):
+        if sample_name.endswith(suffix) and sample_name[:-len(suffix)] in FAMILIES:
+            return sample_name[:-len(suffix)]
+    return None
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        (name, str(value if not isinstance(value, float) else _format_value(value))
+         .replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n'))
+        for name, value in labels
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+def render():
+    """ Semua metrik dalam format teks Prometheus (versi 0.0.4) """
+    families = {}
+    for key, value in _merged().items():
+        name, labels = json.loads(key)
+        family = _family(name)
+        if family is not None:
+            families.setdefault(family, []).append((name, tuple(tuple(pair) for pair in labels), value))
+
+    lines = []
+    for family, samples in sorted(families.items()):
+        kind, description = FAMILIES[family]
+        lines += [f'# HELP {family} {description}', f'# TYPE {family} {kind}']
+        if kind == 'histogram':
+            lines += _histogram_lines(family, samples)
+        else:
+            lines += [f'{name}{_format_labels(labels)} {_format_value(value)}'
+                      for name, labels, value in sorted(samples)]
+    return '\n'.join(lines) + '\n'
+
+
+def _histogram_lines(family, samples):
+    # Bucket disimpan per interval, diekspos kumulatif per kombinasi label
+    series = {}
+    for name, labels, value in samples:
+        if name.endswith('_bucket'):
+            base, le = labels[:-1], labels[-1][1]
+            series.setdefault(base, {}).setdefault('buckets', {})[le] = value
+        else:
+            series.setdefault(labels, {})[name[len(family):]] = value
+
+    lines = []
+    for labels, data in sorted(series.items()):
+        total = 0.0
+        for bound in BUCKETS:
+            total += data.get('buckets', {}).get(bound, 0.0)
+            lines.append(f'{family}_bucket{_format_labels(labels + (("le", bound),))} {_format_value(total)}')
+        lines.append(f'{family}_sum{_format_labels(labels)} {_format_value(data.get("_sum", 0.0))}')
+        lines.append(f'{family}_count{_format_labels(labels)} {_format_value(data.get("_count", 0.0))}')
+    return lines
+
+
+def clear_directory(directory):
+    """ Hapus data run sebelumnya; dipanggil master gunicorn sebelum fork worker """
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory, exist_ok=True)
+
+
+def mark_process_dead(pid, directory):
+    """
+    Dipanggil master gunicorn saat worker keluar: gauge-nya tidak dijumlahkan
+    lagi, counter-nya dipindah ke ``AGGREGATE_FILE``
+    """
+    with _directory_lock(directory, exclusive=True):
+        for path in glob.glob(os.path.join(directory, f'gauge_{pid}.db')):
+            os.remove(path)
+        path = os.path.join(directory, f'counter_{pid}.db')
+        if not os.path.exists(path):
+            return
+        aggregate = MmapStore(os.path.join(directory, AGGREGATE_FILE))
+        try:
+            for key, value in _read_file(path):
+                aggregate.add(key, value)
+        finally:
+            aggregate.close()
+        os.remove(path)
+
+
+HTTP_METHODS = {'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'}
+_view_labels = {}
+
+
+def view_label(request):
+    """
+    ``Class.action`` untuk viewset (mis. ``RoomViewSet.availability``), nama
+    class untuk ``APIView`` (``LoginView``), atau nama URL untuk view lain.
+    """
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    func = match.func
+    method = 'get' if request.method == 'HEAD' else request.method.lower()
+    label = _view_labels.get((func, method))
+    if label is None:
+        view_class = getattr(func, 'cls', None) or getattr(func, 'view_class', None)
+        actions = getattr(func, 'actions', None)
+        if view_class is None:
+            label = match.view_name or func.__name__
+        elif actions and method in actions:
+            label = f'{view_class.__name__}.{actions[method]}'
+        else:
+            label = view_class.__name__
+        _view_labels[(func, method)] = label
+    return label
+
+
+class MetricsMiddleware:
+    """
+    Latensi, jumlah request, dan waktu database per view. Letakkan setelah
+    ``QueryInstrumentationMiddleware`` (query yang sama dipakai bersama).
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+        start = time.perf_counter()
+        with capture_queries() as queries:
+            response = self.get_response(request)
+        self.record(request, response, time.perf_counter() - start, queries)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.METRICS_ENABLED:
+            return await self.get_response(request)
+        start = time.perf_counter()
+        with capture_queries() as queries:
+            response = await self.get_response(request)
+        self.record(request, response, time.perf_counter() - start, queries)
+        return response
+
+    def record(self, request, response, duration, queries):
+        view = view_label(request)
+        method = request.method if request.method in HTTP_METHODS else 'other'
+        inc('siruinsk_http_requests_total', (('view', view), ('method', method), ('status', response.status_code)))
+        observe('siruinsk_http_request_duration_seconds', duration, (('view', view), ('method', method)))
+        if queries:
+            labels = (('view', view),)
+            inc('siruinsk_db_queries_total', labels, len(queries))
+            inc('siruinsk_db_query_duration_seconds_total', labels, sum(duration for _, duration in queries))
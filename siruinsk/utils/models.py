@@ -0,0 +1,70 @@
+import copy
+
+from django.db.models import DEFERRED
+from django.db.models.fields.files import FieldFile
+
+
+def _comparable_value(instance, field):
+    value = field.value_from_object(instance)
+    if isinstance(value, FieldFile):
+        return value.name or None
+    if isinstance(value, (dict, list)):
+        return copy.deepcopy(value)
+    return value
+
+
+class TrackedFieldsMixin:
+    """
+    Mixin model yang menyimpan snapshot nilai kolom saat instance dimuat dari
+    database, sehingga perubahan bisa diketahui tanpa query tambahan.
+
+    ``save()`` tanpa ``update_fields`` pada instance yang sudah ada hanya
+    menulis kolom yang berubah (ditambah kolom ``auto_now``); jika tidak ada
+    yang berubah, tidak ada query sama sekali.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._take_snapshot()
+        return instance
+
+    def _take_snapshot(self):
+        # Field yang di-defer (only()/defer()) tidak ada di __dict__ dan tidak dilacak
+        self._original_values = {
+            field.attname: _comparable_value(self, field)
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+        }
+
+    def get_original_value(self, field_name):
+        return self._original_values.get(self._meta.get_field(field_name).attname, DEFERRED)
+
+    def get_dirty_fields(self):
+        """ Nama field yang nilainya berbeda dari snapshot """
+        original = self._original_values
+        dirty = []
+        for field in self._meta.concrete_fields:
+            if field.primary_key or field.attname not in original:
+                continue
+            if field.attname not in self.__dict__:
+                continue
+            if _comparable_value(self, field) != original[field.attname]:
+                dirty.append(field.name)
+        return dirty
+
+    def has_changed(self, field_name):
+        return field_name in self.get_dirty_fields()
+
+    def save(self, *args, **kwargs):
+        tracked = not self._state.adding and hasattr(self, '_original_values')
+        if tracked and not args and kwargs.get('update_fields') is None:
+            update_fields = self.get_dirty_fields()
+            if update_fields:
+                update_fields += [
+                    field.name for field in self._meta.concrete_fields
+                    if getattr(field, 'auto_now', False) and field.name not in update_fields
+                ]
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
+        self._take_snapshot()
@@ -0,0 +1,243 @@
+"""
+Profiling per request untuk staff (opt-in lewat ``PROFILING_ENABLED``, token
+bertanda tangan).
+
+Staff meminta token lewat ``POST /api/profiling/token`` lalu mengirimnya di
+header ``X-Profile`` pada request yang ingin diprofil, bersama header
+Authorization (JWT) miliknya sendiri. Token ditandatangani ``SECRET_KEY``
+(``django.core.signing``), kedaluwarsa setelah ``PROFILING_TOKEN_MAX_AGE``
+detik, dan hanya berlaku jika request diautentikasi sebagai staff yang
+memintanya: token yang bocor tidak bisa dipakai klien lain. Token tidak
+diterima lewat query string agar tidak tercatat di access log.
+
+Worker sync (WSGI) memakai ``cProfile``; di worker ASGI view sync berjalan di
+thread lain, jadi dipakai sampling profiler yang membaca stack semua thread
+yang sedang menjalankan kode Django (request lain yang berjalan bersamaan di
+worker yang sama bisa ikut tersampel). Hasilnya disimpan di
+``CACHES['default']`` beserta daftar query SQL dan waktunya, dan response
+diberi header ``X-Profile-Id``. Request tanpa token hanya membayar satu cek
+``META``.
+"""
+import io
+import sys
+import threading
+import time
+import uuid
+import zlib
+from collections import Counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+from .instrumentation import capture_queries
+
+HEADER = 'HTTP_X_PROFILE'
+SALT = 'siruinsk.profiling'
+INDEX_KEY = 'profile_index'
+
+
+def make_token(user):
+    return signing.dumps({'u': user.pk}, salt=SALT)
+
+
+def _token_user_id(token):
+    try:
+        return signing.loads(token, salt=SALT, max_age=settings.PROFILING_TOKEN_MAX_AGE)['u']
+    except (signing.BadSignature, KeyError, TypeError):
+        return None
+
+
+def _request_user(request):
+    # Middleware ini berjalan sebelum autentikasi DRF, jadi JWT dibaca sendiri
+    try:
+        authenticated = JWTAuthentication().authenticate(request)
+    except (InvalidToken, AuthenticationFailed):
+        return None
+    return authenticated[0] if authenticated else None
+
+
+def _allowed(request, token):
+    """ Token hanya berlaku untuk request dari staff yang memintanya """
+    user_id = _token_user_id(token)
+    if user_id is None:
+        return False
+    user = _request_user(request)
+    return user is not None and user.pk == user_id and user.is_staff and user.is_active
+
+
+class SamplingProfiler:
+    """
+    Ambil stack semua thread setiap ``interval`` detik dari thread terpisah.
+    Hanya stack yang sedang menjalankan kode Django dihitung, sehingga thread
+    yang menganggur (event loop, thread pool) tidak mendominasi hasil.
+    """
+    def __init__(self, interval):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            self.samples += 1
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                relevant = False
+                while frame is not None:
+                    code = frame.f_code
+                    relevant = relevant or '/django/' in code.co_filename
+                    stack.append(f'{code.co_name} ({code.co_filename}:{frame.f_lineno})')
+                    frame = frame.f_back
+                if relevant:
+                    self.stacks[';'.join(reversed(stack))] += 1
+
+    def collapsed(self):
+        """ Format collapsed stack (``flamegraph.pl``, speedscope) """
+        return '\n'.join(f'{stack} {count}' for stack, count in self.stacks.most_common()) + '\n'
+
+    def top(self, limit=30):
+        """ Fungsi dengan sampel terbanyak di puncak stack (self time) """
+        leaves = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(';', 1)[-1]] += count
+        total = sum(leaves.values()) or 1
+        return '\n'.join(
+            f'{count:>6} {count / total:>6.1%}  {name}' for name, count in leaves.most_common(limit)
+        )
+
+
+def _entry_key(profile_id):
+    return f'profile_{profile_id}'
+
+
+def store(request, response, profiler, data, top, queries, elapsed):
+    profile_id = uuid.uuid4().hex[:16]
+    entry = {
+        'id': profile_id,
+        'method': request.method,
+        'path': request.get_full_path(),
+        'status': response.status_code,
+        'profiler': profiler,
+        'created': time.time(),
+        'total_ms': round(elapsed * 1000, 2),
+        'queries': len(queries),
+        'db_ms': round(sum(duration for _, duration in queries) * 1000, 2),
+        'sql': [{'sql': sql[:2000], 'ms': round(duration * 1000, 2)} for sql, duration in queries],
+        'top': top,
+        'data': zlib.compress(data),
+    }
+    cache.set(_entry_key(profile_id), entry, settings.PROFILING_RETENTION)
+
+    index = [item for item in cache.get(INDEX_KEY, []) if item != profile_id]
+    index.append(profile_id)
+    dropped, index = index[:-settings.PROFILING_MAX_STORED], index[-settings.PROFILING_MAX_STORED:]
+    cache.delete_many([_entry_key(item) for item in dropped])
+    cache.set(INDEX_KEY, index, settings.PROFILING_RETENTION)
+    return profile_id
+
+
+def get(profile_id):
+    return cache.get(_entry_key(profile_id))
+
+
+def download(entry):
+    """ ``(isi, ekstensi)`` file profil: pstats (``.prof``) atau collapsed stack (``.folded``) """
+    data = zlib.decompress(entry['data'])
+    return data, 'prof' if entry['profiler'] == 'cprofile' else 'folded'
+
+
+def summary():
+    """ Metadata profil tersimpan, terbaru dulu """
+    ids = cache.get(INDEX_KEY, [])
+    entries = cache.get_many([_entry_key(profile_id) for profile_id in ids])
+    return [
+        {name: value for name, value in entry.items() if name not in ('data', 'sql', 'top')}
+        for entry in sorted(entries.values(), key=lambda entry: entry['created'], reverse=True)
+    ]
+
+
+def reset():
+    ids = cache.get(INDEX_KEY, [])
+    cache.delete_many([_entry_key(profile_id) for profile_id in ids] + [INDEX_KEY])
+
+
+class ProfilingMiddleware:
+    """
+    Letakkan setelah ``QueryInstrumentationMiddleware`` agar waktu profil
+    mencakup middleware lain. Token diverifikasi sebelum profiler dijalankan.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = request.META.get(HEADER) if settings.PROFILING_ENABLED else None
+        if not token or not _allowed(request, token):
+            return self.get_response(request)
+
+        # Diimpor di sini: hanya request yang diprofil yang membutuhkannya
+        import cProfile
+        import marshal
+        import pstats
+
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        with capture_queries() as queries:
+            profile.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profile.disable()
+        elapsed = time.perf_counter() - start
+
+        profile.create_stats()
+        top = io.StringIO()
+        pstats.Stats(profile, stream=top).sort_stats('cumulative').print_stats(30)
+        profile_id = store(
+            request, response, 'cprofile', marshal.dumps(profile.stats), top.getvalue(), queries, elapsed
+        )
+        response['X-Profile-Id'] = profile_id
+        return response
+
+    async def __acall__(self, request):
+        token = request.META.get(HEADER) if settings.PROFILING_ENABLED else None
+        if not token or not await sync_to_async(_allowed)(request, token):
+            return await self.get_response(request)
+
+        profiler = SamplingProfiler(settings.PROFILING_SAMPLE_INTERVAL)
+        start = time.perf_counter()
+        with capture_queries() as queries:
+            profiler.start()
+            try:
+                response = await self.get_response(request)
+            finally:
+                profiler.stop()
+        elapsed = time.perf_counter() - start
+
+        profile_id = await sync_to_async(store)(
+            request, response, 'sampling', profiler.collapsed().encode(), profiler.top(), queries, elapsed
+        )
+        response['X-Profile-Id'] = profile_id
+        return response
@@ -0,0 +1,177 @@
+"""
+Budget jumlah query per endpoint untuk test suite.
+
+Setiap app mendeklarasikan daftar ``EndpointBudget`` (nama URL, metode HTTP,
+jumlah query maksimum) di ``tests.py`` dan membuat subclass
+``QueryBudgetTestCase``. Setiap endpoint dijalankan dengan 1 dan 50 baris data
+(dan ukuran halaman yang sama), sehingga query yang bertambah mengikuti jumlah
+baris (N+1) langsung gagal beserta daftar SQL-nya. Test juga memastikan setiap
+route di ``urls.py`` app tersebut punya budget.
+"""
+from unittest import mock
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, reverse
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+ROW_COUNTS = (1, 50)
+HTTP_METHODS = ('get', 'post', 'put', 'patch', 'delete')
+
+
+class EndpointBudget:
+    """
+    Budget satu endpoint. ``kwargs``, ``data`` dan ``query`` boleh berupa
+    callable yang menerima test case (data baris ada di ``test.rows``).
+    ``user`` adalah kunci di ``test.users`` atau ``None`` untuk anonim;
+    ``auth`` memilih JWT (default) atau session.
+    """
+    def __init__(self, name, method, max_queries, user='user', auth='jwt',
+                 kwargs=None, data=None, query=None, status=None):
+        self.name = name
+        self.method = method.lower()
+        self.max_queries = max_queries
+        self.user = user
+        self.auth = auth
+        self.kwargs = kwargs
+        self.data = data
+        self.query = query
+        self.status = status
+
+    def __repr__(self):
+        return f'{self.method.upper()} {self.name}'
+
+
+def _resolve(value, test):
+    return value(test) if callable(value) else value
+
+
+def _pattern_methods(pattern):
+    callback = pattern.callback
+    actions = getattr(callback, 'actions', None)
+    if actions:
+        # HEAD ditambahkan DRF saat view dipanggil, sama dengan GET
+        return set(actions) & set(HTTP_METHODS)
+    view_class = getattr(callback, 'view_class', None) or getattr(callback, 'cls', None)
+    if view_class is None:
+        return {'get'}
+    return {method for method in HTTP_METHODS if hasattr(view_class, method)}
+
+
+def iter_endpoints(patterns):
+    """
+    ``(nama, metode)`` semua endpoint di ``patterns``. Include ke urls app lain
+    (yang punya namespace) dilewati karena dicek oleh app itu sendiri; include
+    daftar pattern tanpa namespace (mis. ``router.urls``) ikut diperiksa.
+    """
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace is None and isinstance(pattern.urlconf_name, (list, tuple)):
+                yield from iter_endpoints(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            name = pattern.name or str(pattern.pattern)
+            for method in _pattern_methods(pattern):
+                yield name, method
+
+
+@override_settings(THROTTLE_STORE='cache')
+class QueryBudgetTestCase(APITestCase):
+    """
+    Subclass mengisi ``urls`` (modul urls app), ``namespace``, ``budgets``,
+    dan ``make_rows(count)`` yang membuat data dengan ``count`` baris per model.
+    """
+    urls = None
+    namespace = None
+    budgets = []
+    row_counts = ROW_COUNTS
+
+    def setUp(self):
+        cache.clear()
+        self.users = self.make_users()
+
+    def make_users(self):
+        from django.contrib.auth.models import User
+
+        return {
+            'user': User.objects.create_user(username='budget_user', password='pass12345'),
+            'staff': User.objects.create_user(username='budget_staff', password='pass12345', is_staff=True),
+        }
+
+    def make_rows(self, count):
+        raise NotImplementedError('.make_rows() must be overridden')
+
+    def authenticate(self, budget):
+        self.client.logout()
+        self.client.credentials()
+        user = self.users.get(budget.user) if budget.user else None
+        if user is None:
+            return
+        if budget.auth == 'session':
+            self.client.force_login(user)
+        else:
+            token = RefreshToken.for_user(user).access_token
+            self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def measure(self, budget, rows):
+        """ Jalankan endpoint dengan ``rows`` baris data; data di-rollback sesudahnya """
+        savepoint = transaction.savepoint()
+        try:
+            self.rows = self.make_rows(rows)
+            self.authenticate(budget)
+            name = f'{self.namespace}:{budget.name}' if self.namespace else budget.name
+            url = reverse(name, kwargs=_resolve(budget.kwargs, self))
+            query = _resolve(budget.query, self)
+            data = _resolve(budget.data, self)
+            cache.clear()
+
+            if query:
+                url = f'{url}?{urlencode(query)}'
+
+            with mock.patch.object(PageNumberPagination, 'page_size', rows), \
+                    CaptureQueriesContext(connection) as ctx:
+                response = getattr(self.client, budget.method)(url, data, format='json')
+        finally:
+            transaction.savepoint_rollback(savepoint)
+
+        if budget.status is not None:
+            self.assertEqual(response.status_code, budget.status, f'{budget}: {getattr(response, "data", "")}')
+        else:
+            self.assertLess(response.status_code, 400, f'{budget}: {getattr(response, "data", "")}')
+        return [query['sql'] for query in ctx.captured_queries]
+
+    def test_query_budgets(self):
+        if self.urls is None:
+            self.skipTest('Base class')
+        for budget in self.budgets:
+            with self.subTest(endpoint=repr(budget)):
+                counts = {}
+                for rows in self.row_counts:
+                    queries = self.measure(budget, rows)
+                    counts[rows] = len(queries)
+                    if len(queries) > budget.max_queries:
+                        self.fail(_report(budget, rows, queries))
+                smallest, largest = self.row_counts[0], self.row_counts[-1]
+                if counts[largest] > counts[smallest]:
+                    self.fail(
+                        f'{budget}: jumlah query naik dari {counts[smallest]} ({smallest} baris) '
+                        f'ke {counts[largest]} ({largest} baris)\n'
+                        + _report(budget, largest, self.measure(budget, largest))
+                    )
+
+    def test_budgets_cover_all_routes(self):
+        if self.urls is None:
+            self.skipTest('Base class')
+        declared = {(budget.name, budget.method) for budget in self.budgets}
+        missing = sorted(set(iter_endpoints(self.urls.urlpatterns)) - declared)
+        self.assertFalse(missing, f'Endpoint tanpa query budget: {missing}')
+
+
+def _report(budget, rows, queries):
+    lines = [f'{budget} ({rows} baris): {len(queries)} query, budget {budget.max_queries}']
+    lines += [f'  {index}. {sql}' for index, sql in enumerate(queries, start=1)]
+    return '\n'.join(lines)
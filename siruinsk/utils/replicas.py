@@ -0,0 +1,169 @@
+"""
+Routing baca ke read replica untuk request GET/HEAD/OPTIONS.
+
+``ReplicaRoutingMiddleware`` memilih satu replica per request aman dan
+menyimpannya di context variable; ``ReplicaRouter`` mengarahkan query baca
+model di ``REPLICA_APPS`` ke alias itu. Semua penulisan, dan semua query di
+request yang mengubah data, tetap ke ``default`` (primary).
+
+Read-your-writes: setelah request tulis yang berhasil, klien (dikenali dari
+id user di access token JWT, atau IP jika anonim) di-pin ke primary selama
+``REPLICA_STICKY_SECONDS`` agar tidak membaca replica yang tertinggal. Pin
+tetap berlaku setelah klien me-refresh access token (masa berlaku bawaan
+hanya 1 menit), karena kuncinya id user, bukan isi header. Pin
+disimpan di ``CACHES['default']`` dan harus terlihat oleh worker yang melayani
+request berikutnya, jadi middleware menolak start (``ImproperlyConfigured``)
+jika replica dikonfigurasi dengan cache per proses (LocMem/Dummy).
+
+Query yang hasilnya harus akurat (cek bentrok reservasi) memakai
+``.using(DEFAULT_DB_ALIAS)`` atau ``use_primary()`` secara eksplisit.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from .throttling import cache_is_process_local
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_read_alias = ContextVar('siruinsk_read_alias', default=None)
+
+
+def current_read_alias():
+    """ Alias replica untuk request saat ini, atau ``None`` jika memakai primary """
+    return _read_alias.get()
+
+
+@contextmanager
+def use_primary():
+    """ Paksa query baca di dalam blok ini ke primary """
+    token = _read_alias.set(None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+@contextmanager
+def use_replica(alias):
+    token = _read_alias.set(alias)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias and model._meta.app_label in settings.REPLICA_APPS:
+            return alias
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replica berisi data yang sama dengan primary
+        aliases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Skema replica mengikuti primary lewat replikasi
+        return db not in settings.DATABASE_REPLICAS
+
+
+def _user_id(request):
+    """
+    Id user dari access token JWT yang valid, tanpa query database (middleware
+    ini berjalan sebelum autentikasi DRF), atau ``None``
+    """
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else None
+    if raw_token is None:
+        return None
+    try:
+        return authentication.get_validated_token(raw_token).get(jwt_settings.USER_ID_CLAIM)
+    except InvalidToken:
+        return None
+
+
+def _pin_key(request):
+    user_id = _user_id(request)
+    if user_id is not None:
+        return f'replica_pin_user_{user_id}'
+    return f'replica_pin_ip_{request.META.get("REMOTE_ADDR", "")}'
+
+
+def read_alias(request):
+    """ Replica acak untuk request baca, ``None`` jika tanpa replica atau klien di-pin ke primary """
+    if not settings.DATABASE_REPLICAS or cache.get(_pin_key(request)):
+        return None
+    return random.choice(settings.DATABASE_REPLICAS)
+
+
+async def aread_alias(request):
+    if not settings.DATABASE_REPLICAS or await cache.aget(_pin_key(request)):
+        return None
+    return random.choice(settings.DATABASE_REPLICAS)
+
+
+def _pins(request, response):
+    # Request tulis yang ternyata hanya membaca (batch GET, lihat utils/batch.py) tidak mem-pin
+    return response.status_code < 400 and not getattr(request, 'replica_read_only', False)
+
+
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+        if settings.DATABASE_REPLICAS and cache_is_process_local():
+            raise ImproperlyConfigured(
+                'DB_REPLICA_HOSTS membutuhkan cache yang dibagi antar worker (CACHE_BACKEND Redis/Memcached/'
+                'file/database) untuk pin read-your-writes; dengan LocMem/Dummy klien bisa membaca replica '
+                'yang tertinggal tepat setelah menulis.'
+            )
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        if request.method in SAFE_METHODS:
+            with use_replica(read_alias(request)):
+                return self.get_response(request)
+
+        response = self.get_response(request)
+        if _pins(request, response):
+            cache.set(_pin_key(request), True, settings.REPLICA_STICKY_SECONDS)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return await self.get_response(request)
+
+        if request.method in SAFE_METHODS:
+            with use_replica(await aread_alias(request)):
+                return await self.get_response(request)
+
+        response = await self.get_response(request)
+        if _pins(request, response):
+            await cache.aset(_pin_key(request), True, settings.REPLICA_STICKY_SECONDS)
+        return response
@@ -0,0 +1,190 @@
+"""
+Jalur baca cepat untuk action list: ``values_list()`` + mapper baris ke dict
+yang dikompilasi sekali dari ``ModelSerializer``.
+
+Serializer biasa membuat instance model untuk setiap baris (beserta relasi
+``select_related``) lalu menelusuri atribut per field (``requester.username``,
+``room.location.name``). Di sini kolom yang dibutuhkan field serializer
+(termasuk kolom tabel relasi) diproyeksikan langsung di SQL dan setiap baris
+tuple diubah ke dict oleh fungsi yang dibangkitkan khusus untuk serializer
+itu: indeks kolom, konversi (mis. ``DateTimeField.to_representation``), dan
+field yang dilewati saat relasi nullable kosong sudah ditentukan saat
+kompilasi.
+
+Hasilnya sama dengan ``serializer.data`` (urutan key, ``None``, field yang
+di-skip DRF saat ``requester`` kosong), sehingga respons identik byte demi
+byte. Serializer tetap dipakai untuk create/update/retrieve. Field yang tidak
+bisa dipetakan ke kolom (``SerializerMethodField``, ``source='*'``, relasi
+many, nested serializer) ditolak saat kompilasi.
+"""
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.fields import empty
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+# Field yang to_representation-nya tidak mengubah nilai dari database
+_IDENTITY_FIELDS = (serializers.CharField, serializers.EmailField, serializers.IntegerField)
+
+
+def _datetime_iso(value, tz):
+    # DateTimeField.to_representation (ISO 8601) dengan timezone aktif yang
+    # sudah dibaca sekali per halaman, bukan sekali per nilai
+    value = value.astimezone(tz).isoformat()
+    return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+
+class RowMapper:
+    """ Kolom ``values_list`` dan fungsi ``map_row(tuple, tz) -> dict`` untuk satu serializer """
+
+    def __init__(self, serializer_class, fields=None):
+        self.serializer_class = serializer_class
+        self.fields = fields
+        self.model = serializer_class.Meta.model
+        self.columns = []
+        self.source = ''
+        self.map_row = self._compile()
+
+    def _column(self, lookup):
+        if lookup not in self.columns:
+            self.columns.append(lookup)
+        return self.columns.index(lookup)
+
+    def _guards(self, field):
+        """ Kolom FK nullable di sepanjang ``source``; jika kosong DRF tidak membaca field ini """
+        guards = []
+        model = self.model
+        for depth, attr in enumerate(field.source_attrs[:-1], start=1):
+            model_field = model._meta.get_field(attr)
+            if not isinstance(model_field, models.ForeignKey):
+                raise ImproperlyConfigured(f'{self._name(field)}: hanya relasi ForeignKey yang didukung')
+            if model_field.null:
+                guards.append(self._column('__'.join(field.source_attrs[:depth])))
+            model = model_field.related_model
+        return guards
+
+    def _name(self, field):
+        return f'{self.serializer_class.__name__}.{field.field_name}'
+
+    def _is_identity(self, field):
+        if isinstance(field, serializers.PrimaryKeyRelatedField) or type(field) in _IDENTITY_FIELDS:
+            return True
+        # Pilihan string (mis. status) dikembalikan apa adanya oleh ChoiceField
+        return type(field) is serializers.ChoiceField and all(
+            key == value for key, value in field.choice_strings_to_values.items()
+        )
+
+    def _is_iso_datetime(self, field):
+        return (
+            settings.USE_TZ and type(field) is serializers.DateTimeField and not hasattr(field, 'timezone')
+            and getattr(field, 'format', api_settings.DATETIME_FORMAT).lower() == ISO_8601
+        )
+
+    def _compile(self):
+        namespace = {'datetime_iso': _datetime_iso}
+        items = []
+        for field in self.serializer_class()._readable_fields:
+            if self.fields is not None and field.field_name not in self.fields:
+                continue
+            if (
+                field.source == '*' or isinstance(field, (
+                    serializers.SerializerMethodField, serializers.ManyRelatedField, serializers.BaseSerializer,
+                ))
+                or isinstance(field, serializers.RelatedField) and (
+                    not isinstance(field, serializers.PrimaryKeyRelatedField) or field.pk_field is not None
+                    or len(field.source_attrs) != 1
+                )
+            ):
+                raise ImproperlyConfigured(f'{self._name(field)} tidak bisa dipetakan ke kolom')
+
+            index = self._column('__'.join(field.source_attrs))
+            guards = self._guards(field)
+            if self._is_identity(field):
+                value = f'row[{index}]'
+            elif self._is_iso_datetime(field):
+                value = f'None if row[{index}] is None else datetime_iso(row[{index}], tz)'
+            else:
+                converter = f'convert_{index}'
+                namespace[converter] = field.to_representation
+                value = f'None if row[{index}] is None else {converter}(row[{index}])'
+
+            condition = None
+            if guards:
+                # Sama dengan Field.get_attribute: relasi kosong -> default,
+                # None (allow_null), atau field dilewati (tidak required)
+                if field.default is not empty:
+                    raise ImproperlyConfigured(f'{self._name(field)}: default tidak didukung')
+                test = ' and '.join(f'row[{guard}] is not None' for guard in guards)
+                if field.allow_null:
+                    value = f'({value}) if {test} else None'
+                elif not field.required:
+                    condition = test
+                else:
+                    raise ImproperlyConfigured(f'{self._name(field)}: relasi nullable pada field wajib')
+            items.append((condition, repr(field.field_name), value))
+
+        # Field di depan yang selalu ada masuk ke literal dict, field bersyarat
+        # dengan kondisi yang sama dikelompokkan dalam satu if
+        leading = 0
+        while leading < len(items) and items[leading][0] is None:
+            leading += 1
+        literal = ', '.join(f'{key}: {value}' for _, key, value in items[:leading])
+        lines = ['def map_row(row, tz):', f'    data = {{{literal}}}']
+        previous = None
+        for condition, key, value in items[leading:]:
+            if condition is None:
+                lines.append(f'    data[{key}] = {value}')
+            else:
+                if condition != previous:
+                    lines.append(f'    if {condition}:')
+                lines.append(f'        data[{key}] = {value}')
+            previous = condition
+        lines.append('    return data')
+
+        self.source = '\n'.join(lines)
+        exec(compile(self.source, f'<row_mapper {self.serializer_class.__name__}>', 'exec'), namespace)
+        return namespace['map_row']
+
+    def map_rows(self, rows):
+        map_row = self.map_row
+        tz = timezone.get_current_timezone()
+        return [map_row(row, tz) for row in rows]
+
+
+@lru_cache(maxsize=256)
+def get_mapper(serializer_class, fields=None):
+    """
+    ``RowMapper`` untuk serializer ini (atau sebagian field-nya, tuple urut
+    serializer), dikompilasi sekali per proses
+    """
+    return RowMapper(serializer_class, fields)
+
+
+class ValuesListMixin:
+    """
+    Mixin viewset: ``list`` membaca lewat ``values_list`` dan ``RowMapper``
+    dari ``get_serializer_class()``, dengan filter dan paginasi yang sama.
+    """
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.values_list_queryset(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.map_rows(page))
+        return Response(self.map_rows(queryset))
+
+    def get_row_mapper(self):
+        # Dengan SparseFieldsMixin (?fields=/?exclude=) hanya kolom field yang diminta dibaca
+        fields = self.get_sparse_fields() if hasattr(self, 'get_sparse_fields') else None
+        return get_mapper(self.get_serializer_class(), fields)
+
+    def values_list_queryset(self, queryset):
+        return queryset.values_list(*self.get_row_mapper().columns)
+
+    def map_rows(self, rows):
+        return self.get_row_mapper().map_rows(rows)
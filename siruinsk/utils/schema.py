@@ -0,0 +1,108 @@
+"""
+Dokumentasi OpenAPI (Swagger UI dan ReDoc) dengan schema yang dihitung sekali.
+
+Membangun schema drf_yasg berarti menginspeksi semua viewset dan serializer,
+jadi hasilnya disimpan: dibaca dari file hasil ``manage.py generate_schema``
+(``OPENAPI_SCHEMA_FILE``, dibuat saat build image di ``Dockerfile``), atau
+dibangun saat pertama diminta lalu disimpan di memori proses. Schema bersifat
+publik (sama untuk semua staff) dan tidak bergantung pada host request.
+
+``drf_yasg`` baru diimpor saat halaman dokumentasi pertama kali diakses,
+sehingga worker yang tidak pernah melayani dokumentasi tidak memuatnya.
+
+Karena schema tidak bergantung pada request, ``generate()`` memanggil
+generator dengan ``request=None``: setiap viewset (dan mixin-nya) harus
+tetap bisa membangun serializer saat ``self.request`` bernilai ``None`` atau
+``swagger_fake_view`` aktif, seperti ``SparseFieldsMixin.get_sparse_fields``.
+Jika tidak, drf_yasg diam-diam menghilangkan body dan definisi respons
+endpoint tersebut.
+"""
+import os
+
+from django.conf import settings
+
+UI_RENDERERS = ('swagger', 'redoc')
+
+_rendered = {}
+_views = {}
+
+
+def _info():
+    from drf_yasg import openapi
+
+    return openapi.Info(
+        title="Teknohole API",
+        default_version='v1',
+        description="Dokumentasi REST API Teknohole",
+        contact=openapi.Contact(email="teknohole@gmail.com"),
+    )
+
+
+def generate(renderer_class=None):
+    """ Schema dalam format ``renderer_class`` (default JSON ``application/openapi+json``) """
+    from drf_yasg.generators import OpenAPISchemaGenerator
+    from drf_yasg.renderers import OpenAPIRenderer
+
+    generator = OpenAPISchemaGenerator(_info(), version='v1')
+    schema = generator.get_schema(request=None, public=True)
+    return (renderer_class or OpenAPIRenderer)().render(schema)
+
+
+def rendered(renderer_class):
+    """ Schema yang sudah di-render untuk format renderer ini, dari file atau memori """
+    content = _rendered.get(renderer_class.format)
+    if content is None:
+        path = settings.OPENAPI_SCHEMA_FILE
+        if renderer_class.format in ('openapi', 'json') and path and os.path.exists(path):
+            with open(path, 'rb') as f:
+                content = f.read()
+        else:
+            content = generate(renderer_class)
+        _rendered[renderer_class.format] = content
+    return content
+
+
+def _schema_view_class():
+    from django.http import HttpResponse
+    from drf_yasg.renderers import _SpecRenderer
+    from drf_yasg.views import get_schema_view
+    from rest_framework.authentication import SessionAuthentication
+
+    from utils.permissions import IsSwaggerAllowed
+
+    base = get_schema_view(
+        _info(),
+        public=True,
+        permission_classes=[IsSwaggerAllowed],
+        authentication_classes=[SessionAuthentication],
+    )
+
+    class CachedSchemaView(base):
+        def get(self, request, version='', format=None):
+            renderer = request.accepted_renderer
+            # Halaman UI sendiri murah (tanpa pattern); schema diambil
+            # browser lewat ?format=openapi
+            if not isinstance(renderer, _SpecRenderer):
+                return super().get(request, version, format)
+            return HttpResponse(rendered(type(renderer)), content_type=f'{renderer.media_type}; charset=utf-8')
+
+    return CachedSchemaView
+
+
+def ui_view(renderer):
+    """ View Swagger UI / ReDoc yang membangun view drf_yasg saat request pertama """
+    assert renderer in UI_RENDERERS
+
+    def view(request, *args, **kwargs):
+        real_view = _views.get(renderer)
+        if real_view is None:
+            real_view = _views[renderer] = _schema_view_class().with_ui(renderer, cache_timeout=0)
+        return real_view(request, *args, **kwargs)
+
+    view.csrf_exempt = True
+    return view
+
+
+def reset():
+    _rendered.clear()
+    _views.clear()
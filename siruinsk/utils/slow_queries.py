@@ -0,0 +1,182 @@
+"""
+Slow query log (opt-in, ``SLOW_QUERY_LOG=True``).
+
+Setiap statement yang lebih lama dari ``SLOW_QUERY_THRESHOLD_MS`` ditulis ke
+logger ``siruinsk.slow_query`` beserta tipe parameter, view, dan baris kode
+pemanggilnya. Nilai parameter tidak pernah dicatat (bisa berisi hash password,
+refresh token, atau email); SQL yang disimpan sudah dinormalisasi. Statement dikelompokkan per fingerprint (SQL yang dinormalisasi:
+literal dan daftar ``IN (...)`` diganti), dan ringkasannya (jumlah, total dan
+waktu maksimum, rencana ``EXPLAIN``) disimpan di ``CACHES['default']`` untuk
+dibaca staff lewat ``/api/slow-queries``. ``EXPLAIN`` dijalankan sekali per
+fingerprint di worker lokal (``siruinsk/utils/tasks.py``), di luar request.
+
+Dengan beberapa worker gunicorn, ringkasan hanya lengkap jika cache dibagi
+antar proses (Redis/Memcached).
+"""
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+import traceback
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+from . import tasks
+
+logger = logging.getLogger('siruinsk.slow_query')
+
+INDEX_KEY = 'slow_query_index'
+_guard = threading.local()
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\bIN\s*\((?:\s*(?:%s|\?)\s*,?)+\)', re.IGNORECASE)
+_SPACES = re.compile(r'\s+')
+
+
+def normalize_sql(sql):
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = _IN_LIST.sub('IN (...)', sql)
+    return _SPACES.sub(' ', sql).strip()
+
+
+def fingerprint(sql):
+    return hashlib.sha1(normalize_sql(sql).encode()).hexdigest()[:16]
+
+
+def param_types(params, many=False):
+    """ Tipe parameter terikat saja, tanpa nilainya """
+    if params is None:
+        return []
+    if many:
+        params = next(iter(params), ())
+    if isinstance(params, dict):
+        return {name: type(value).__name__ for name, value in params.items()}
+    return [type(value).__name__ for value in params]
+
+
+def _entry_key(digest):
+    return f'slow_query_{digest}'
+
+
+_INTERNAL_MODULES = ('slow_queries.py', 'instrumentation.py', 'replicas.py')
+
+
+def _caller_frame():
+    """
+    Frame terdalam di kode proyek. Jika query berasal dari library (mis.
+    count pagination DRF), pakai frame terdalam di luar Django.
+    """
+    base_dir = str(settings.BASE_DIR)
+    library_frame = None
+    for frame in reversed(traceback.extract_stack()[:-1]):
+        filename = frame.filename
+        if 'site-packages' in filename:
+            relative = filename.split('site-packages', 1)[1].lstrip('/\\')
+            if library_frame is None and not relative.startswith(('django/', 'django\\')):
+                library_frame = f'{relative}:{frame.lineno} in {frame.name}'
+            continue
+        if not filename.startswith(base_dir) or filename.endswith(_INTERNAL_MODULES):
+            continue
+        return f'{filename[len(base_dir) + 1:]}:{frame.lineno} in {frame.name}'
+    return library_frame
+
+
+def _current_view():
+    from .instrumentation import current_request
+
+    request = current_request()
+    if request is None:
+        return None
+    match = getattr(request, 'resolver_match', None)
+    view = match.view_name if match else None
+    return f'{request.method} {request.path}' + (f' ({view})' if view else '')
+
+
+def record(connection, sql, params, many, duration):
+    # Query milik slow query log sendiri (EXPLAIN, cache berbasis database)
+    # tidak dicatat lagi
+    if getattr(_guard, 'active', False):
+        return
+    _guard.active = True
+    try:
+        _record(connection, sql, params, many, duration)
+    finally:
+        _guard.active = False
+
+
+def _record(connection, sql, params, many, duration):
+    normalized = normalize_sql(sql)
+    digest = hashlib.sha1(normalized.encode()).hexdigest()[:16]
+    duration_ms = round(duration * 1000, 2)
+    event = {
+        'fingerprint': digest,
+        'ms': duration_ms,
+        'sql': normalized[:2000],
+        'param_types': param_types(params, many),
+        'database': connection.alias,
+        'view': _current_view(),
+        'frame': _caller_frame(),
+    }
+    logger.warning(json.dumps(event))
+
+    key = _entry_key(digest)
+    entry = cache.get(key)
+    if entry is None:
+        entry = {
+            'fingerprint': digest,
+            'normalized_sql': normalized[:2000],
+            'count': 0,
+            'total_ms': 0.0,
+            'max_ms': 0.0,
+            'explain': None,
+        }
+    entry['count'] += 1
+    entry['total_ms'] = round(entry['total_ms'] + duration_ms, 2)
+    entry['max_ms'] = max(entry['max_ms'], duration_ms)
+    entry['last_seen'] = time.time()
+    entry.update({name: event[name] for name in ('sql', 'param_types', 'view', 'frame')})
+    cache.set(key, entry, settings.SLOW_QUERY_RETENTION)
+
+    index = cache.get(INDEX_KEY, set())
+    if digest not in index:
+        index.add(digest)
+        cache.set(INDEX_KEY, index, settings.SLOW_QUERY_RETENTION)
+        if settings.SLOW_QUERY_EXPLAIN and not many and sql.lstrip()[:6].upper() == 'SELECT':
+            tasks.submit(capture_explain, connection.alias, sql, params, digest)
+
+
+def capture_explain(alias, sql, params, digest):
+    """ Jalankan ``EXPLAIN`` (tanpa ANALYZE, query tidak dieksekusi ulang) dan simpan hasilnya """
+    connection = connections[alias]
+    _guard.active = True
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}', params)
+            plan = '\n'.join(' '.join(str(column) for column in row) for row in cursor.fetchall())
+
+        key = _entry_key(digest)
+        entry = cache.get(key)
+        if entry is not None:
+            entry['explain'] = plan
+            cache.set(key, entry, settings.SLOW_QUERY_RETENTION)
+    finally:
+        _guard.active = False
+
+
+def summary():
+    """ Ringkasan semua fingerprint, diurutkan dari total waktu terbesar """
+    digests = cache.get(INDEX_KEY, set())
+    entries = cache.get_many([_entry_key(digest) for digest in digests]).values()
+    return sorted(entries, key=lambda entry: entry['total_ms'], reverse=True)
+
+
+def reset():
+    digests = cache.get(INDEX_KEY, set())
+    cache.delete_many([_entry_key(digest) for digest in digests] + [INDEX_KEY])
@@ -0,0 +1,138 @@
+"""
+Sparse fieldset untuk request baca: ``?fields=id,room_name,start`` dan/atau
+``?exclude=requester_email``.
+
+Selain memangkas field serializer, pemangkasan diteruskan ke query: kolom
+yang dibaca dibatasi dengan ``only()`` dan ``select_related`` hanya untuk
+relasi yang dipakai field yang diminta, sehingga join dan kolom yang tidak
+diperlukan tidak diambil sama sekali. Anotasi untuk field yang dihitung
+(mis. ``rating`` ruangan) didaftarkan di ``sparse_annotations`` dan hanya
+ditambahkan jika field itu diminta.
+
+Hanya berlaku untuk GET/HEAD; respons create/update selalu lengkap. Nama
+field yang tidak dikenal menghasilkan 400.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+FIELDS_PARAM = 'fields'
+EXCLUDE_PARAM = 'exclude'
+READ_METHODS = ('GET', 'HEAD')
+
+_readable_fields = {}
+
+
+def readable_fields(serializer_class):
+    """ Field yang dibaca serializer, urut sesuai deklarasi (dibangun sekali per class) """
+    fields = _readable_fields.get(serializer_class)
+    if fields is None:
+        fields = _readable_fields[serializer_class] = tuple(serializer_class()._readable_fields)
+    return fields
+
+
+def _param(request, name):
+    values = request.query_params.getlist(name)
+    return [item.strip() for value in values for item in value.split(',') if item.strip()]
+
+
+def requested_fields(request, serializer_class):
+    """ Tuple nama field yang diminta (urut serializer), atau ``None`` jika tidak dibatasi """
+    include, exclude = _param(request, FIELDS_PARAM), _param(request, EXCLUDE_PARAM)
+    if not include and not exclude:
+        return None
+    available = [field.field_name for field in readable_fields(serializer_class)]
+    errors = {}
+    for param, names in ((FIELDS_PARAM, include), (EXCLUDE_PARAM, exclude)):
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            errors[param] = [f'Unknown field: {name}' for name in unknown]
+    if errors:
+        raise ValidationError(errors)
+    return tuple(name for name in available if (not include or name in include) and name not in exclude)
+
+
+def _paths(model, field):
+    """ ``(lookup kolom, relasi select_related)`` untuk satu field, ``None`` jika bukan kolom """
+    if field.source == '*' or isinstance(field, (serializers.BaseSerializer, serializers.ManyRelatedField)):
+        return None
+    attrs = field.source_attrs
+    relations = []
+    try:
+        for depth, attr in enumerate(attrs, start=1):
+            model_field = model._meta.get_field(attr)
+            if depth == len(attrs):
+                break
+            if not isinstance(model_field, models.ForeignKey):
+                return None
+            relations.append('__'.join(attrs[:depth]))
+            model = model_field.related_model
+    except FieldDoesNotExist:
+        return None
+    if model_field.is_relation and not isinstance(field, serializers.PrimaryKeyRelatedField):
+        # Field biasa yang membaca objek relasi utuh (mis. str(room))
+        return None
+    return '__'.join(attrs), relations
+
+
+def prune_queryset(queryset, serializer_class, fields, computed=()):
+    """
+    ``only()`` dan ``select_related`` sebatas field yang diminta. Field di
+    ``computed`` (anotasi) tidak butuh kolom; jika ada field lain yang tidak
+    bisa dipetakan ke kolom (``SerializerMethodField``, properti model),
+    queryset dikembalikan apa adanya.
+    """
+    columns, relations = [], []
+    for field in readable_fields(serializer_class):
+        if field.field_name not in fields or field.field_name in computed:
+            continue
+        paths = _paths(queryset.model, field)
+        if paths is None:
+            return queryset
+        columns.append(paths[0])
+        relations += [relation for relation in paths[1] if relation not in relations]
+    queryset = queryset.select_related(None)
+    if relations:
+        # select_related() tanpa argumen berarti semua relasi
+        queryset = queryset.select_related(*relations)
+    return queryset.only(*columns or [queryset.model._meta.pk.name])
+
+
+class SparseFieldsMixin:
+    """
+    Mixin untuk ``GenericAPIView``/viewset: ``?fields=``/``?exclude=`` memangkas
+    serializer (``get_serializer``) dan query (``filter_queryset``).
+    """
+    # {nama field: fungsi(queryset) -> queryset} untuk field hasil anotasi
+    sparse_annotations = {}
+
+    def get_sparse_fields(self):
+        # Generator schema memanggil view tanpa request (lihat utils/schema.py)
+        if getattr(self, 'swagger_fake_view', False) or self.request is None:
+            return None
+        if self.request.method not in READ_METHODS:
+            return None
+        if not hasattr(self, '_sparse_fields'):
+            self._sparse_fields = requested_fields(self.request, self.get_serializer_class())
+        return self._sparse_fields
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            target = getattr(serializer, 'child', serializer)
+            for name in list(target.fields):
+                if name not in fields:
+                    del target.fields[name]
+        return serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields = self.get_sparse_fields()
+        for name, annotate in self.sparse_annotations.items():
+            if fields is None or name in fields:
+                queryset = annotate(queryset)
+        if fields is not None:
+            queryset = prune_queryset(queryset, self.get_serializer_class(), fields, self.sparse_annotations)
+        return queryset
@@ -0,0 +1,61 @@
+"""
+Worker lokal berbasis thread pool untuk pekerjaan yang tidak perlu menahan
+response, misalnya membuat rendition gambar profil.
+
+Pekerjaan hidup di memori proses worker gunicorn; jika proses mati sebelum
+pekerjaan selesai, pekerjaan itu hilang. Jangan dipakai untuk hal yang wajib
+terjadi (gunakan transaksi database untuk itu).
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_lock = threading.Lock()
+_pending = 0
+
+
+def _run(fn, args, kwargs):
+    global _pending
+    try:
+        fn(*args, **kwargs)
+    except Exception:
+        logger.exception('Background task %s gagal', getattr(fn, '__name__', fn))
+    finally:
+        # Koneksi database milik thread worker tidak ikut siklus request Django
+        connections.close_all()
+        with _lock:
+            _pending -= 1
+            metrics.set_gauge('siruinsk_background_tasks_pending', _pending)
+
+
+def submit(fn, *args, **kwargs):
+    """
+    Jalankan ``fn(*args, **kwargs)`` di thread worker lokal. Dengan
+    ``BACKGROUND_TASKS_EAGER=True`` (mis. saat test) dijalankan langsung.
+    """
+    global _executor, _pending
+    if settings.BACKGROUND_TASKS_EAGER:
+        fn(*args, **kwargs)
+        return
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.BACKGROUND_TASK_WORKERS,
+                thread_name_prefix='siruinsk-task',
+            )
+        _pending += 1
+        metrics.set_gauge('siruinsk_background_tasks_pending', _pending)
+    _executor.submit(_run, fn, args, kwargs)
+
+
+def pending_count():
+    """ Jumlah pekerjaan yang sedang antre atau berjalan di proses ini """
+    return _pending
@@ -0,0 +1,32 @@
+"""
+Test runner ``manage.py test`` (``TEST_RUNNER`` di settings).
+
+File state yang di produksi dibagi antar worker (bucket throttle SQLite,
+file counter metrik) diarahkan ke direktori sementara yang dihapus setelah
+run, sehingga tidak tertinggal di working tree atau ``/tmp`` dan tidak
+terbawa ke run berikutnya.
+"""
+import os
+import tempfile
+
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._state_dir = tempfile.TemporaryDirectory(prefix='siruinsk-test-')
+        self._state_settings = override_settings(**self.state_settings(self._state_dir.name))
+        self._state_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._state_settings.disable()
+        self._state_dir.cleanup()
+        super().teardown_test_environment(**kwargs)
+
+    def state_settings(self, path):
+        return {
+            'THROTTLE_SQLITE_PATH': os.path.join(path, 'throttle.sqlite3'),
+            'METRICS_DIR': os.path.join(path, 'metrics'),
+        }
@@ -0,0 +1,206 @@
+"""
+Throttle token bucket untuk endpoint autentikasi (login, registrasi, reset password).
+
+State bucket dibagi antar worker gunicorn lewat cache yang dikonfigurasi, atau
+lewat file SQLite kecil jika tidak ada cache server (lihat ``THROTTLE_STORE``).
+Throttle dijalankan DRF di ``APIView.initial()`` sehingga permintaan yang
+ditolak tidak pernah menyentuh database aplikasi maupun hashing password.
+"""
+import hashlib
+import random
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def cache_is_process_local(alias='default'):
+    """ True jika cache ``alias`` tidak dibagi antar worker (LocMem/Dummy) """
+    return settings.CACHES[alias]['BACKEND'] in PROCESS_LOCAL_CACHES
+
+
+class CacheBucketStore:
+    """
+    Bucket disimpan di Django cache sebagai tuple (tokens, last_refill).
+    Baca-lalu-tulis tidak atomik, sehingga pada request yang benar-benar
+    bersamaan beberapa token bisa lolos; untuk throttle login hal ini cukup.
+    """
+    def __init__(self, alias='default'):
+        self.cache = caches[alias]
+
+    def consume(self, key, capacity, refill_rate, now):
+        tokens, updated = self.cache.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * refill_rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        # Bucket yang penuh kembali tidak perlu disimpan lebih lama dari ini
+        timeout = int((capacity - tokens) / refill_rate) + 1
+        self.cache.set(key, (tokens, now), timeout)
+        return allowed, tokens
+
+    def clear(self):
+        self.cache.clear()
+
+
+class SQLiteBucketStore:
+    """
+    Bucket disimpan di file SQLite lokal yang dibagi semua worker di host yang sama.
+    ``BEGIN IMMEDIATE`` mengunci file selama satu transaksi pendek sehingga
+    pembaruan bucket atomik antar proses.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=1, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=OFF')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS bucket '
+                '(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)'
+            )
+            self._local.conn = conn
+        return conn
+
+    def consume(self, key, capacity, refill_rate, now):
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT tokens, updated FROM bucket WHERE key = ?', (key,)).fetchone()
+            tokens, updated = row if row else (capacity, now)
+            tokens = min(capacity, tokens + (now - updated) * refill_rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            conn.execute(
+                'INSERT OR REPLACE INTO bucket (key, tokens, updated) VALUES (?, ?, ?)',
+                (key, tokens, now),
+            )
+            # Sesekali buang bucket yang sudah lama tidak dipakai
+            if random.random() < 0.001:
+                conn.execute('DELETE FROM bucket WHERE updated < ?', (now - 86400,))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return allowed, tokens
+
+    def clear(self):
+        self._connection().execute('DELETE FROM bucket')
+
+
+_store = None
+
+
+def get_bucket_store():
+    global _store
+    if _store is None:
+        backend = settings.THROTTLE_STORE
+        if backend == 'auto':
+            backend = 'sqlite' if cache_is_process_local() else 'cache'
+        if backend == 'cache':
+            _store = CacheBucketStore()
+        elif backend == 'sqlite':
+            _store = SQLiteBucketStore(settings.THROTTLE_SQLITE_PATH)
+        else:
+            raise ImproperlyConfigured(f"THROTTLE_STORE tidak dikenal: '{backend}'")
+    return _store
+
+
+@receiver(setting_changed)
+def reset_bucket_store(setting, **kwargs):
+    global _store
+    if setting in ('THROTTLE_STORE', 'THROTTLE_SQLITE_PATH', 'CACHES'):
+        _store = None
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Throttle token bucket berbasis ``throttle_scope`` milik view.
+
+    Rate dibaca dari ``DEFAULT_THROTTLE_RATES['<throttle_scope>_<kind>']`` dengan
+    format ``"jumlah/periode"``: kapasitas bucket = jumlah, dan bucket terisi
+    kembali penuh dalam satu periode. Rate ``None`` menonaktifkan throttle.
+    """
+    kind = None
+    timer = time.time
+
+    def get_ident_value(self, request, view):
+        raise NotImplementedError('.get_ident_value() must be overridden')
+
+    def parse_rate(self, rate):
+        num, period = rate.split('/')
+        duration = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}[period[0]]
+        return int(num), duration
+
+    def allow_request(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        if not scope:
+            return True
+
+        rate_key = f'{scope}_{self.kind}'
+        try:
+            rate = api_settings.DEFAULT_THROTTLE_RATES[rate_key]
+        except KeyError:
+            raise ImproperlyConfigured(f"No default throttle rate set for '{rate_key}' scope")
+        if rate is None:
+            return True
+
+        ident = self.get_ident_value(request, view)
+        if not ident:
+            return True
+
+        capacity, duration = self.parse_rate(rate)
+        self.refill_rate = capacity / duration
+        digest = hashlib.sha256(ident.encode()).hexdigest()[:32]
+        key = f'throttle_bucket_{rate_key}_{digest}'
+
+        allowed, self.tokens = get_bucket_store().consume(key, capacity, self.refill_rate, self.timer())
+        return allowed
+
+    def wait(self):
+        return (1 - self.tokens) / self.refill_rate
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    """ Bucket per alamat IP klien """
+    kind = 'ip'
+
+    def get_ident_value(self, request, view):
+        return self.get_ident(request)
+
+
+class IdentifierTokenBucketThrottle(TokenBucketThrottle):
+    """
+    Bucket per identifier akun (username/email) yang dikirim klien, diambil dari
+    field ``view.throttle_identifier_field``. Mencegah satu akun ditebak dari banyak IP.
+    """
+    kind = 'identifier'
+
+    def get_ident_value(self, request, view):
+        field = getattr(view, 'throttle_identifier_field', None)
+        if not field:
+            return None
+        try:
+            value = request.data.get(field)
+        except AttributeError:
+            return None
+        if not isinstance(value, str):
+            return None
+        return value.strip().lower()
@@ -0,0 +1,84 @@
+"""
+Pemanasan proses worker sebelum menerima request (dipanggil dari hook
+gunicorn, lihat ``gunicorn.conf.py``).
+
+Tanpa ini request pertama setiap worker membayar pekerjaan lazy Django/DRF:
+memuat urlconf dan meng-compile regex semua route, mengisi cache ``_meta``
+model lewat field serializer (dan mengompilasi ``RowMapper`` untuk list),
+mengimpor class dari ``api_settings`` DRF, dan memuat katalog terjemahan
+(pesan error DRF memakai ``gettext``). Tidak menyentuh database, jadi aman
+dijalankan di master sebelum fork (``preload_app``): worker mewarisi
+hasilnya.
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.urls import URLPattern, URLResolver, get_resolver
+from django.utils import translation
+
+from .row_mapper import ValuesListMixin, get_mapper
+
+logger = logging.getLogger(__name__)
+
+_done = False
+
+
+def _walk(resolver):
+    """ Isi ``reverse_dict`` dan compile regex semua route, termasuk include """
+    resolver.reverse_dict
+    for pattern in resolver.url_patterns:
+        pattern.pattern.regex
+        if isinstance(pattern, URLResolver):
+            yield from _walk(pattern)
+        elif isinstance(pattern, URLPattern):
+            yield pattern
+
+
+def _prime_serializers(patterns):
+    seen = set()
+    for pattern in patterns:
+        view_class = getattr(pattern.callback, 'cls', None)
+        serializer_class = getattr(view_class, 'serializer_class', None)
+        if serializer_class is None or serializer_class in seen:
+            continue
+        seen.add(serializer_class)
+        try:
+            # ModelSerializer membangun field dari _meta model di sini
+            serializer_class().fields
+            if issubclass(view_class, ValuesListMixin):
+                get_mapper(serializer_class)
+        except Exception:
+            logger.warning('Warmup serializer %s gagal', serializer_class.__name__, exc_info=True)
+
+
+def _prime_api_settings():
+    # api_settings DRF mengimpor class (autentikasi, renderer, ...) saat pertama dibaca
+    from rest_framework.settings import api_settings
+
+    for name in (
+        'DEFAULT_AUTHENTICATION_CLASSES', 'DEFAULT_PERMISSION_CLASSES', 'DEFAULT_RENDERER_CLASSES',
+        'DEFAULT_PARSER_CLASSES', 'DEFAULT_CONTENT_NEGOTIATION_CLASS', 'DEFAULT_PAGINATION_CLASS',
+        'DEFAULT_FILTER_BACKENDS', 'DEFAULT_THROTTLE_CLASSES', 'DEFAULT_METADATA_CLASS',
+        'DEFAULT_VERSIONING_CLASS', 'EXCEPTION_HANDLER',
+    ):
+        getattr(api_settings, name)
+
+
+def _prime_translations():
+    with translation.override(settings.LANGUAGE_CODE):
+        translation.gettext('This field is required.')
+
+
+def run():
+    """ Panaskan proses ini; panggilan berikutnya tidak melakukan apa-apa """
+    global _done
+    if _done:
+        return
+    start = time.perf_counter()
+    patterns = list(_walk(get_resolver()))
+    _prime_serializers(patterns)
+    _prime_api_settings()
+    _prime_translations()
+    _done = True
+    logger.info('Warmup selesai: %d route dalam %.1f ms', len(patterns), (time.perf_counter() - start) * 1000)
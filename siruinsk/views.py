@@ -1,3 +1,8 @@
+import hmac
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, JsonResponse
+from django.views import View
 from django.contrib.auth import authenticate
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -6,12 +11,17 @@ from rest_framework import status
 from django.core.mail import send_mail
 from django.utils.crypto import get_random_string
 from django.contrib.auth.models import User
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from django.db.models import Q
 from .serializers import *
+from .utils import batch, health, metrics, profiling, replicas, slow_queries
+from .utils.throttling import IPTokenBucketThrottle, IdentifierTokenBucketThrottle
 
 class RegistrationView(APIView):
     """ Registrasi user """
+    throttle_classes = [IPTokenBucketThrottle]
+    throttle_scope = 'register'
+
     def post(self, request):
         serializer = RegistrationSerializer(data=request.data)
         if serializer.is_valid():
@@ -22,6 +32,10 @@ class RegistrationView(APIView):
 
 class LoginView(APIView):
     """ Login user """
+    throttle_classes = [IPTokenBucketThrottle, IdentifierTokenBucketThrottle]
+    throttle_scope = 'login'
+    throttle_identifier_field = 'username'
+
     def post(self, request):
         identifier = request.data.get('username') 
         password = request.data.get('password')
@@ -75,6 +89,9 @@ class LogoutView(APIView):
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 class ResetPasswordView(APIView):
+    throttle_classes = [IPTokenBucketThrottle, IdentifierTokenBucketThrottle]
+    throttle_scope = 'reset_password'
+    throttle_identifier_field = 'email'
 
     def post(self, request):
         serializer = ResetPasswordSerializer(data=request.data)
@@ -108,4 +125,123 @@ class AuthView(APIView):
                 'last_name': user.last_name
             }
             return Response(context, status=status.HTTP_200_OK)
-        return Response({'detail': 'Not authenticated'}, status=status.HTTP_401_UNAUTHORIZED)
\ No newline at end of file
+        return Response({'detail': 'Not authenticated'}, status=status.HTTP_401_UNAUTHORIZED)
+
+
+class SlowQueryView(APIView):
+    """ Ringkasan slow query log per fingerprint (hanya staff) """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({
+            'threshold_ms': settings.SLOW_QUERY_THRESHOLD_MS,
+            'enabled': settings.SLOW_QUERY_LOG,
+            'queries': slow_queries.summary(),
+        }, status=status.HTTP_200_OK)
+
+    def delete(self, request):
+        slow_queries.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ProfilingTokenView(APIView):
+    """ Token untuk memprofil request sendiri lewat header X-Profile (hanya staff) """
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        return Response({
+            'token': profiling.make_token(request.user),
+            'expires_in': settings.PROFILING_TOKEN_MAX_AGE,
+            'header': 'X-Profile',
+        }, status=status.HTTP_201_CREATED)
+
+
+class ProfilingListView(APIView):
+    """ Daftar profil request yang tersimpan (hanya staff) """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({
+            'enabled': settings.PROFILING_ENABLED,
+            'profiles': profiling.summary(),
+        }, status=status.HTTP_200_OK)
+
+    def delete(self, request):
+        profiling.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ProfilingDetailView(APIView):
+    """ Detail satu profil: fungsi teratas dan query SQL beserta waktunya (hanya staff) """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, profile_id):
+        entry = profiling.get(profile_id)
+        if entry is None:
+            return Response({'detail': 'Profile not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response({name: value for name, value in entry.items() if name != 'data'})
+
+
+class ProfilingDownloadView(APIView):
+    """ Unduh file profil mentah: .prof (pstats/snakeviz) atau .folded (flamegraph) """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, profile_id):
+        entry = profiling.get(profile_id)
+        if entry is None:
+            return Response({'detail': 'Profile not found'}, status=status.HTTP_404_NOT_FOUND)
+        data, extension = profiling.download(entry)
+        response = HttpResponse(data, content_type='application/octet-stream')
+        response['Content-Disposition'] = f'attachment; filename="profile-{profile_id}.{extension}"'
+        return response
+
+
+class BatchView(APIView):
+    """ Beberapa request API dalam satu round trip (lihat utils/batch.py) """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data['requests']
+        alias = replicas.read_alias(request) if batch.is_read_only(items) else None
+        with batch.routing(request, items, alias):
+            responses = [batch.execute(request, item) for item in items]
+        return Response({'responses': responses})
+
+
+class MetricsView(View):
+    """
+    Metrik Prometheus semua worker (format teks 0.0.4). View Django biasa:
+    scraper mengirim ``Authorization: Bearer <METRICS_TOKEN>``, bukan JWT.
+    """
+    def get(self, request):
+        if not settings.METRICS_TOKEN:
+            raise Http404
+        header = request.META.get('HTTP_AUTHORIZATION', '')
+        if not hmac.compare_digest(header.encode(), f'Bearer {settings.METRICS_TOKEN}'.encode()):
+            return HttpResponse(status=status.HTTP_403_FORBIDDEN)
+        return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+class HealthLiveView(View):
+    """
+    Liveness probe: worker masih melayani request. Tidak menyentuh database
+    atau cache; tanpa autentikasi (view Django biasa, bukan JWT).
+    """
+    def get(self, request):
+        response = JsonResponse({'status': 'ok'})
+        response['Cache-Control'] = 'no-store'
+        return response
+
+
+class HealthReadyView(View):
+    """
+    Readiness probe: 200 jika database, cache, storage, dan antrean background
+    sehat, 503 jika tidak. Hasil di-cache singkat per proses (utils/health.py).
+    """
+    def get(self, request):
+        ready, result = health.readiness()
+        response = JsonResponse(result, status=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE)
+        response['Cache-Control'] = 'no-store'
+        return response